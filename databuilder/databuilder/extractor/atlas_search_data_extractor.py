@@ -4,10 +4,14 @@
 import importlib
 import logging
 import multiprocessing.pool
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED, Future, ThreadPoolExecutor, wait,
+)
 from copy import deepcopy
 from functools import reduce
 from typing import (
-    Any, Dict, Generator, Iterator, List, Optional, Tuple,
+    Any, Callable, Deque, Dict, Generator, Iterable, Iterator, List, Optional, Set, Tuple,
 )
 
 from atlasclient.client import Atlas
@@ -67,6 +71,15 @@ class AtlasSearchDataExtractor(Extractor):
 
     PROCESS_POOL_SIZE_KEY = 'process_pool_size'
 
+    # Fetch the entity details as the guid batches arrive, instead of collecting all guids then all entities first
+    STREAMING_KEY = 'streaming'
+    # Maximum number of guids chunks whose details are being fetched or waiting to be extracted, when streaming.
+    # Defaults to twice the process pool size.
+    MAX_IN_FLIGHT_CHUNKS_KEY = 'max_in_flight_chunks'
+    # Whether the entities are extracted in the order of the guids, when streaming. Otherwise, the entities of each
+    # chunk are extracted as soon as they are fetched.
+    ORDERED_KEY = 'ordered'
+
     ENTITY_TYPE_KEY = 'entity_type'
 
     DEFAULT_CONFIG = ConfigFactory.from_dict({ATLAS_URL_CONFIG_KEY: "localhost",
@@ -77,7 +90,9 @@ class AtlasSearchDataExtractor(Extractor):
                                               ATLAS_DETAILS_CHUNK_SIZE_KEY: 25,
                                               ATLAS_TIMEOUT_SECONDS_KEY: 120,
                                               ATLAS_MAX_RETRIES_KEY: 2,
-                                              PROCESS_POOL_SIZE_KEY: 10})
+                                              PROCESS_POOL_SIZE_KEY: 10,
+                                              STREAMING_KEY: False,
+                                              ORDERED_KEY: True})
 
     # @todo fill out below fields for TableESDocument
     # tags: List[str],
@@ -261,20 +276,99 @@ class AtlasSearchDataExtractor(Extractor):
         for i in range(0, len(input_list), n):
             yield input_list[i:i + n]
 
-    def _execute_query(self) -> Any:
-        details_chunk_size = self.conf.get_int(AtlasSearchDataExtractor.ATLAS_DETAILS_CHUNK_SIZE_KEY)
-        process_pool_size = self.conf.get_int(AtlasSearchDataExtractor.PROCESS_POOL_SIZE_KEY)
-
-        guids = []
+    @staticmethod
+    def _chunk_guids(guid_batches: Iterable[List[str]], n: int) -> Iterator[List[str]]:
+        """Yield successive n-sized chunks from the guids of the batches."""
+        chunk: List[str] = []
+        for guids in guid_batches:
+            chunk += guids
+            while len(chunk) >= n:
+                yield chunk[:n]
+                chunk = chunk[n:]
+        if chunk:
+            yield chunk
 
+    @staticmethod
+    def _bounded_map(executor: ThreadPoolExecutor,
+                     fn: Callable[[Any], Any],
+                     items: Iterable[Any],
+                     max_in_flight: int,
+                     ordered: bool) -> Iterator[Any]:
+        """
+        Like executor.map, but consumes the items lazily, submitting up to max_in_flight of them at a time
+        :param ordered: Whether the results are yielded in the order of the items, or as they complete
+        """
+        items_iter = iter(items)
+        pending: Deque[Future] = deque()
+        running: Set[Future] = set()
+
+        def submit() -> None:
+            while len(pending) + len(running) < max_in_flight:
+                try:
+                    item = next(items_iter)
+                except StopIteration:
+                    return
+                future = executor.submit(fn, item)
+                if ordered:
+                    pending.append(future)
+                else:
+                    running.add(future)
+
+        submit()
+        while pending or running:
+            if ordered:
+                yield pending.popleft().result()
+            else:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    running.remove(future)
+                    yield future.result()
+            submit()
+
+    def _get_offsets(self) -> List[int]:
         entity_count = self._get_count_of_active_entities()
 
         LOGGER.info(f'Received count: {entity_count}')
 
         if entity_count > 0:
-            offsets = [i * self.search_chunk_size for i in range(int(entity_count / self.search_chunk_size) + 1)]
+            return [i * self.search_chunk_size for i in range(int(entity_count / self.search_chunk_size) + 1)]
         else:
-            offsets = []
+            return []
+
+    def _execute_streaming_query(self) -> Iterator[Any]:
+        """
+        Fetch the details of the guids chunks as the guid batches arrive, holding up to max_in_flight_chunks chunks
+        of entities in memory, instead of all guids then all entities of the catalog.
+        """
+        details_chunk_size = self.conf.get_int(AtlasSearchDataExtractor.ATLAS_DETAILS_CHUNK_SIZE_KEY)
+        process_pool_size = self.conf.get_int(AtlasSearchDataExtractor.PROCESS_POOL_SIZE_KEY)
+        max_in_flight_chunks = self.conf.get_int(AtlasSearchDataExtractor.MAX_IN_FLIGHT_CHUNKS_KEY,
+                                                 2 * process_pool_size)
+        ordered = self.conf.get_bool(AtlasSearchDataExtractor.ORDERED_KEY)
+
+        offsets = self._get_offsets()
+
+        with ThreadPoolExecutor(max_workers=process_pool_size) as executor:
+            # the guid batches are always consumed in order, so the chunks are the same as without streaming
+            guid_batches = AtlasSearchDataExtractor._bounded_map(executor, self._get_entity_guids, offsets,
+                                                                 process_pool_size, ordered=True)
+            guids_chunks = AtlasSearchDataExtractor._chunk_guids(guid_batches, details_chunk_size)
+
+            for sub_list in AtlasSearchDataExtractor._bounded_map(executor, self._get_entity_details, guids_chunks,
+                                                                  max_in_flight_chunks, ordered=ordered):
+                yield from sub_list
+
+    def _execute_query(self) -> Any:
+        if self.conf.get_bool(AtlasSearchDataExtractor.STREAMING_KEY):
+            yield from self._execute_streaming_query()
+            return
+
+        details_chunk_size = self.conf.get_int(AtlasSearchDataExtractor.ATLAS_DETAILS_CHUNK_SIZE_KEY)
+        process_pool_size = self.conf.get_int(AtlasSearchDataExtractor.PROCESS_POOL_SIZE_KEY)
+
+        guids = []
+
+        offsets = self._get_offsets()
 
         with multiprocessing.pool.ThreadPool(processes=process_pool_size) as pool:
             guid_list = pool.map(self._get_entity_guids, offsets, chunksize=1)
@@ -59,12 +59,18 @@ class BaseBigQueryExtractor(Extractor):
                 google_auth: Any = getattr(google, 'auth')
                 credentials, _ = google_auth.default(scopes=self._DEFAULT_SCOPES)
 
-        http = httplib2.Http()
-        authed_http = google_auth_httplib2.AuthorizedHttp(credentials, http=http)
+        self.credentials = credentials
+        authed_http = self._get_authorized_http()
         self.bigquery_service = build('bigquery', 'v2', http=authed_http, cache_discovery=False)
         self.logging_service = build('logging', 'v2', http=authed_http, cache_discovery=False)
         self.iter: Iterator[Any] = iter([])
 
+    def _get_authorized_http(self) -> google_auth_httplib2.AuthorizedHttp:
+        """
+        The http objects are not thread-safe, so each thread sending requests needs its own one
+        """
+        return google_auth_httplib2.AuthorizedHttp(self.credentials, http=httplib2.Http())
+
     def extract(self) -> Any:
         try:
             return next(self.iter)
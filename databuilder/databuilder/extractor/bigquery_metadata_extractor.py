@@ -2,8 +2,12 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import logging
+import threading
+from concurrent.futures import (
+    FIRST_COMPLETED, Future, ThreadPoolExecutor, wait,
+)
 from typing import (
-    Any, Dict, List, Set, cast,
+    Any, Dict, Iterator, List, Set, Tuple, cast,
 )
 
 from pyhocon import ConfigTree
@@ -24,13 +28,73 @@ class BigQueryMetadataExtractor(BaseBigQueryExtractor):
 
     This extractor supports nested columns, which are delimited by a dot (.) in the
     column name.
+
+    With max_workers > 1, the tables of all datasets are fetched concurrently by
+    that many threads, and extracted as they are fetched rather than in listing order.
+    Rate limited requests are retried with exponential backoff up to num_retries times.
     """
+    MAX_WORKERS_KEY = 'max_workers'
+    NUM_RETRIES_KEY = 'num_retries'
+    # Number of tables being fetched or waiting to be extracted, per worker
+    MAX_PENDING_TABLES_PER_WORKER = 4
 
     def init(self, conf: ConfigTree) -> None:
         BaseBigQueryExtractor.init(self, conf)
-        self.iter = iter(self._iterate_over_tables())
+        self.max_workers = conf.get_int(BigQueryMetadataExtractor.MAX_WORKERS_KEY, 1)
+        self.num_retries = conf.get_int(BigQueryMetadataExtractor.NUM_RETRIES_KEY,
+                                        BigQueryMetadataExtractor.NUM_RETRIES)
+        self._thread_local = threading.local()
+
+        if self.max_workers > 1:
+            self.iter = iter(self._iterate_over_tables_concurrently())
+        else:
+            self.iter = iter(self._iterate_over_tables())
 
     def _retrieve_tables(self, dataset: DatasetRef) -> Any:
+        for tableRef, table_id in self._retrieve_table_refs(dataset):
+            table = self.bigquery_service.tables().get(
+                projectId=tableRef['projectId'],
+                datasetId=tableRef['datasetId'],
+                tableId=tableRef['tableId']).execute(num_retries=self.num_retries)
+
+            yield self._get_table_metadata(tableRef, table_id, table)
+
+    def _iterate_over_tables_concurrently(self) -> Iterator[TableMetadata]:
+        max_pending = self.max_workers * BigQueryMetadataExtractor.MAX_PENDING_TABLES_PER_WORKER
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending: Dict[Future, Tuple[Dict[str, str], str]] = {}
+
+            def completed_tables() -> Iterator[TableMetadata]:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    tableRef, table_id = pending.pop(future)
+                    yield self._get_table_metadata(tableRef, table_id, future.result())
+
+            # the tables are listed by this thread, while the workers fetch the listed ones
+            for dataset in self._retrieve_datasets():
+                for tableRef, table_id in self._retrieve_table_refs(dataset):
+                    if len(pending) >= max_pending:
+                        yield from completed_tables()
+                    pending[executor.submit(self._get_table, tableRef)] = (tableRef, table_id)
+
+            while pending:
+                yield from completed_tables()
+
+    def _get_table(self, tableRef: Dict[str, str]) -> Dict[str, Any]:
+        http = getattr(self._thread_local, 'http', None)
+        if http is None:
+            http = self._thread_local.http = self._get_authorized_http()
+
+        return self.bigquery_service.tables().get(
+            projectId=tableRef['projectId'],
+            datasetId=tableRef['datasetId'],
+            tableId=tableRef['tableId']).execute(http=http, num_retries=self.num_retries)
+
+    def _retrieve_table_refs(self, dataset: DatasetRef) -> Iterator[Tuple[Dict[str, str], str]]:
+        """
+        Yield the reference of each table to extract along with its name, which is the table prefix of sharded tables
+        """
         grouped_tables: Set[str] = set([])
 
         for page in self._page_table_list_results(dataset):
@@ -56,33 +120,29 @@ class BigQueryMetadataExtractor(BaseBigQueryExtractor):
                     table_id = table_prefix
                     grouped_tables.add(table_prefix)
 
-                table = self.bigquery_service.tables().get(
-                    projectId=tableRef['projectId'],
-                    datasetId=tableRef['datasetId'],
-                    tableId=tableRef['tableId']).execute(num_retries=BigQueryMetadataExtractor.NUM_RETRIES)
-
-                # BigQuery tables also have interesting metadata about partitioning
-                # data location (EU/US), mod/create time, etc... Extract that some other time?
-                cols: List[ColumnMetadata] = []
-                # Not all tables have schemas
-                if 'schema' in table:
-                    schema = table['schema']
-                    if 'fields' in schema:
-                        total_cols = 0
-                        for column in schema['fields']:
-                            # TRICKY: this mutates :cols:
-                            total_cols = self._iterate_over_cols('', column, cols, total_cols + 1)
-
-                table_meta = TableMetadata(
-                    database='bigquery',
-                    cluster=tableRef['projectId'],
-                    schema=tableRef['datasetId'],
-                    name=table_id,
-                    description=table.get('description', ''),
-                    columns=cols,
-                    is_view=table['type'] == 'VIEW')
-
-                yield(table_meta)
+                yield tableRef, table_id
+
+    def _get_table_metadata(self, tableRef: Dict[str, str], table_id: str, table: Dict[str, Any]) -> TableMetadata:
+        # BigQuery tables also have interesting metadata about partitioning
+        # data location (EU/US), mod/create time, etc... Extract that some other time?
+        cols: List[ColumnMetadata] = []
+        # Not all tables have schemas
+        if 'schema' in table:
+            schema = table['schema']
+            if 'fields' in schema:
+                total_cols = 0
+                for column in schema['fields']:
+                    # TRICKY: this mutates :cols:
+                    total_cols = self._iterate_over_cols('', column, cols, total_cols + 1)
+
+        return TableMetadata(
+            database='bigquery',
+            cluster=tableRef['projectId'],
+            schema=tableRef['datasetId'],
+            name=table_id,
+            description=table.get('description', ''),
+            columns=cols,
+            is_view=table['type'] == 'VIEW')
 
     def _iterate_over_cols(self,
                            parent: str,
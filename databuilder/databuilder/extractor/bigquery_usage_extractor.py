@@ -1,35 +1,144 @@
 # Copyright Contributors to the Amundsen project.
 # SPDX-License-Identifier: Apache-2.0
 
+import heapq
+import json
 import logging
+import os
 import re
+import shutil
+import tempfile
 from collections import namedtuple
-from datetime import date, timedelta
+from concurrent.futures import (
+    Future, ThreadPoolExecutor, as_completed,
+)
+from datetime import (
+    date, datetime, timedelta, timezone,
+)
+from itertools import groupby
 from time import sleep
 from typing import (
-    Any, Dict, Iterator, List, Optional, Tuple,
+    Any, Dict, Iterable, Iterator, List, Optional, Tuple,
 )
 
+from dateutil.parser import isoparse
 from pyhocon import ConfigTree
 
 from databuilder.extractor.base_bigquery_extractor import BaseBigQueryExtractor
 
 TableColumnUsageTuple = namedtuple('TableColumnUsageTuple', ['database', 'cluster', 'schema',
                                                              'table', 'column', 'email'])
+TableUsageTuple = namedtuple('TableUsageTuple', ['database', 'cluster', 'schema', 'table', 'column'])
 
 LOGGER = logging.getLogger(__name__)
 
 
+class TableUsageAggregator(object):
+    """
+    Counts the reads of each user per table. Once it holds more than spill_threshold counts, the partial counts are
+    written to a file sorted by table, and merged with the other files when the aggregates are read, so that the
+    memory is bounded however long the audit log window is.
+    """
+
+    def __init__(self, spill_threshold: int = 0, spill_directory: Optional[str] = None) -> None:
+        """
+        :param spill_threshold: Number of (table, user) counts held in memory before spilling them to disk, or 0 to
+        never spill
+        :param spill_directory: Directory of the spill files, the system temporary directory by default
+        """
+        self.spill_threshold = spill_threshold
+        self.spill_directory = spill_directory
+        self._counts: Dict[TableUsageTuple, Dict[str, int]] = {}
+        self._size = 0
+        self._spill_files: List[str] = []
+        self._temp_directory: Optional[str] = None
+
+    def add(self, key: TableUsageTuple, email: str, count: int = 1) -> None:
+        user_counts = self._counts.setdefault(key, {})
+        if email not in user_counts:
+            self._size += 1
+        user_counts[email] = user_counts.get(email, 0) + count
+
+        if self.spill_threshold and self._size >= self.spill_threshold:
+            self._spill()
+
+    def items(self) -> Iterator[Tuple[TableUsageTuple, Dict[str, int]]]:
+        """
+        Yield the read counts of each user per table, each table once. The tables are sorted if counts were spilled.
+        """
+        try:
+            if not self._spill_files:
+                yield from self._counts.items()
+                return
+
+            self._spill()
+            LOGGER.info(f'Merging {len(self._spill_files)} spilled usage files')
+            files = [open(path) for path in self._spill_files]
+            try:
+                entries = heapq.merge(*[map(json.loads, f) for f in files], key=lambda entry: entry[0])
+                for key, group in groupby(entries, key=lambda entry: entry[0]):
+                    user_counts: Dict[str, int] = {}
+                    for _, partial_counts in group:
+                        for email, count in partial_counts.items():
+                            user_counts[email] = user_counts.get(email, 0) + count
+                    yield TableUsageTuple(*key), user_counts
+            finally:
+                for f in files:
+                    f.close()
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        self._counts = {}
+        self._size = 0
+        self._spill_files = []
+        if self._temp_directory:
+            shutil.rmtree(self._temp_directory, ignore_errors=True)
+            self._temp_directory = None
+
+    def _spill(self) -> None:
+        if not self._counts:
+            return
+
+        if self._temp_directory is None:
+            self._temp_directory = tempfile.mkdtemp(prefix='bigquery_usage_', dir=self.spill_directory)
+        path = os.path.join(self._temp_directory, f'{len(self._spill_files)}.json')
+        with open(path, 'w') as f:
+            for key in sorted(self._counts):
+                f.write(json.dumps([list(key), self._counts[key]]) + '\n')
+
+        LOGGER.info(f'Spilled {self._size} usage counts to {path}')
+        self._spill_files.append(path)
+        self._counts = {}
+        self._size = 0
+
+
 class BigQueryTableUsageExtractor(BaseBigQueryExtractor):
     """
     An aggregate extractor for bigquery table usage. This class takes the data from
     the stackdriver logging API by filtering on timestamp, bigquery_resource and looking
     for referencedTables in the response.
+
+    By default, a (TableColumnUsageTuple, read count) record is extracted per table and user. With
+    aggregate_by_table, a (TableUsageTuple, {user email: read count}) record is extracted per table instead.
+    With spill_threshold, the counts are spilled to disk once that many are held in memory.
+
+    With time_slices > 1, the window from timestamp to now is split into that many slices, whose audit logs are
+    scanned concurrently and merged into the same counts. With progress_directory, the counts of each scanned slice
+    are saved there, so that a run failing before all slices are scanned can be resumed with the same configuration
+    without scanning them again. The directory is removed once all slices are merged.
     """
     TIMESTAMP_KEY = 'timestamp'
     _DEFAULT_SCOPES = ['https://www.googleapis.com/auth/cloud-platform']
     EMAIL_PATTERN = 'email_pattern'
     DELAY_TIME = 'delay_time'
+    AGGREGATE_BY_TABLE = 'aggregate_by_table'
+    SPILL_THRESHOLD = 'spill_threshold'
+    SPILL_DIRECTORY = 'spill_directory'
+    TIME_SLICES = 'time_slices'
+    PROGRESS_DIRECTORY = 'progress_directory'
+
+    TIMESTAMP_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
 
     def init(self, conf: ConfigTree) -> None:
         BaseBigQueryExtractor.init(self, conf)
@@ -40,13 +149,159 @@ class BigQueryTableUsageExtractor(BaseBigQueryExtractor):
         self.email_pattern = conf.get_string(BigQueryTableUsageExtractor.EMAIL_PATTERN, None)
         self.delay_time = conf.get_int(BigQueryTableUsageExtractor.DELAY_TIME, 100)
 
-        self.table_usage_counts: Dict[TableColumnUsageTuple, int] = {}
-        self._count_usage()
-        self.iter = iter(self.table_usage_counts)
+        self.aggregate_by_table = conf.get_bool(BigQueryTableUsageExtractor.AGGREGATE_BY_TABLE, False)
+
+        self.aggregator = TableUsageAggregator(
+            spill_threshold=conf.get_int(BigQueryTableUsageExtractor.SPILL_THRESHOLD, 0),
+            spill_directory=conf.get_string(BigQueryTableUsageExtractor.SPILL_DIRECTORY, None))
+
+        self.time_slices = conf.get_int(BigQueryTableUsageExtractor.TIME_SLICES, 1)
+        self.progress_directory = conf.get_string(BigQueryTableUsageExtractor.PROGRESS_DIRECTORY, None)
+        if self.time_slices > 1:
+            self._count_usage_by_time_slice()
+        else:
+            self._count_usage()
+        self.iter = self._get_extract_iter()
+
+    def _get_extract_iter(self) -> Iterator[Tuple[Any, Any]]:
+        if self.aggregate_by_table:
+            yield from self.aggregator.items()
+            return
 
-    def _count_usage(self) -> None:  # noqa: C901
+        for key, user_counts in self.aggregator.items():
+            for email, count in user_counts.items():
+                yield TableColumnUsageTuple(*key, email=email), count
+
+    def _count_usage_by_time_slice(self) -> None:
+        slices = self._get_time_slices()
+
+        scanned = 0
+        remaining = []
+        for index in range(len(slices)):
+            path = self._slice_path(index)
+            if path and os.path.exists(path):
+                LOGGER.info(f'Resuming from the saved counts of time slice {index}')
+                self._merge_counts(self._load_slice_counts(path))
+                scanned += 1
+            else:
+                remaining.append(index)
+
+        futures: Dict[Future, int] = {}
+        try:
+            with ThreadPoolExecutor(max_workers=self.time_slices) as executor:
+                futures = {executor.submit(self._count_slice_usage, index, *slices[index]): index
+                           for index in remaining}
+                for future in as_completed(futures):
+                    self._merge_slice_counts(futures[future], future.result())
+                    scanned += 1
+                    LOGGER.info(f'Scanned {scanned} of {len(slices)} time slices')
+        finally:
+            # removes the spill files of the slices left unmerged by a failure
+            for future in futures:
+                if not future.cancelled() and future.exception() is None:
+                    future.result().close()
+
+        if self.progress_directory:
+            shutil.rmtree(self.progress_directory, ignore_errors=True)
+
+    def _merge_counts(self, counts: Iterable[Tuple[TableUsageTuple, Dict[str, int]]]) -> None:
+        for key, user_counts in counts:
+            for email, count in user_counts.items():
+                self.aggregator.add(key, email, count)
+
+    def _merge_slice_counts(self, index: int, aggregator: TableUsageAggregator) -> None:
+        """
+        Merge the counts of a scanned slice, saving them in the progress directory along the way if any
+        """
+        path = self._slice_path(index)
+        if not path:
+            self._merge_counts(aggregator.items())
+            return
+
+        # write then rename, so that a failed run never leaves partial counts
+        temp_path = f'{path}.tmp'
+        with open(temp_path, 'w') as f:
+            for key, user_counts in aggregator.items():
+                f.write(json.dumps([list(key), user_counts]) + '\n')
+                self._merge_counts([(key, user_counts)])
+        os.replace(temp_path, path)
+
+    def _get_time_slices(self) -> List[Tuple[str, Optional[str]]]:
+        """
+        Split the window from the timestamp to now into time_slices slices. The end of the window is saved in the
+        progress directory, so that a resumed run splits it the same way.
+        :return: The start and end of each slice, the last one having no end
+        """
+        plan: Dict[str, Any] = {'timestamp': self.timestamp, 'time_slices': self.time_slices, 'end': None}
+        plan_path = os.path.join(self.progress_directory, 'plan.json') if self.progress_directory else None
+        if plan_path and os.path.exists(plan_path):
+            with open(plan_path) as f:
+                saved_plan = json.load(f)
+            if saved_plan['timestamp'] == self.timestamp and saved_plan['time_slices'] == self.time_slices:
+                plan = saved_plan
+            else:
+                LOGGER.warning(f'Ignoring the progress of another configuration in {self.progress_directory}')
+                shutil.rmtree(self.progress_directory)
+
+        start = BigQueryTableUsageExtractor._parse_timestamp(plan['timestamp'])
+        end_timestamp = plan['end']
+        if end_timestamp is None:
+            end_timestamp = plan['end'] = datetime.utcnow().strftime(BigQueryTableUsageExtractor.TIMESTAMP_FORMAT)
+            if plan_path:
+                os.makedirs(self.progress_directory, exist_ok=True)
+                with open(plan_path, 'w') as f:
+                    json.dump(plan, f)
+        end = BigQueryTableUsageExtractor._parse_timestamp(end_timestamp)
+
+        slice_length = (end - start) / self.time_slices
+        bounds = [(start + slice_length * i).strftime(BigQueryTableUsageExtractor.TIMESTAMP_FORMAT)
+                  for i in range(1, self.time_slices)]
+        return list(zip([plan['timestamp'], *bounds], [*bounds, None]))
+
+    @staticmethod
+    def _parse_timestamp(timestamp: str) -> datetime:
+        """
+        Parse an RFC3339 timestamp, or a date, into a naive UTC datetime
+        """
+        parsed = isoparse(timestamp)
+        if parsed.tzinfo is not None:
+            parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+        return parsed
+
+    def _slice_path(self, index: int) -> Optional[str]:
+        return os.path.join(self.progress_directory, f'slice_{index}.json') if self.progress_directory else None
+
+    @staticmethod
+    def _load_slice_counts(path: str) -> Iterator[Tuple[TableUsageTuple, Dict[str, int]]]:
+        with open(path) as f:
+            for line in f:
+                key, user_counts = json.loads(line)
+                yield TableUsageTuple(*key), user_counts
+
+    def _count_slice_usage(self, index: int, start: str, end: Optional[str]) -> TableUsageAggregator:
+        """
+        Count the usage of a time slice in an aggregator of its own, spilling to disk like the one of the extractor
+        :return: The aggregator holding the counts of the slice, to be merged by the caller
+        """
+        LOGGER.info(f'Scanning time slice {index}: {start} - {end or "now"}')
+
+        aggregator = TableUsageAggregator(spill_threshold=self.aggregator.spill_threshold,
+                                          spill_directory=self.aggregator.spill_directory)
+        try:
+            # the http objects are not thread-safe, so each slice sends its requests through its own one
+            self._count_usage(self._retrieve_records(start, end, http=self._get_authorized_http()), aggregator)
+        except Exception:
+            aggregator.close()
+            raise
+
+        LOGGER.info(f'Scanned time slice {index}: {start} - {end or "now"}')
+        return aggregator
+
+    def _count_usage(self,  # noqa: C901
+                     records: Optional[Iterator[Optional[Dict]]] = None,
+                     aggregator: Optional[TableUsageAggregator] = None) -> None:
         count = 0
-        for entry in self._retrieve_records():
+        for entry in records if records is not None else self._retrieve_records():
             count += 1
             if count % self.pagesize == 0:
                 LOGGER.info(f'Aggregated %i records', count)
@@ -77,17 +332,17 @@ class BigQueryTableUsageExtractor(BaseBigQueryExtractor):
                     self._create_records(
                         refTables,
                         job['jobStatistics']['totalTablesProcessed'], email,
-                        job['jobName']['jobId'])
+                        job['jobName']['jobId'], aggregator)
 
             refViews = job['jobStatistics'].get('referencedViews', None)
             if refViews:
                 if 'totalViewsProcessed' in job['jobStatistics']:
                     self._create_records(
                         refViews, job['jobStatistics']['totalViewsProcessed'],
-                        email, job['jobName']['jobId'])
+                        email, job['jobName']['jobId'], aggregator)
 
     def _create_records(self, refResources: List[dict], resourcesProcessed: int, email: str,
-                        jobId: str) -> None:
+                        jobId: str, aggregator: Optional[TableUsageAggregator] = None) -> None:
         # if email filter is provided, only the email matched with filter will be recorded.
         if self.email_pattern:
             if not re.match(self.email_pattern, email):
@@ -99,44 +354,53 @@ class BigQueryTableUsageExtractor(BaseBigQueryExtractor):
             return
 
         for refResource in refResources:
-            key = TableColumnUsageTuple(database='bigquery',
-                                        cluster=refResource['projectId'],
-                                        schema=refResource['datasetId'],
-                                        table=refResource['tableId'],
-                                        column='*',
-                                        email=email)
+            key = TableUsageTuple(database='bigquery',
+                                  cluster=refResource['projectId'],
+                                  schema=refResource['datasetId'],
+                                  table=refResource['tableId'],
+                                  column='*')
 
-            new_count = self.table_usage_counts.get(key, 0) + 1
-            self.table_usage_counts[key] = new_count
+            (aggregator or self.aggregator).add(key, email)
 
-    def _retrieve_records(self) -> Iterator[Optional[Dict]]:
+    def _retrieve_records(self,
+                          start: Optional[str] = None,
+                          end: Optional[str] = None,
+                          http: Any = None) -> Iterator[Optional[Dict]]:
         """
         Extracts bigquery log data by looking at the principalEmail in the
         authenticationInfo block and referencedTables in the jobStatistics.
 
+        :param start: Start of the time window, the timestamp by default
+        :param end: Exclusive end of the time window, if any
+        :param http: The http object to send the requests with, if not the one of the logging service
         :return: Provides a record or None if no more to extract
         """
+        time_filter = f'timestamp >= "{start or self.timestamp}"'
+        if end:
+            time_filter += f' AND timestamp < "{end}"'
         body = {
             'resourceNames': [f'projects/{self.project_id}'],
             'pageSize': self.pagesize,
             'filter': 'resource.type="bigquery_resource" AND '
                       'protoPayload.methodName="jobservice.jobcompleted" AND '
-                      f'timestamp >= "{self.timestamp}"'
+                      f'{time_filter}'
         }
-        for page in self._page_over_results(body):
+        for page in self._page_over_results(body, http):
             for entry in page['entries']:
                 yield entry
 
-    def extract(self) -> Optional[Tuple[Any, int]]:
+    def extract(self) -> Optional[Tuple[Any, Any]]:
         try:
-            key = next(self.iter)
-            return key, self.table_usage_counts[key]
+            return next(self.iter)
         except StopIteration:
             return None
 
-    def _page_over_results(self, body: Dict) -> Iterator[Dict]:
+    def close(self) -> None:
+        self.aggregator.close()
+
+    def _page_over_results(self, body: Dict, http: Any = None) -> Iterator[Dict]:
         response = self.logging_service.entries().list(body=body).execute(
-            num_retries=BigQueryTableUsageExtractor.NUM_RETRIES)
+            http=http, num_retries=BigQueryTableUsageExtractor.NUM_RETRIES)
         while response:
             if 'entries' in response:
                 yield response
@@ -145,7 +409,7 @@ class BigQueryTableUsageExtractor(BaseBigQueryExtractor):
                 if 'nextPageToken' in response:
                     body['pageToken'] = response['nextPageToken']
                     response = self.logging_service.entries().list(body=body).execute(
-                        num_retries=BigQueryTableUsageExtractor.NUM_RETRIES)
+                        http=http, num_retries=BigQueryTableUsageExtractor.NUM_RETRIES)
                 else:
                     response = None
             except Exception:
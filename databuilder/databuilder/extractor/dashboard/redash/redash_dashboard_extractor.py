@@ -8,6 +8,7 @@ from typing import (
 
 from pyhocon import ConfigFactory, ConfigTree
 
+from databuilder import Scoped
 from databuilder.extractor.base_extractor import Extractor
 from databuilder.extractor.dashboard.redash.redash_dashboard_utils import (
     RedashPaginatedRestApiQuery, generate_dashboard_description, get_auth_headers, get_text_widgets,
@@ -78,6 +79,7 @@ class RedashDashboardExtractor(Extractor):
     DASHBOARD_GROUP_NAME = 'Redash'
 
     def init(self, conf: ConfigTree) -> None:
+        self._conf = conf
 
         # required configuration
         self._redash_base_url = conf.get_string(RedashDashboardExtractor.REDASH_BASE_URL_KEY)
@@ -237,9 +239,10 @@ class RedashDashboardExtractor(Extractor):
     def _build_extractor(self) -> RestAPIExtractor:
 
         extractor = RestAPIExtractor()
-        rest_api_extractor_conf = ConfigFactory.from_dict({
-            REST_API_QUERY: self._build_restapi_query()
-        })
+        rest_api_extractor_conf = Scoped.get_scoped_conf(self._conf, extractor.get_scope()).with_fallback(
+            ConfigFactory.from_dict({
+                REST_API_QUERY: self._build_restapi_query()
+            }))
         extractor.init(rest_api_extractor_conf)
         return extractor
 
@@ -3,8 +3,11 @@
 
 import importlib
 import logging
+from concurrent.futures import (
+    FIRST_COMPLETED, ThreadPoolExecutor, wait,
+)
 from typing import (
-    Any, Callable, Dict, Iterator, List, Optional,
+    Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple,
 )
 
 from amundsen_rds.models.badge import Badge
@@ -113,6 +116,49 @@ def _table_search_query(session: Session, table_filter: List, offset: int, limit
     return query.all()
 
 
+def _table_document(table: Table) -> Dict:
+    """
+    Table search document
+    :param table:
+    :return:
+    """
+    schema = table.schema
+    schema_description = schema.description.description if schema.description else None
+    cluster = schema.cluster
+    database = cluster.database
+    description = table.description.description if table.description else ''
+    programmatic_descriptions = [description.description
+                                 for description in table.programmatic_descriptions]
+
+    columns = table.columns
+    column_names = [column.name for column in columns]
+    column_descriptions = [column.description.description if column.description else ''
+                           for column in columns]
+
+    total_usage = sum(usage.read_count for usage in table.usage)
+    unique_usage = len(table.usage)
+
+    tags = [tag.rk for tag in table.tags if tag.tag_type == 'default']
+    badges = [badge.rk for badge in table.badges]
+    last_updated_timestamp = table.timestamp.last_updated_timestamp if table.timestamp else None
+
+    return dict(database=database.name,
+                cluster=cluster.name,
+                schema=schema.name,
+                name=table.name,
+                key=table.rk,
+                description=description,
+                last_updated_timestamp=last_updated_timestamp,
+                column_names=column_names,
+                column_descriptions=column_descriptions,
+                total_usage=total_usage,
+                unique_usage=unique_usage,
+                tags=tags,
+                badges=badges,
+                schema_description=schema_description,
+                programmatic_descriptions=programmatic_descriptions)
+
+
 def _table_search(session: Session, published_tag: str, limit: int) -> List[Dict]:
     """
     Query table metadata.
@@ -133,42 +179,7 @@ def _table_search(session: Session, published_tag: str, limit: int) -> List[Dict
     tables = _table_search_query(session, table_filter, offset, limit)
     while tables:
         for table in tables:
-            schema = table.schema
-            schema_description = schema.description.description if schema.description else None
-            cluster = schema.cluster
-            database = cluster.database
-            description = table.description.description if table.description else ''
-            programmatic_descriptions = [description.description
-                                         for description in table.programmatic_descriptions]
-
-            columns = table.columns
-            column_names = [column.name for column in columns]
-            column_descriptions = [column.description.description if column.description else ''
-                                   for column in columns]
-
-            total_usage = sum(usage.read_count for usage in table.usage)
-            unique_usage = len(table.usage)
-
-            tags = [tag.rk for tag in table.tags if tag.tag_type == 'default']
-            badges = [badge.rk for badge in table.badges]
-            last_updated_timestamp = table.timestamp.last_updated_timestamp if table.timestamp else None
-
-            table_result = dict(database=database.name,
-                                cluster=cluster.name,
-                                schema=schema.name,
-                                name=table.name,
-                                key=table.rk,
-                                description=description,
-                                last_updated_timestamp=last_updated_timestamp,
-                                column_names=column_names,
-                                column_descriptions=column_descriptions,
-                                total_usage=total_usage,
-                                unique_usage=unique_usage,
-                                tags=tags,
-                                badges=badges,
-                                schema_description=schema_description,
-                                programmatic_descriptions=programmatic_descriptions)
-            table_results.append(table_result)
+            table_results.append(_table_document(table))
 
         offset += limit
         tables = _table_search_query(session, table_filter, offset, limit)
@@ -176,6 +187,33 @@ def _table_search(session: Session, published_tag: str, limit: int) -> List[Dict
     return table_results
 
 
+def _table_search_keyset(session_factory: Callable[[], Session],
+                         published_tag: str,
+                         limit: int,
+                         parallelism: int = 1) -> Iterator[Dict]:
+    """
+    Query table metadata with keyset pagination, yielding the tables page by page.
+    :param session_factory:
+    :param published_tag:
+    :param limit: Number of tables per page
+    :param parallelism: Number of rk ranges whose pages are queried concurrently
+    :return:
+    """
+    LOGGER.info('Querying table metadata with keyset pagination.')
+
+    table_filter = []
+    if published_tag:
+        table_filter.append(Table.published_tag == published_tag)
+
+    yield from _keyset_search(session_factory=session_factory,
+                              search_query=_table_search_query,
+                              to_document=_table_document,
+                              rk_column=Table.rk,
+                              query_filter=table_filter,
+                              limit=limit,
+                              parallelism=parallelism)
+
+
 def _dashboard_search_query(session: Session, dashboard_filter: List, offset: int, limit: int) -> List:
     """
     Dashboard query
@@ -256,6 +294,46 @@ def _dashboard_search_query(session: Session, dashboard_filter: List, offset: in
     return query.all()
 
 
+def _dashboard_document(dashboard: Dashboard) -> Dict:
+    """
+    Dashboard search document
+    :param dashboard:
+    :return:
+    """
+    group = dashboard.group
+    description = dashboard.description.description if dashboard.description else None
+    group_description = group.description.description if group.description else None
+    cluster = group.cluster
+    product = dashboard.rk.split('_')[0]
+    last_exec = next((execution for execution in dashboard.execution
+                      if execution.rk.endswith('_last_successful_execution')), None)
+    last_successful_run_timestamp = last_exec.timestamp if last_exec else None
+    total_usage = sum(usage.read_count for usage in dashboard.usage)
+
+    queries = dashboard.queries
+    query_names = [query.name for query in queries]
+    chart_names = [chart.name for query in queries for chart in query.charts]
+
+    tags = [tag.rk for tag in dashboard.tags if tag.tag_type == 'default']
+    badges = [badge.rk for badge in dashboard.badges]
+
+    return dict(group_name=group.name,
+                name=dashboard.name,
+                description=description,
+                total_usage=total_usage,
+                product=product,
+                cluster=cluster.name,
+                group_description=group_description,
+                query_names=query_names,
+                chart_names=chart_names,
+                group_url=group.dashboard_group_url,
+                url=dashboard.dashboard_url,
+                uri=dashboard.rk,
+                last_successful_run_timestamp=last_successful_run_timestamp,
+                tags=tags,
+                badges=badges)
+
+
 def _dashboard_search(session: Session, published_tag: str, limit: int) -> List[Dict]:
     """
     Query dashboard metadata.
@@ -276,40 +354,7 @@ def _dashboard_search(session: Session, published_tag: str, limit: int) -> List[
     dashboards = _dashboard_search_query(session, dashboard_filter, offset, limit)
     while dashboards:
         for dashboard in dashboards:
-            group = dashboard.group
-            description = dashboard.description.description if dashboard.description else None
-            group_description = group.description.description if group.description else None
-            cluster = group.cluster
-            product = dashboard.rk.split('_')[0]
-            last_exec = next((execution for execution in dashboard.execution
-                              if execution.rk.endswith('_last_successful_execution')), None)
-            last_successful_run_timestamp = last_exec.timestamp if last_exec else None
-            total_usage = sum(usage.read_count for usage in dashboard.usage)
-
-            queries = dashboard.queries
-            query_names = [query.name for query in queries]
-            chart_names = [chart.name for query in queries for chart in query.charts]
-
-            tags = [tag.rk for tag in dashboard.tags if tag.tag_type == 'default']
-            badges = [badge.rk for badge in dashboard.badges]
-
-            dashboard_result = dict(group_name=group.name,
-                                    name=dashboard.name,
-                                    description=description,
-                                    total_usage=total_usage,
-                                    product=product,
-                                    cluster=cluster.name,
-                                    group_description=group_description,
-                                    query_names=query_names,
-                                    chart_names=chart_names,
-                                    group_url=group.dashboard_group_url,
-                                    url=dashboard.dashboard_url,
-                                    uri=dashboard.rk,
-                                    last_successful_run_timestamp=last_successful_run_timestamp,
-                                    tags=tags,
-                                    badges=badges)
-
-            dashboard_results.append(dashboard_result)
+            dashboard_results.append(_dashboard_document(dashboard))
 
         offset += limit
         dashboards = _dashboard_search_query(session, dashboard_filter, offset, limit)
@@ -317,6 +362,140 @@ def _dashboard_search(session: Session, published_tag: str, limit: int) -> List[
     return dashboard_results
 
 
+def _dashboard_search_keyset(session_factory: Callable[[], Session],
+                             published_tag: str,
+                             limit: int,
+                             parallelism: int = 1) -> Iterator[Dict]:
+    """
+    Query dashboard metadata with keyset pagination, yielding the dashboards page by page.
+    :param session_factory:
+    :param published_tag:
+    :param limit: Number of dashboards per page
+    :param parallelism: Number of rk ranges whose pages are queried concurrently
+    :return:
+    """
+    LOGGER.info('Querying dashboard metadata with keyset pagination.')
+
+    dashboard_filter = []
+    if published_tag:
+        dashboard_filter.append(Dashboard.published_tag == published_tag)
+
+    yield from _keyset_search(session_factory=session_factory,
+                              search_query=_dashboard_search_query,
+                              to_document=_dashboard_document,
+                              rk_column=Dashboard.rk,
+                              query_filter=dashboard_filter,
+                              limit=limit,
+                              parallelism=parallelism)
+
+
+def _keyset_page(session: Session,
+                 search_query: Callable,
+                 to_document: Callable[[Any], Dict],
+                 rk_column: Any,
+                 query_filter: List,
+                 last_rk: Optional[str],
+                 upper_rk: Optional[str],
+                 limit: int) -> Tuple[List[Dict], Optional[str]]:
+    """
+    Query the page of up to {limit} entities following last_rk, up to upper_rk
+    :param last_rk: rk of the last entity of the previous page, or None for the first page
+    :param upper_rk: Inclusive upper bound of the rk range, or None if unbounded
+    :return: The documents of the page, and the rk to query the next page from, or None if it was the last page
+    """
+    page_filter = list(query_filter)
+    if last_rk is not None:
+        page_filter.append(rk_column > last_rk)
+    if upper_rk is not None:
+        page_filter.append(rk_column <= upper_rk)
+
+    entities = search_query(session, page_filter, 0, limit) or []
+    documents = [to_document(entity) for entity in entities]
+    next_rk = entities[-1].rk if len(entities) == limit else None
+
+    # the documents are built, so the entities don't need to stay in the identity map
+    session.expunge_all()
+    return documents, next_rk
+
+
+def _rk_ranges(session: Session,
+               rk_column: Any,
+               query_filter: List,
+               count: int) -> List[Tuple[Optional[str], Optional[str]]]:
+    """
+    Split the rks into up to {count} ranges of about the same number of entities
+    :return: (exclusive lower bound, inclusive upper bound) of each range, None meaning unbounded
+    """
+    total = session.query(func.count(rk_column)).filter(*query_filter).scalar() or 0
+    bounds: List[str] = []
+    for i in range(1, count):
+        position = total * i // count - 1
+        if position < 0:
+            continue
+        bound = session.query(rk_column).filter(*query_filter).order_by(rk_column).offset(position).limit(1).scalar()
+        if bound is not None and bound not in bounds:
+            bounds.append(bound)
+
+    lower_bounds: List[Optional[str]] = [None, *bounds]
+    upper_bounds: List[Optional[str]] = [*bounds, None]
+    return list(zip(lower_bounds, upper_bounds))
+
+
+def _keyset_search(session_factory: Callable[[], Session],
+                   search_query: Callable,
+                   to_document: Callable[[Any], Dict],
+                   rk_column: Any,
+                   query_filter: List,
+                   limit: int,
+                   parallelism: int) -> Iterator[Dict]:
+    """
+    Yield the documents page by page, paginating with rk > :last_rk instead of an offset, so that each page is an
+    index range scan however far it is. With parallelism > 1, the rks are split into ranges whose pages are queried
+    concurrently, one page per range at a time, each range with its own session. The documents are then yielded in
+    the order the pages complete.
+    """
+    if parallelism <= 1:
+        session = session_factory()
+        try:
+            last_rk = None
+            while True:
+                documents, last_rk = _keyset_page(session, search_query, to_document, rk_column, query_filter,
+                                                  last_rk, None, limit)
+                yield from documents
+                if last_rk is None:
+                    return
+        finally:
+            session.close()
+
+    session = session_factory()
+    try:
+        ranges = _rk_ranges(session, rk_column, query_filter, parallelism)
+    finally:
+        session.close()
+    LOGGER.info(f'Querying {len(ranges)} rk ranges concurrently.')
+
+    sessions = [session_factory() for _ in ranges]
+    try:
+        with ThreadPoolExecutor(max_workers=len(ranges)) as executor:
+            pending = {
+                executor.submit(_keyset_page, sessions[i], search_query, to_document, rk_column, query_filter,
+                                lower_rk, upper_rk, limit): i
+                for i, (lower_rk, upper_rk) in enumerate(ranges)
+            }
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    i = pending.pop(future)
+                    documents, last_rk = future.result()
+                    if last_rk is not None:
+                        pending[executor.submit(_keyset_page, sessions[i], search_query, to_document, rk_column,
+                                                query_filter, last_rk, ranges[i][1], limit)] = i
+                    yield from documents
+    finally:
+        for session in sessions:
+            session.close()
+
+
 def _user_search_query(session: Session, user_filter: List, offset: int, limit: int) -> List:
     """
     User query
@@ -451,6 +630,11 @@ def _user_search(session: Session, published_tag: str, limit: int) -> List[Dict]
 class MySQLSearchDataExtractor(Extractor):
     """
     Extractor to fetch data required to support search from MySQL.
+
+    By default the entities are paginated with an offset and the documents are collected before being extracted.
+    With keyset_pagination, tables and dashboards are paginated with rk > :last_rk and extracted page by page, and
+    query_parallelism > 1 queries the pages of that many rk ranges concurrently, in which case the documents are not
+    extracted in rk order.
     """
     ENTITY_TYPE = 'entity_type'
     MODEL_CLASS = 'model_class'
@@ -461,6 +645,8 @@ class MySQLSearchDataExtractor(Extractor):
     ENGINE_ECHO = 'engine_echo'
     CONNECT_ARGS = 'connect_args'
     QUERY_LIMIT = 'query_limit'
+    KEYSET_PAGINATION = 'keyset_pagination'
+    QUERY_PARALLELISM = 'query_parallelism'
 
     _DEFAULT_QUERY_LIMIT = 500
     _DEFAULT_SEARCH_BY_ENTITY: Dict[str, Callable] = {
@@ -468,16 +654,25 @@ class MySQLSearchDataExtractor(Extractor):
         'user': _user_search,
         'dashboard': _dashboard_search
     }
+    _KEYSET_SEARCH_BY_ENTITY: Dict[str, Callable] = {
+        'table': _table_search_keyset,
+        'dashboard': _dashboard_search_keyset
+    }
 
     def init(self, conf: ConfigTree) -> None:
         self.conf = conf
         self.entity = conf.get_string(MySQLSearchDataExtractor.ENTITY_TYPE, default='table').lower()
+        self.keyset_search_function: Optional[Callable] = None
         if MySQLSearchDataExtractor.SEARCH_FUNCTION in conf:
             self.search_function = conf.get(MySQLSearchDataExtractor.SEARCH_FUNCTION)
+        elif conf.get_bool(MySQLSearchDataExtractor.KEYSET_PAGINATION, False) \
+                and self.entity in MySQLSearchDataExtractor._KEYSET_SEARCH_BY_ENTITY:
+            self.keyset_search_function = MySQLSearchDataExtractor._KEYSET_SEARCH_BY_ENTITY[self.entity]
         else:
             self.search_function = MySQLSearchDataExtractor._DEFAULT_SEARCH_BY_ENTITY[self.entity]
         self.published_tag = conf.get_string(MySQLSearchDataExtractor.JOB_PUBLISH_TAG, '')
         self.query_limit = conf.get_int(MySQLSearchDataExtractor.QUERY_LIMIT, self._DEFAULT_QUERY_LIMIT)
+        self.query_parallelism = conf.get_int(MySQLSearchDataExtractor.QUERY_PARALLELISM, 1)
 
         connect_args = {k: v for k, v in self.conf.get_config(MySQLSearchDataExtractor.CONNECT_ARGS,
                                                               default=ConfigTree()).items()}
@@ -516,6 +711,14 @@ class MySQLSearchDataExtractor(Extractor):
             return None
 
     def _get_extract_iter(self) -> Iterator[Any]:
+        if self.keyset_search_function:
+            results = self.keyset_search_function(session_factory=self._session_factory,
+                                                  published_tag=self.published_tag,
+                                                  limit=self.query_limit,
+                                                  parallelism=self.query_parallelism)
+            yield from self._to_models(results)
+            return
+
         if not hasattr(self, 'results'):
             session = self._session_factory()
             try:
@@ -528,7 +731,10 @@ class MySQLSearchDataExtractor(Extractor):
             finally:
                 session.close()
 
-        for result in self.results:
+        yield from self._to_models(self.results)
+
+    def _to_models(self, results: Iterable[Dict]) -> Iterator[Any]:
+        for result in results:
             if hasattr(self, 'model_class'):
                 obj = self.model_class(**result)
                 yield obj
@@ -3,8 +3,9 @@
 
 import importlib
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import (
-    Any, Iterator, Union,
+    Any, Iterator, List, Union,
 )
 
 import neo4j
@@ -30,10 +31,26 @@ class Neo4jExtractor(Extractor):
     """NEO4J_ENCRYPTED is a boolean indicating whether to use SSL/TLS when connecting."""
     NEO4J_VALIDATE_SSL = 'neo4j_validate_ssl'
     """NEO4J_VALIDATE_SSL is a boolean indicating whether to validate the server's SSL/TLS cert against system CAs."""
+    PAGE_SIZE = 'page_size'
+    """
+    PAGE_SIZE enables keyset pagination when positive. The query is then run once per page with $last_key and
+    $page_size parameters, and should return the next page ordered by the key, e.g.
+    MATCH (table:Table) WHERE table.key > $last_key ... RETURN table.key AS key ORDER BY table.key LIMIT $page_size
+    """
+    PAGINATION_KEY = 'pagination_key'
+    """PAGINATION_KEY is the field of the query result holding the key the pages are ordered by."""
+    START_KEY = 'start_key'
+    """START_KEY is the key after which the first page starts. Set it to the logged last key to resume a failed run."""
+    PREFETCH_PAGE = 'prefetch_page'
+    """PREFETCH_PAGE is a boolean indicating whether to fetch the next page in the background while emitting a page."""
 
     DEFAULT_CONFIG = ConfigFactory.from_dict({NEO4J_MAX_CONN_LIFE_TIME_SEC: 50,
                                               NEO4J_ENCRYPTED: True,
-                                              NEO4J_VALIDATE_SSL: False})
+                                              NEO4J_VALIDATE_SSL: False,
+                                              PAGE_SIZE: 0,
+                                              PAGINATION_KEY: 'key',
+                                              START_KEY: '',
+                                              PREFETCH_PAGE: False})
 
     def init(self, conf: ConfigTree) -> None:
         """
@@ -45,6 +62,12 @@ class Neo4jExtractor(Extractor):
         self.cypher_query = conf.get_string(Neo4jExtractor.CYPHER_QUERY_CONFIG_KEY)
         self.driver = self._get_driver()
 
+        self.page_size = self.conf.get_int(Neo4jExtractor.PAGE_SIZE)
+        self.pagination_key = self.conf.get_string(Neo4jExtractor.PAGINATION_KEY)
+        self.prefetch_page = self.conf.get_bool(Neo4jExtractor.PREFETCH_PAGE)
+        # Key of the last record emitted in pagination mode
+        self.last_key = self.conf.get_string(Neo4jExtractor.START_KEY)
+
         self._extract_iter: Union[None, Iterator] = None
 
         model_class = conf.get(Neo4jExtractor.MODEL_CLASS_CONFIG_KEY, None)
@@ -84,20 +107,71 @@ class Neo4jExtractor(Extractor):
         result = tx.run(self.cypher_query)
         return result
 
-    def _get_extract_iter(self) -> Iterator[Any]:
+    def _execute_page_query(self, tx: Any, last_key: str) -> List[Any]:
         """
-        Execute {cypher_query} and yield result one at a time
+        Fetch the page of records after last_key.
+        """
+        LOGGER.debug('Fetching page after %s', last_key)
+        return list(tx.run(self.cypher_query, last_key=last_key, page_size=self.page_size))
+
+    def _fetch_page(self, last_key: str) -> List[Any]:
+        # Each page runs in its own session, so that it can be fetched from another thread
+        with self.driver.session() as session:
+            return session.read_transaction(self._execute_page_query, last_key)
+
+    def _get_pages(self) -> Iterator[List[Any]]:
+        """
+        Yield pages until a page is shorter than the page size. With PREFETCH_PAGE, the next page is fetched while
+        the current one is emitted, so the server query overlaps with the downstream processing.
         """
+        if not self.prefetch_page:
+            page = self._fetch_page(self.last_key)
+            while len(page) == self.page_size:
+                yield page
+                page = self._fetch_page(page[-1][self.pagination_key])
+            yield page
+            return
+
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix='neo4j-page-fetcher') as executor:
+            page = self._fetch_page(self.last_key)
+            while len(page) == self.page_size:
+                next_page = executor.submit(self._fetch_page, page[-1][self.pagination_key])
+                yield page
+                page = next_page.result()
+            yield page
+
+    def _get_paginated_results(self) -> Iterator[Any]:
+        try:
+            for page in self._get_pages():
+                for result in page:
+                    self.last_key = result[self.pagination_key]
+                    yield result
+        except Exception:
+            LOGGER.exception('Failed to fetch the page after %s. Set %s to resume from there.',
+                             self.last_key, Neo4jExtractor.START_KEY)
+            raise
+
+    def _get_results(self) -> Iterator[Any]:
+        if self.page_size > 0:
+            yield from self._get_paginated_results()
+            return
+
         with self.driver.session() as session:
             if not hasattr(self, 'results'):
                 self.results = session.read_transaction(self._execute_query)
 
-            for result in self.results:
-                if hasattr(self, 'model_class'):
-                    obj = self.model_class(**result)
-                    yield obj
-                else:
-                    yield result
+            yield from self.results
+
+    def _get_extract_iter(self) -> Iterator[Any]:
+        """
+        Execute {cypher_query} and yield result one at a time
+        """
+        for result in self._get_results():
+            if hasattr(self, 'model_class'):
+                obj = self.model_class(**result)
+                yield obj
+            else:
+                yield result
 
     def extract(self) -> Any:
         """
@@ -114,6 +114,109 @@ class Neo4jSearchDataExtractor(Extractor):
         """
     )
 
+    # Keyset paginated variants of the default queries, used when Neo4jExtractor.PAGE_SIZE is set. Each page is
+    # limited right after the matches that can drop an entity, so that only a short page ends the pagination.
+    DEFAULT_NEO4J_PAGINATED_TABLE_CYPHER_QUERY = textwrap.dedent(
+        """
+        MATCH (db:Database)<-[:CLUSTER_OF]-(cluster:Cluster)
+        <-[:SCHEMA_OF]-(schema:Schema)<-[:TABLE_OF]-(table:Table)
+        WHERE table.key > $last_key
+        WITH db, cluster, schema, table
+        {publish_tag_filter}
+        WITH db, cluster, schema, table ORDER BY table.key LIMIT $page_size
+        OPTIONAL MATCH (table)-[:DESCRIPTION]->(table_description:Description)
+        OPTIONAL MATCH (schema)-[:DESCRIPTION]->(schema_description:Description)
+        OPTIONAL MATCH (table)-[:DESCRIPTION]->(prog_descs:Programmatic_Description)
+        WITH db, cluster, schema, schema_description, table, table_description,
+        COLLECT(prog_descs.description) as programmatic_descriptions
+        OPTIONAL MATCH (table)-[:TAGGED_BY]->(tags:Tag) WHERE tags.tag_type='default'
+        WITH db, cluster, schema, schema_description, table, table_description, programmatic_descriptions,
+        COLLECT(DISTINCT tags.key) as tags
+        OPTIONAL MATCH (table)-[:HAS_BADGE]->(badges:Badge)
+        WITH db, cluster, schema, schema_description, table, table_description, programmatic_descriptions, tags,
+        COLLECT(DISTINCT badges.key) as badges
+        OPTIONAL MATCH (table)-[read:READ_BY]->(user:User)
+        WITH db, cluster, schema, schema_description, table, table_description, programmatic_descriptions, tags, badges,
+        SUM(read.read_count) AS total_usage,
+        COUNT(DISTINCT user.email) as unique_usage
+        OPTIONAL MATCH (table)-[:COLUMN]->(col:Column)
+        OPTIONAL MATCH (col)-[:DESCRIPTION]->(col_description:Description)
+        WITH db, cluster, schema, schema_description, table, table_description, tags, badges, total_usage, unique_usage,
+        programmatic_descriptions,
+        COLLECT(col.name) AS column_names, COLLECT(col_description.description) AS column_descriptions
+        OPTIONAL MATCH (table)-[:LAST_UPDATED_AT]->(time_stamp:Timestamp)
+        RETURN db.name as database, cluster.name AS cluster, schema.name AS schema,
+        schema_description.description AS schema_description,
+        table.name AS name, table.key AS key, table_description.description AS description,
+        time_stamp.last_updated_timestamp AS last_updated_timestamp,
+        column_names,
+        column_descriptions,
+        total_usage,
+        unique_usage,
+        tags,
+        badges,
+        programmatic_descriptions
+        ORDER BY table.key;
+        """
+    )
+
+    DEFAULT_NEO4J_PAGINATED_USER_CYPHER_QUERY = textwrap.dedent(
+        """
+        MATCH (user:User)
+        WHERE user.email > $last_key AND user.full_name is not null
+        WITH user ORDER BY user.email LIMIT $page_size
+        OPTIONAL MATCH (user)-[read:READ]->(a)
+        OPTIONAL MATCH (user)-[own:OWNER_OF]->(b)
+        OPTIONAL MATCH (user)-[follow:FOLLOWED_BY]->(c)
+        OPTIONAL MATCH (user)-[manage_by:MANAGE_BY]->(manager)
+        {publish_tag_filter}
+        with user, a, b, c, read, own, follow, manager
+        return user.email as email, user.first_name as first_name, user.last_name as last_name,
+        user.full_name as full_name, user.github_username as github_username, user.team_name as team_name,
+        user.employee_type as employee_type, manager.email as manager_email,
+        user.slack_id as slack_id, user.is_active as is_active, user.role_name as role_name,
+        REDUCE(sum_r = 0, r in COLLECT(DISTINCT read)| sum_r + r.read_count) AS total_read,
+        count(distinct b) as total_own,
+        count(distinct c) AS total_follow
+        order by user.email
+        """
+    )
+
+    DEFAULT_NEO4J_PAGINATED_DASHBOARD_CYPHER_QUERY = textwrap.dedent(
+        """
+         MATCH (dashboard:Dashboard)
+         WHERE dashboard.key > $last_key
+         WITH dashboard
+         {publish_tag_filter}
+         MATCH (dashboard)-[:DASHBOARD_OF]->(dbg:Dashboardgroup)
+         MATCH (dbg)-[:DASHBOARD_GROUP_OF]->(cluster:Cluster)
+         WITH dashboard, dbg, cluster ORDER BY dashboard.key LIMIT $page_size
+         OPTIONAL MATCH (dashboard)-[:DESCRIPTION]->(db_descr:Description)
+         OPTIONAL MATCH (dbg)-[:DESCRIPTION]->(dbg_descr:Description)
+         OPTIONAL MATCH (dashboard)-[:EXECUTED]->(last_exec:Execution)
+         WHERE split(last_exec.key, '/')[5] = '_last_successful_execution'
+         OPTIONAL MATCH (dashboard)-[read:READ_BY]->(user:User)
+         WITH dashboard, dbg, db_descr, dbg_descr, cluster, last_exec, SUM(read.read_count) AS total_usage
+         OPTIONAL MATCH (dashboard)-[:HAS_QUERY]->(query:Query)-[:HAS_CHART]->(chart:Chart)
+         WITH dashboard, dbg, db_descr, dbg_descr, cluster, last_exec, COLLECT(DISTINCT query.name) as query_names,
+         COLLECT(DISTINCT chart.name) as chart_names,
+         total_usage
+         OPTIONAL MATCH (dashboard)-[:TAGGED_BY]->(tags:Tag) WHERE tags.tag_type='default'
+         WITH dashboard, dbg, db_descr, dbg_descr, cluster, last_exec, query_names, chart_names, total_usage,
+         COLLECT(DISTINCT tags.key) as tags
+         OPTIONAL MATCH (dashboard)-[:HAS_BADGE]->(badges:Badge)
+         WITH  dashboard, dbg, db_descr, dbg_descr, cluster, last_exec, query_names, chart_names, total_usage, tags,
+         COLLECT(DISTINCT badges.key) as badges
+         RETURN dbg.name as group_name, dashboard.name as name, cluster.name as cluster,
+         coalesce(db_descr.description, '') as description,
+         coalesce(dbg.description, '') as group_description, dbg.dashboard_group_url as group_url,
+         dashboard.dashboard_url as url, dashboard.key as uri,
+         split(dashboard.key, '_')[0] as product, toInteger(last_exec.timestamp) as last_successful_run_timestamp,
+         query_names, chart_names, total_usage, tags, badges
+         order by dashboard.key
+        """
+    )
+
     # todo: we will add more once we add more entities
     DEFAULT_QUERY_BY_ENTITY = {
         'table': DEFAULT_NEO4J_TABLE_CYPHER_QUERY,
@@ -121,23 +224,45 @@ class Neo4jSearchDataExtractor(Extractor):
         'dashboard': DEFAULT_NEO4J_DASHBOARD_CYPHER_QUERY
     }
 
+    DEFAULT_PAGINATED_QUERY_BY_ENTITY = {
+        'table': DEFAULT_NEO4J_PAGINATED_TABLE_CYPHER_QUERY,
+        'user': DEFAULT_NEO4J_PAGINATED_USER_CYPHER_QUERY,
+        'dashboard': DEFAULT_NEO4J_PAGINATED_DASHBOARD_CYPHER_QUERY
+    }
+
+    # Result field each paginated default query is ordered by
+    PAGINATION_KEY_BY_ENTITY = {
+        'table': 'key',
+        'user': 'email',
+        'dashboard': 'uri'
+    }
+
     def init(self, conf: ConfigTree) -> None:
         """
         Initialize Neo4jExtractor object from configuration and use that for extraction
         """
         self.conf = conf
         self.entity = conf.get_string(Neo4jSearchDataExtractor.ENTITY_TYPE, default='table').lower()
+        self.neo4j_extractor = Neo4jExtractor()
+        neo4j_scope = self.neo4j_extractor.get_scope()
+        is_paginated = conf.get_int(f'{neo4j_scope}.{Neo4jExtractor.PAGE_SIZE}', 0) > 0
+
         # extract cypher query from conf, if specified, else use default query
         if Neo4jSearchDataExtractor.CYPHER_QUERY_CONFIG_KEY in conf:
             self.cypher_query = conf.get_string(Neo4jSearchDataExtractor.CYPHER_QUERY_CONFIG_KEY)
         else:
-            default_query = Neo4jSearchDataExtractor.DEFAULT_QUERY_BY_ENTITY[self.entity]
+            if is_paginated:
+                default_query = Neo4jSearchDataExtractor.DEFAULT_PAGINATED_QUERY_BY_ENTITY[self.entity]
+                pagination_key = f'{neo4j_scope}.{Neo4jExtractor.PAGINATION_KEY}'
+                if pagination_key not in self.conf:
+                    self.conf.put(pagination_key, Neo4jSearchDataExtractor.PAGINATION_KEY_BY_ENTITY[self.entity])
+            else:
+                default_query = Neo4jSearchDataExtractor.DEFAULT_QUERY_BY_ENTITY[self.entity]
             self.cypher_query = self._add_publish_tag_filter(conf.get_string(JOB_PUBLISH_TAG, ''),
                                                              cypher_query=default_query)
 
-        self.neo4j_extractor = Neo4jExtractor()
         # write the cypher query in configs in Neo4jExtractor scope
-        key = self.neo4j_extractor.get_scope() + '.' + Neo4jExtractor.CYPHER_QUERY_CONFIG_KEY
+        key = neo4j_scope + '.' + Neo4jExtractor.CYPHER_QUERY_CONFIG_KEY
         self.conf.put(key, self.cypher_query)
         # initialize neo4j_extractor from configs
         self.neo4j_extractor.init(Scoped.get_scoped_conf(self.conf, self.neo4j_extractor.get_scope()))
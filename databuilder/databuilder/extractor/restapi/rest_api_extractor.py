@@ -11,6 +11,8 @@ from pyhocon import ConfigTree
 
 from databuilder.extractor.base_extractor import Extractor
 from databuilder.rest_api.base_rest_api_query import BaseRestApiQuery
+from databuilder.rest_api.rest_api_query import RestApiQuery
+from databuilder.rest_api.rest_api_response_cache import RestApiResponseCache
 
 REST_API_QUERY = 'restapi_query'
 MODEL_CLASS = 'model_class'
@@ -20,6 +22,11 @@ MODEL_CLASS = 'model_class'
 #  it. and you can add {'product': 'mode'} so that it will be included in the record.
 STATIC_RECORD_DICT = 'static_record_dict'
 
+# Directory where the responses of the REST API are cached, see RestApiResponseCache. No cache if not set.
+RESPONSE_CACHE_DIRECTORY = 'response_cache_directory'
+# Whether the cached responses are replayed without calling the REST API
+RESPONSE_CACHE_OFFLINE = 'response_cache_offline'
+
 LOGGER = logging.getLogger(__name__)
 
 
@@ -36,6 +43,13 @@ class RestAPIExtractor(Extractor):
         self._static_dict = conf.get(STATIC_RECORD_DICT, dict())
         LOGGER.info('static record: %s', self._static_dict)
 
+        response_cache_directory = conf.get_string(RESPONSE_CACHE_DIRECTORY, None)
+        if response_cache_directory and isinstance(self._restapi_query, RestApiQuery):
+            LOGGER.info('Caching the REST API responses in %s', response_cache_directory)
+            self._restapi_query.set_response_cache(
+                RestApiResponseCache(directory=response_cache_directory,
+                                     offline=conf.get_bool(RESPONSE_CACHE_OFFLINE, False)))
+
         model_class = conf.get(MODEL_CLASS, None)
         if model_class:
             module_name, class_name = model_class.rsplit(".", 1)
@@ -2,7 +2,7 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import importlib
-from typing import Any
+from typing import Any, Iterator
 
 from pyhocon import ConfigFactory, ConfigTree
 from sqlalchemy import create_engine
@@ -16,8 +16,13 @@ class SQLAlchemyExtractor(Extractor):
     CONN_STRING = 'conn_string'
     EXTRACT_SQL = 'extract_sql'
     CONNECT_ARGS = 'connect_args'
+    # Number of rows fetched from the database at a time. When it's positive, the query is executed with
+    # stream_results so that dialects supporting server side cursors (e.g: psycopg2, mysqldb, pymysql) don't buffer
+    # the whole result set on the client.
+    FETCH_SIZE = 'fetch_size'
     """
-    An Extractor that extracts records via SQLAlchemy. Database that supports SQLAlchemy can use this extractor
+    An Extractor that extracts records via SQLAlchemy. Database that supports SQLAlchemy can use this extractor.
+    Rows are converted to model_class lazily, as they are extracted.
     """
 
     def init(self, conf: ConfigTree) -> None:
@@ -31,6 +36,7 @@ class SQLAlchemyExtractor(Extractor):
         self.connection = self._get_connection()
 
         self.extract_sql = conf.get_string(SQLAlchemyExtractor.EXTRACT_SQL)
+        self.fetch_size = conf.get_int(SQLAlchemyExtractor.FETCH_SIZE, 0)
 
         model_class = conf.get('model_class', None)
         if model_class:
@@ -62,14 +68,27 @@ class SQLAlchemyExtractor(Extractor):
         Create an iterator to execute sql.
         """
         if not hasattr(self, 'results'):
-            self.results = self.connection.execute(self.extract_sql)
+            if self.fetch_size > 0:
+                self.results = self.connection.execution_options(stream_results=True).execute(self.extract_sql)
+            else:
+                self.results = self.connection.execute(self.extract_sql)
 
+        self.iter: Iterator[Any] = self._fetch_results()
         if hasattr(self, 'model_class'):
-            results = [self.model_class(**result)
-                       for result in self.results]
+            self.iter = (self.model_class(**result) for result in self.iter)
+
+    def _fetch_results(self) -> Iterator[Any]:
+        """
+        Iterate over the result rows, fetching fetch_size rows at a time if configured.
+        """
+        if self.fetch_size > 0 and hasattr(self.results, 'fetchmany'):
+            while True:
+                rows = self.results.fetchmany(self.fetch_size)
+                if not rows:
+                    return
+                yield from rows
         else:
-            results = self.results
-        self.iter = iter(results)
+            yield from self.results
 
     def extract(self) -> Any:
         """
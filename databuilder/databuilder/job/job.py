@@ -1,15 +1,24 @@
 # Copyright Contributors to the Amundsen project.
 # SPDX-License-Identifier: Apache-2.0
 
+import json
 import logging
+import threading
+import time
+from typing import List, Optional
 
 from pyhocon import ConfigTree
 from statsd import StatsClient
 
 from databuilder import Scoped
 from databuilder.job.base_job import Job
-from databuilder.publisher.base_publisher import NoopPublisher, Publisher
+from databuilder.publisher.base_publisher import (
+    NoopPublisher, Publisher, StreamingPublisher,
+)
 from databuilder.task.base_task import Task
+from databuilder.utils.instrumentation import (
+    StageStats, get_bytes_written, get_peak_rss_bytes,
+)
 
 LOGGER = logging.getLogger(__name__)
 
@@ -18,6 +27,8 @@ class DefaultJob(Job):
     # Config keys
     IS_STATSD_ENABLED = 'is_statsd_enabled'
     JOB_IDENTIFIER = 'identifier'
+    # A file path where a JSON report of the run is written at the end of the job
+    RUN_REPORT_PATH = 'run_report_path'
 
     """
     Default job that expects a task, and optional publisher
@@ -25,6 +36,14 @@ class DefaultJob(Job):
     amundsen.databuilder.job.[identifier] .
     Note that job.identifier is part of metrics prefix and choose unique & readable identifier for the job.
 
+    At the end of the job, stats of each stage (extractor, transformer, loader and publisher) are emitted through
+    statsd as [stage].busy_time timer and [stage].record_count, [stage].records_per_sec and [stage].bytes_written
+    gauges, and written as JSON if job.run_report_path is configured. The stages share the process, so its peak
+    resident set size is reported once for the job, as the peak_rss_bytes gauge.
+
+    If the publisher is a StreamingPublisher, it is published in a background thread while the task runs, instead of
+    after the task.
+
     To configure statsd itself, use environment variable: https://statsd.readthedocs.io/en/v3.2.1/configure.html
     """
 
@@ -57,19 +76,24 @@ class DefaultJob(Job):
         """
 
         logging.info('Launching a job')
+        start = time.time()
+        self._publisher_stats = StageStats('publisher')
         #  Using nested try finally to make sure task get closed as soon as possible as well as to guarantee all the
         #  closeable get closed.
         try:
             is_success = True
             self._init()
-            try:
-                self.task.run()
-            finally:
-                self.task.close()
-
-            self.publisher.init(Scoped.get_scoped_conf(self.conf, self.publisher.get_scope()))
-            Job.closer.register(self.publisher.close)
-            self.publisher.publish()
+            if isinstance(self.publisher, StreamingPublisher):
+                self._run_with_streaming_publisher(self.publisher)
+            else:
+                try:
+                    self.task.run()
+                finally:
+                    self.task.close()
+
+                self.publisher.init(Scoped.get_scoped_conf(self.conf, self.publisher.get_scope()))
+                Job.closer.register(self.publisher.close)
+                self._publish(measure_bytes_written=True)
 
         except Exception as e:
             is_success = False
@@ -84,6 +108,102 @@ class DefaultJob(Job):
                     LOGGER.info('Publishing job metrics for failure')
                     self.statsd.incr('fail')
 
+            self._report_stats(is_success=is_success, start=start)
             Job.closer.close()
 
         logging.info('Job completed')
+
+    def _run_with_streaming_publisher(self, publisher: StreamingPublisher) -> None:
+        """
+        Runs the task while the publisher publishes in a background thread. The task is closed before the publisher is
+        finished, so that the loader can hand over what it has buffered.
+        :param publisher:
+        :return:
+        """
+        publisher.init(Scoped.get_scoped_conf(self.conf, publisher.get_scope()))
+        Job.closer.register(publisher.close)
+
+        publisher_errors: List[Exception] = []
+
+        def _publish() -> None:
+            try:
+                # Bytes written by the publisher can't be told apart from the task's, as they run concurrently
+                self._publish(measure_bytes_written=False)
+            except Exception as e:
+                publisher_errors.append(e)
+
+        publisher_thread = threading.Thread(target=_publish, name='streaming-publisher', daemon=True)
+        publisher_thread.start()
+        try:
+            try:
+                self.task.run()
+            finally:
+                self.task.close()
+        except Exception:
+            publisher.abort()
+            publisher_thread.join()
+            raise
+
+        try:
+            publisher.finish()
+        finally:
+            publisher_thread.join()
+        if publisher_errors:
+            raise publisher_errors[0]
+
+    def _publish(self, measure_bytes_written: bool) -> None:
+        """
+        Publishes while recording the publisher stats.
+        :param measure_bytes_written:
+        :return:
+        """
+        stats = self._publisher_stats
+        bytes_written_start = get_bytes_written() if measure_bytes_written else None
+        start = time.time()
+        try:
+            self.publisher.publish()
+        finally:
+            stats.busy_time = time.time() - start
+            stats.record_count = self.publisher.get_published_count() or 0
+            bytes_written_end = get_bytes_written() if measure_bytes_written else None
+            if bytes_written_start is not None and bytes_written_end is not None:
+                stats.bytes_written = bytes_written_end - bytes_written_start
+
+    def _report_stats(self, is_success: bool, start: float) -> None:
+        """
+        Emits the stats of each stage through statsd, and writes the run report if configured.
+        Failing to report doesn't fail the job.
+        :param is_success:
+        :param start: Start time of the job in epoch seconds
+        :return:
+        """
+        try:
+            stage_stats = list(self.task.get_stage_stats().values()) + [self._publisher_stats]
+            peak_rss_bytes = get_peak_rss_bytes()
+            LOGGER.info('Job stage stats: %s, peak RSS bytes: %s', stage_stats, peak_rss_bytes)
+
+            if self.statsd:
+                for stats in stage_stats:
+                    self.statsd.timing(f'{stats.name}.busy_time', int(stats.busy_time * 1000))
+                    self.statsd.gauge(f'{stats.name}.record_count', stats.record_count)
+                    self.statsd.gauge(f'{stats.name}.records_per_sec', stats.records_per_sec)
+                    if stats.bytes_written is not None:
+                        self.statsd.gauge(f'{stats.name}.bytes_written', stats.bytes_written)
+                if peak_rss_bytes is not None:
+                    self.statsd.gauge('peak_rss_bytes', peak_rss_bytes)
+
+            report_path: Optional[str] = self.scoped_conf.get_string(DefaultJob.RUN_REPORT_PATH, None)
+            if report_path:
+                report = {
+                    'identifier': self.scoped_conf.get_string(DefaultJob.JOB_IDENTIFIER, None),
+                    'is_success': is_success,
+                    'start_epoch_sec': int(start),
+                    'elapsed_sec': round(time.time() - start, 3),
+                    'peak_rss_bytes': peak_rss_bytes,
+                    'stages': {stats.name: stats.to_dict() for stats in stage_stats},
+                }
+                with open(report_path, 'w') as report_file:
+                    json.dump(report, report_file, indent=2)
+                LOGGER.info('Wrote run report to %s', report_path)
+        except Exception:
+            LOGGER.exception('Failed to report job stats')
@@ -2,20 +2,32 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import os
+from typing import List
 
 from pyhocon import ConfigTree
 
 from databuilder.loader.base_loader import Loader
 from databuilder.models.elasticsearch_document import ElasticsearchDocument
+from databuilder.utils.file_utils import open_text_file
 
 
 class FSElasticsearchJSONLoader(Loader):
     """
     Loader class to produce Elasticsearch bulk load file to Local FileSystem
+
+    The documents are buffered and written to the file in batches. The file is gzip compressed if its path ends
+    with .gz, which ElasticsearchPublisher reads as well.
     """
     FILE_PATH_CONFIG_KEY = 'file_path'
     FILE_MODE_CONFIG_KEY = 'mode'
 
+    # config for the number of buffered documents, and their size in characters, that triggers a write to the file
+    FLUSH_RECORD_COUNT_CONFIG_KEY = 'flush_record_count'
+    FLUSH_BUFFER_SIZE_CONFIG_KEY = 'flush_buffer_size'
+
+    DEFAULT_FLUSH_RECORD_COUNT = 1000
+    DEFAULT_FLUSH_BUFFER_SIZE = 1024 * 1024
+
     def init(self, conf: ConfigTree) -> None:
         """
 
@@ -25,10 +37,17 @@ class FSElasticsearchJSONLoader(Loader):
         self.conf = conf
         self.file_path = self.conf.get_string(FSElasticsearchJSONLoader.FILE_PATH_CONFIG_KEY)
         self.file_mode = self.conf.get_string(FSElasticsearchJSONLoader.FILE_MODE_CONFIG_KEY, 'w')
+        self.flush_record_count = self.conf.get_int(FSElasticsearchJSONLoader.FLUSH_RECORD_COUNT_CONFIG_KEY,
+                                                    FSElasticsearchJSONLoader.DEFAULT_FLUSH_RECORD_COUNT)
+        self.flush_buffer_size = self.conf.get_int(FSElasticsearchJSONLoader.FLUSH_BUFFER_SIZE_CONFIG_KEY,
+                                                   FSElasticsearchJSONLoader.DEFAULT_FLUSH_BUFFER_SIZE)
 
         file_dir = self.file_path.rsplit('/', 1)[0]
         self._ensure_directory_exists(file_dir)
-        self.file_handler = open(self.file_path, self.file_mode)
+        self.file_handler = open_text_file(self.file_path, self.file_mode)
+
+        self._buffer: List[str] = []
+        self._buffer_size = 0
 
     def _ensure_directory_exists(self, path: str) -> None:
         """
@@ -43,7 +62,7 @@ class FSElasticsearchJSONLoader(Loader):
 
     def load(self, record: ElasticsearchDocument) -> None:
         """
-        Write a record in json format to file
+        Buffer a record in json format, and write the buffer to file once it reaches the flush thresholds
         :param record:
         :return:
         """
@@ -53,15 +72,30 @@ class FSElasticsearchJSONLoader(Loader):
         if not isinstance(record, ElasticsearchDocument):
             raise Exception("Record not of type 'ElasticsearchDocument'!")
 
-        self.file_handler.write(record.to_json())
-        self.file_handler.flush()
+        document = record.to_json()
+        self._buffer.append(document)
+        self._buffer_size += len(document)
+        if len(self._buffer) >= self.flush_record_count or self._buffer_size >= self.flush_buffer_size:
+            self._flush()
+
+    def _flush(self) -> None:
+        """
+        Write the buffered records to file with a single call
+        :return:
+        """
+        if self._buffer:
+            self.file_handler.write(''.join(self._buffer))
+            self.file_handler.flush()
+            self._buffer = []
+            self._buffer_size = 0
 
     def close(self) -> None:
         """
-        close the file handler
+        flush the buffered records and close the file handler
         :return:
         """
         if self.file_handler:
+            self._flush()
             self.file_handler.close()
 
     def get_scope(self) -> str:
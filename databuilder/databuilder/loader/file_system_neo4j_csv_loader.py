@@ -14,6 +14,8 @@ from pyhocon import ConfigFactory, ConfigTree
 
 from databuilder.job.base_job import Job
 from databuilder.loader.base_loader import Loader
+from databuilder.models.graph_node import GraphNode
+from databuilder.models.graph_relationship import GraphRelationship
 from databuilder.models.graph_serializable import GraphSerializable
 from databuilder.serializers import neo4_serializer
 from databuilder.utils.closer import Closer
@@ -110,34 +112,50 @@ class FsNeo4jCSVLoader(Loader):
 
         node = csv_serializable.next_node()
         while node:
-            node_dict = neo4_serializer.serialize_node(node)
-            key = (node.label, self._make_key(node_dict))
-            file_suffix = '{}_{}'.format(*key)
-            node_writer = self._get_writer(node_dict,
-                                           self._node_file_mapping,
-                                           key,
-                                           self._node_dir,
-                                           file_suffix)
-            node_writer.writerow(node_dict)
+            self.write_node(node)
             node = csv_serializable.next_node()
 
         relation = csv_serializable.next_relation()
         while relation:
-            relation_dict = neo4_serializer.serialize_relationship(relation)
-            key2 = (relation.start_label,
-                    relation.end_label,
-                    relation.type,
-                    self._make_key(relation_dict))
-
-            file_suffix = f'{key2[0]}_{key2[1]}_{key2[2]}'
-            relation_writer = self._get_writer(relation_dict,
-                                               self._relation_file_mapping,
-                                               key2,
-                                               self._relation_dir,
-                                               file_suffix)
-            relation_writer.writerow(relation_dict)
+            self.write_relationship(relation)
             relation = csv_serializable.next_relation()
 
+    def write_node(self, node: GraphNode) -> None:
+        """
+        Writes a node into the CSV file of its label and header.
+        :param node:
+        :return:
+        """
+        node_dict = neo4_serializer.serialize_node(node)
+        key = (node.label, self._make_key(node_dict))
+        file_suffix = '{}_{}'.format(*key)
+        node_writer = self._get_writer(node_dict,
+                                       self._node_file_mapping,
+                                       key,
+                                       self._node_dir,
+                                       file_suffix)
+        node_writer.writerow(node_dict)
+
+    def write_relationship(self, relation: GraphRelationship) -> None:
+        """
+        Writes a relationship into the CSV file of its labels, type and header.
+        :param relation:
+        :return:
+        """
+        relation_dict = neo4_serializer.serialize_relationship(relation)
+        key2 = (relation.start_label,
+                relation.end_label,
+                relation.type,
+                self._make_key(relation_dict))
+
+        file_suffix = f'{key2[0]}_{key2[1]}_{key2[2]}'
+        relation_writer = self._get_writer(relation_dict,
+                                           self._relation_file_mapping,
+                                           key2,
+                                           self._relation_dir,
+                                           file_suffix)
+        relation_writer.writerow(relation_dict)
+
     def _get_writer(self,
                     csv_record_dict: Dict[str, Any],
                     file_mapping: Dict[Any, DictWriter],
@@ -0,0 +1,111 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+from typing import (
+    Any, Dict, List, Optional,
+)
+
+from pyhocon import ConfigFactory, ConfigTree
+
+from databuilder.loader.base_loader import Loader
+from databuilder.loader.file_system_neo4j_csv_loader import FsNeo4jCSVLoader
+from databuilder.models.graph_serializable import GraphSerializable
+from databuilder.publisher.neo4j_streaming_publisher import Neo4jStreamingPublisher
+from databuilder.serializers import neo4_serializer
+
+
+class Neo4jStreamingLoader(Loader):
+    """
+    Hands serialized nodes and relationships over to a Neo4jStreamingPublisher in batches, instead of writing CSV
+    files for Neo4jCsvPublisher. The same publisher instance needs to be given to DefaultJob, which runs it while the
+    task is running.
+
+    Pending nodes are always handed over before relationships, so that a relationship is published after the nodes
+    loaded before it.
+
+    With SPILL_TO_CSV, records are also written as CSV files through FsNeo4jCSVLoader (configured under this loader's
+    scope), which can be used to debug or to replay the job with Neo4jCsvPublisher. Set
+    FsNeo4jCSVLoader.SHOULD_DELETE_CREATED_DIR to False to keep them after the job.
+    """
+    # Config keys
+    # Number of nodes or relationships handed over to the publisher at a time
+    BATCH_SIZE = 'batch_size'
+    SPILL_TO_CSV = 'spill_to_csv'
+
+    _DEFAULT_CONFIG = ConfigFactory.from_dict({
+        BATCH_SIZE: 1000,
+        SPILL_TO_CSV: False
+    })
+
+    def __init__(self, publisher: Neo4jStreamingPublisher) -> None:
+        self._publisher = publisher
+        self._nodes: List[Dict[str, Any]] = []
+        self._relations: List[Dict[str, Any]] = []
+        self._csv_loader: Optional[FsNeo4jCSVLoader] = None
+
+    def init(self, conf: ConfigTree) -> None:
+        conf = conf.with_fallback(Neo4jStreamingLoader._DEFAULT_CONFIG)
+
+        self._batch_size = conf.get_int(Neo4jStreamingLoader.BATCH_SIZE)
+        if conf.get_bool(Neo4jStreamingLoader.SPILL_TO_CSV):
+            self._csv_loader = FsNeo4jCSVLoader()
+            self._csv_loader.init(conf)
+
+    def load(self, csv_serializable: GraphSerializable) -> None:
+        """
+        Serializes nodes and relationships the same way FsNeo4jCSVLoader does, and hands them over once a batch is full.
+        :param csv_serializable:
+        :return:
+        """
+        node = csv_serializable.next_node()
+        while node:
+            if self._csv_loader:
+                self._csv_loader.write_node(node)
+            self._nodes.append(self._to_csv_values(neo4_serializer.serialize_node(node)))
+            if len(self._nodes) >= self._batch_size:
+                self._flush_nodes()
+            node = csv_serializable.next_node()
+
+        relation = csv_serializable.next_relation()
+        while relation:
+            if self._csv_loader:
+                self._csv_loader.write_relationship(relation)
+            self._relations.append(self._to_csv_values(neo4_serializer.serialize_relationship(relation)))
+            if len(self._relations) >= self._batch_size:
+                self._flush_relations()
+            relation = csv_serializable.next_relation()
+
+    def _to_csv_values(self, record_dict: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        None is written as an empty string in CSV, and published that way by Neo4jCsvPublisher. Keep it that way so
+        that both paths publish the same properties.
+        :param record_dict:
+        :return:
+        """
+        return {k: '' if v is None else v for k, v in record_dict.items()}
+
+    def _flush_nodes(self) -> None:
+        if self._nodes:
+            self._publisher.put_nodes(self._nodes)
+            self._nodes = []
+
+    def _flush_relations(self) -> None:
+        # Relationships refer to the nodes loaded before them
+        self._flush_nodes()
+        if self._relations:
+            self._publisher.put_relations(self._relations)
+            self._relations = []
+
+    def close(self) -> None:
+        """
+        Hands over what's left in the buffers.
+        :return:
+        """
+        try:
+            self._flush_relations()
+        finally:
+            if self._csv_loader:
+                self._csv_loader.close()
+
+    def get_scope(self) -> str:
+        return 'loader.neo4j_streaming'
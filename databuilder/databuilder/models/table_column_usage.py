@@ -2,7 +2,7 @@
 # SPDX-License-Identifier: Apache-2.0
 
 from typing import (
-    Iterable, Iterator, Union,
+    Iterable, Iterator, Optional, Set, Union,
 )
 
 from amundsen_rds.models import RDSModel
@@ -44,6 +44,17 @@ class ColumnReader(object):
                f"user_email={self.user_email!r}, read_count={self.read_count!r})"
 
 
+class SerializedUsers(object):
+    """
+    Emails of the users already serialized by the TableColumnUsage of a run, so that each user is serialized once.
+    They are kept per output, as the same models can be serialized both as graph nodes and as RDS records.
+    """
+
+    def __init__(self) -> None:
+        self.node_emails: Set[str] = set()
+        self.record_emails: Set[str] = set()
+
+
 class TableColumnUsage(GraphSerializable, TableSerializable):
     """
     A model represents user <--> column graph model
@@ -58,12 +69,21 @@ class TableColumnUsage(GraphSerializable, TableSerializable):
     # Property key for relationship read, readby relationship
     READ_RELATION_COUNT = 'read_count'
 
-    def __init__(self, col_readers: Iterable[ColumnReader]) -> None:
+    def __init__(self,
+                 col_readers: Iterable[ColumnReader],
+                 serialized_users: Optional[SerializedUsers] = None
+                 ) -> None:
+        """
+        :param col_readers:
+        :param serialized_users: Users already serialized by the other TableColumnUsage of the run, shared between
+        them so that each user is serialized once. The users serialized by this one are added to it.
+        """
         for col_reader in col_readers:
             if col_reader.column != '*':
                 raise NotImplementedError(f'Column is not supported yet {col_readers}')
 
         self.col_readers = col_readers
+        self._serialized_users = serialized_users
         self._node_iterator = self._create_node_iterator()
         self._rel_iter = self._create_rel_iterator()
         self._record_iter = self._create_record_iterator()
@@ -74,9 +94,21 @@ class TableColumnUsage(GraphSerializable, TableSerializable):
         except StopIteration:
             return None
 
+    @staticmethod
+    def _is_user_serialized(email: str, serialized_emails: Optional[Set[str]]) -> bool:
+        if serialized_emails is None:
+            return False
+
+        if email in serialized_emails:
+            return True
+
+        serialized_emails.add(email)
+        return False
+
     def _create_node_iterator(self) -> Iterator[GraphNode]:
+        serialized_emails = self._serialized_users.node_emails if self._serialized_users else None
         for col_reader in self.col_readers:
-            if col_reader.column == '*':
+            if col_reader.column == '*' and not self._is_user_serialized(col_reader.user_email, serialized_emails):
                 # using yield for better memory efficiency
                 user_node = User(email=col_reader.user_email).get_user_node()
                 yield user_node
@@ -109,8 +141,9 @@ class TableColumnUsage(GraphSerializable, TableSerializable):
             return None
 
     def _create_record_iterator(self) -> Iterator[RDSModel]:
+        serialized_emails = self._serialized_users.record_emails if self._serialized_users else None
         for col_reader in self.col_readers:
-            if col_reader.column == '*':
+            if col_reader.column == '*' and not self._is_user_serialized(col_reader.user_email, serialized_emails):
                 user_record = User(email=col_reader.user_email).get_user_record()
                 yield user_record
 
@@ -2,7 +2,7 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import abc
-from typing import List
+from typing import List, Optional
 
 from pyhocon import ConfigTree
 
@@ -49,6 +49,13 @@ class Publisher(Scoped):
         """
         pass
 
+    def get_published_count(self) -> Optional[int]:
+        """
+        Number of records (or statements) published so far, used for job instrumentation.
+        :return: None if the publisher doesn't count them
+        """
+        return None
+
     def register_call_back(self, callback: Callback) -> None:
         """
         Register any callback method that needs to be notified when publisher is either able to successfully publish
@@ -62,6 +69,35 @@ class Publisher(Scoped):
         return 'publisher'
 
 
+class StreamingPublisher(Publisher):
+    """
+    A Publisher that publishes records while the task is still running, instead of publishing what the loader has
+    staged after the task completes. A loader hands records over to it directly (e.g: through a bounded queue), so
+    extraction and publishing overlap.
+
+    DefaultJob runs publish() of a StreamingPublisher in a background thread while running the task. Once the task
+    completes, it calls finish() to signal that no more records will be handed over and waits for publish() to
+    return. If the task fails, it calls abort() instead.
+    """
+
+    @abc.abstractmethod
+    def finish(self) -> None:
+        """
+        Signals that no more records will be handed over. publish() is expected to return after publishing the records
+        received so far.
+        :return: None
+        """
+        pass
+
+    @abc.abstractmethod
+    def abort(self) -> None:
+        """
+        Signals that the task has failed. publish() is expected to stop, and not to commit anything pending.
+        :return: None
+        """
+        pass
+
+
 class NoopPublisher(Publisher):
     def __init__(self) -> None:
         super(NoopPublisher, self).__init__()
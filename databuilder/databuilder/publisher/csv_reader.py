@@ -0,0 +1,81 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+from typing import (
+    Any, Dict, Iterator, Optional,
+)
+
+import pandas
+from pandas.api.types import pandas_dtype
+
+# Number of CSV rows parsed into memory at a time
+DEFAULT_CHUNK_SIZE = 10000
+
+
+def _merge_dtypes(dtypes: Optional[Dict[str, Any]], chunk_dtypes: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Merges the column types inferred for a chunk with the ones of the previous chunks. A column whose chunks were
+    inferred as int and float is float, and a column whose chunks were inferred with any other different types is str,
+    like when the whole column is parsed at once.
+    """
+    if dtypes is None:
+        return dict(chunk_dtypes)
+
+    for column, chunk_dtype in chunk_dtypes.items():
+        dtype = dtypes.get(column, chunk_dtype)
+        if dtype == chunk_dtype:
+            continue
+
+        if dtype is not str and dtype.kind in 'if' and chunk_dtype.kind in 'if':
+            dtypes[column] = pandas_dtype('float64')
+        else:
+            dtypes[column] = str
+    return dtypes
+
+
+def read_csv_records(file_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Dict[str, Any]]:
+    """
+    Streams the rows of a CSV file as dicts keyed by the header, parsing at most chunk_size rows into memory at a time.
+    Values are converted the same way as pandas.read_csv(na_filter=False), which publishers used to load the whole file.
+    As pandas infers the type of each column per chunk, a file of more than one chunk is parsed twice: first to infer
+    the type of each column over all chunks, then to convert every chunk with these types. Reading such a file costs
+    twice the I/O and parsing time of a single pass, which is the price of bounded memory with the types of a whole
+    file parse. A file of a single chunk is parsed once.
+
+    :param file_path:
+    :param chunk_size: Number of rows parsed at a time
+    :return: Iterator of CSV rows
+    """
+    dtypes: Optional[Dict[str, Any]] = None
+    chunk_count = 0
+    first_chunk: Optional[pandas.DataFrame] = None
+    with open(file_path, 'r', encoding='utf8') as csv_file:
+        for chunk in pandas.read_csv(csv_file, na_filter=False, chunksize=chunk_size):
+            chunk_count += 1
+            first_chunk = chunk if chunk_count == 1 else None
+            dtypes = _merge_dtypes(dtypes, chunk.dtypes.to_dict())
+
+    if first_chunk is not None:
+        # the file is a single chunk, whose types are the ones of the whole file
+        yield from first_chunk.to_dict(orient='records')
+        return
+
+    if chunk_count == 0:
+        return
+
+    with open(file_path, 'r', encoding='utf8') as csv_file:
+        for chunk in pandas.read_csv(csv_file, na_filter=False, chunksize=chunk_size, dtype=dtypes):
+            yield from chunk.to_dict(orient='records')
+
+
+def read_first_csv_record(file_path: str) -> Optional[Dict[str, Any]]:
+    """
+    Reads only the first row of a CSV file. Useful when the file holds homogeneous rows, such as node and relation
+    files written by FsNeo4jCSVLoader, where every row shares the same label(s).
+
+    :param file_path:
+    :return: The first row, or None if the file has no row
+    """
+    with open(file_path, 'r', encoding='utf8') as csv_file:
+        records = pandas.read_csv(csv_file, na_filter=False, nrows=1).to_dict(orient='records')
+    return records[0] if records else None
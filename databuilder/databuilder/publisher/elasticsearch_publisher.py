@@ -1,15 +1,24 @@
 # Copyright Contributors to the Amundsen project.
 # SPDX-License-Identifier: Apache-2.0
 
+import concurrent.futures
+import hashlib
+import itertools
 import json
 import logging
-from typing import List
+import time
+from collections import deque
+from typing import (
+    Any, Deque, Dict, Iterable, Iterator, List, Optional, Tuple, Union,
+)
 
 from elasticsearch.exceptions import NotFoundError
+from elasticsearch.helpers import scan
 from pyhocon import ConfigTree
 
 from databuilder.publisher.base_publisher import Publisher
 from databuilder.publisher.elasticsearch_constants import TABLE_ELASTICSEARCH_INDEX_MAPPING
+from databuilder.utils.file_utils import open_text_file
 
 LOGGER = logging.getLogger(__name__)
 
@@ -22,6 +31,12 @@ class ElasticsearchPublisher(Publisher):
     and traffic is routed to new index.
 
     Old index is deleted after the alias swap is complete
+
+    The JSON file is read as gzip compressed if its path ends with .gz, see FSElasticsearchJSONLoader.
+
+    In incremental mode, documents are compared against the index behind the alias instead, by document key and
+    content hash, and only the new, changed and removed documents are indexed or deleted. The index is rebuilt as
+    above if the mapping has changed since it was created, or if it was not created in incremental mode.
     """
     FILE_PATH_CONFIG_KEY = 'file_path'
     FILE_MODE_CONFIG_KEY = 'mode'
@@ -34,6 +49,24 @@ class ElasticsearchPublisher(Publisher):
 
     # config to control how many max documents to publish at a time
     ELASTICSEARCH_PUBLISHER_BATCH_SIZE = 'batch_size'
+    # config for the max size in bytes of a bulk request
+    ELASTICSEARCH_PUBLISHER_BATCH_BYTES = 'batch_bytes'
+    # config for the number of bulk requests sent concurrently
+    ELASTICSEARCH_PUBLISHER_BULK_CONCURRENCY = 'bulk_concurrency'
+    # config for the number of times the documents rejected with 429 Too Many Requests are retried, and the seconds
+    # to wait before the first retry, doubled on every retry
+    ELASTICSEARCH_PUBLISHER_BULK_MAX_RETRIES = 'bulk_max_retries'
+    ELASTICSEARCH_PUBLISHER_BULK_INITIAL_BACKOFF = 'bulk_initial_backoff'
+    # config to disable the refresh and the replicas of the new index until it's fully loaded
+    ELASTICSEARCH_DISABLE_REFRESH_DURING_LOAD = 'disable_refresh_during_load'
+
+    # config to only publish the documents that changed since the last publish, instead of rebuilding the index
+    ELASTICSEARCH_INCREMENTAL_CONFIG_KEY = 'incremental'
+    # config for the document field used as the document id in incremental mode, e.g. 'uri' for dashboards
+    ELASTICSEARCH_DOCUMENT_KEY_CONFIG_KEY = 'document_key'
+
+    # key in the _meta of the mapping holding the hash of the mapping an index was created with
+    MAPPING_HASH_META_KEY = 'databuilder_mapping_hash'
 
     DEFAULT_ELASTICSEARCH_INDEX_MAPPING = TABLE_ELASTICSEARCH_INDEX_MAPPING
 
@@ -55,7 +88,18 @@ class ElasticsearchPublisher(Publisher):
                                                    ElasticsearchPublisher.DEFAULT_ELASTICSEARCH_INDEX_MAPPING)
         self.elasticsearch_batch_size = self.conf.get(ElasticsearchPublisher.ELASTICSEARCH_PUBLISHER_BATCH_SIZE,
                                                       10000)
-        self.file_handler = open(self.file_path, self.file_mode)
+        self.elasticsearch_batch_bytes = self.conf.get_int(ElasticsearchPublisher.ELASTICSEARCH_PUBLISHER_BATCH_BYTES,
+                                                           10 * 1024 * 1024)
+        self.bulk_concurrency = self.conf.get_int(ElasticsearchPublisher.ELASTICSEARCH_PUBLISHER_BULK_CONCURRENCY, 1)
+        self.bulk_max_retries = self.conf.get_int(ElasticsearchPublisher.ELASTICSEARCH_PUBLISHER_BULK_MAX_RETRIES, 3)
+        self.bulk_initial_backoff = self.conf.get_float(
+            ElasticsearchPublisher.ELASTICSEARCH_PUBLISHER_BULK_INITIAL_BACKOFF, 2)
+        self.disable_refresh_during_load = self.conf.get_bool(
+            ElasticsearchPublisher.ELASTICSEARCH_DISABLE_REFRESH_DURING_LOAD, True)
+        self.elasticsearch_incremental = self.conf.get_bool(
+            ElasticsearchPublisher.ELASTICSEARCH_INCREMENTAL_CONFIG_KEY, False)
+        self.document_key = self.conf.get_string(ElasticsearchPublisher.ELASTICSEARCH_DOCUMENT_KEY_CONFIG_KEY, 'key')
+        self.file_handler = open_text_file(self.file_path, self.file_mode)
 
     def _fetch_old_index(self) -> List[str]:
         """
@@ -76,36 +120,39 @@ class ElasticsearchPublisher(Publisher):
         Use Elasticsearch Bulk API to load data from file to a {new_index}.
         After upload, swap alias from {old_index} to {new_index} in a atomic operation
         to route traffic to {new_index}
+        In incremental mode, only publish the changes to {old_index} if it can be updated incrementally
         """
-        actions = [json.loads(l) for l in self.file_handler.readlines()]
+        documents = self._read_documents()
         # ensure new data exists
-        if not actions:
+        first_document = next(documents, None)
+        if first_document is None:
             LOGGER.warning("received no data to upload to Elasticsearch!")
             return
+        documents = itertools.chain([first_document], documents)
+
+        if self.elasticsearch_incremental:
+            live_index = self._get_incremental_index()
+            if live_index:
+                self._publish_incremental(live_index, documents)
+                return
 
         # Convert object to json for elasticsearch bulk upload
         # Bulk load JSON format is defined here:
         # https://www.elastic.co/guide/en/elasticsearch/reference/6.2/docs-bulk.html
-        bulk_actions = []
-        cnt = 0
+        mapping = self._get_mapping_with_hash() if self.elasticsearch_incremental else self.elasticsearch_mapping
 
         # create new index with mapping
-        self.elasticsearch_client.indices.create(index=self.elasticsearch_new_index, body=self.elasticsearch_mapping)
-        for action in actions:
-            index_row = dict(index=dict(_index=self.elasticsearch_new_index,
-                                        _type=self.elasticsearch_type))
-            bulk_actions.append(index_row)
-            bulk_actions.append(action)
-            cnt += 1
-            if cnt == self.elasticsearch_batch_size:
-                self.elasticsearch_client.bulk(bulk_actions)
-                LOGGER.info('Publish %i of records to ES', cnt)
-                cnt = 0
-                bulk_actions = []
-
-        # Do the final bulk actions
-        if bulk_actions:
-            self.elasticsearch_client.bulk(bulk_actions)
+        self.elasticsearch_client.indices.create(index=self.elasticsearch_new_index, body=mapping)
+        try:
+            if self.disable_refresh_during_load:
+                index_settings = self._disable_refresh(self.elasticsearch_new_index)
+            self._bulk(([self._index_action(self.elasticsearch_new_index, document), document], size)
+                       for document, size in documents)
+            if self.disable_refresh_during_load:
+                self._restore_refresh(self.elasticsearch_new_index, index_settings)
+        except Exception:
+            self._delete_new_index()
+            raise
 
         # fetch indices that have {elasticsearch_alias} as alias
         elasticsearch_old_indices = self._fetch_old_index()
@@ -122,5 +169,209 @@ class ElasticsearchPublisher(Publisher):
         # perform alias update and index delete in single atomic operation
         self.elasticsearch_client.indices.update_aliases(update_action)
 
+    def _delete_new_index(self) -> None:
+        """
+        Delete the partially loaded new index, so that failed publishes don't leave indices behind
+        """
+        try:
+            self.elasticsearch_client.indices.delete(index=self.elasticsearch_new_index)
+        except Exception:
+            LOGGER.exception('Failed to delete the new index %s', self.elasticsearch_new_index)
+
+    def _index_action(self, index: str, document: Dict[str, Any]) -> Dict[str, Any]:
+        index_row = dict(index=dict(_index=index,
+                                    _type=self.elasticsearch_type))
+        if self.elasticsearch_incremental:
+            # Documents are addressed by their key, so that later publishes can replace or delete them
+            index_row['index']['_id'] = document[self.document_key]
+        return index_row
+
+    def _read_documents(self) -> Iterator[Tuple[Dict[str, Any], int]]:
+        """
+        Read the documents from the file one line at a time
+        :return: each document, with its size in the file
+        """
+        for line in iter(self.file_handler.readline, ''):
+            if line.strip():
+                yield json.loads(line), len(line)
+
+    def _disable_refresh(self, index: str) -> Dict[str, Any]:
+        """
+        Disable the refresh and the replicas of the index, which are not needed until it's fully loaded
+        :return: the settings to restore
+        """
+        settings = self.elasticsearch_client.indices.get_settings(index=index)[index]['settings']['index']
+        self.elasticsearch_client.indices.put_settings(
+            index=index, body={'index': {'refresh_interval': '-1', 'number_of_replicas': 0}})
+        # a missing refresh_interval is restored to the default with None
+        return {'refresh_interval': settings.get('refresh_interval'),
+                'number_of_replicas': settings.get('number_of_replicas')}
+
+    def _restore_refresh(self, index: str, settings: Dict[str, Any]) -> None:
+        self.elasticsearch_client.indices.put_settings(index=index, body={'index': settings})
+        self.elasticsearch_client.indices.refresh(index=index)
+
+    def _bulk(self, bulk_actions: Iterable[Tuple[List[Dict[str, Any]], int]]) -> None:
+        """
+        Send bulk actions to Elasticsearch, {batch_size} actions and {batch_bytes} bytes at a time, with up to
+        {bulk_concurrency} concurrent requests
+        :param bulk_actions: each item is a bulk action, followed by its document if it has one, and its size in bytes
+        """
+        start_time = time.monotonic()
+        action_cnt = 0
+        byte_cnt = 0
+        failed_cnt = 0
+        # bound the batches in memory, in case Elasticsearch is slower than reading the file
+        pending: Deque[concurrent.futures.Future] = deque()
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.bulk_concurrency) as executor:
+            for batch, batch_bytes in self._batches(bulk_actions):
+                pending.append(executor.submit(self._send_batch, batch))
+                action_cnt += len(batch)
+                byte_cnt += batch_bytes
+                while len(pending) > self.bulk_concurrency:
+                    failed_cnt += pending.popleft().result()
+            while pending:
+                failed_cnt += pending.popleft().result()
+
+        duration = max(time.monotonic() - start_time, 0.001)
+        LOGGER.info('Published %i actions (%.1f MB) to ES in %.1f seconds: %.0f actions/s, %.1f MB/s',
+                    action_cnt, byte_cnt / 1e6, duration, action_cnt / duration, byte_cnt / 1e6 / duration)
+        if failed_cnt:
+            raise Exception(f'Failed to publish {failed_cnt} of {action_cnt} actions to ES')
+
+    def _batches(self, bulk_actions: Iterable[Tuple[List[Dict[str, Any]], int]]
+                 ) -> Iterator[Tuple[List[List[Dict[str, Any]]], int]]:
+        """
+        Group the bulk actions into batches of {batch_size} actions and {batch_bytes} bytes
+        :return: each batch, with its size in bytes
+        """
+        batch: List[List[Dict[str, Any]]] = []
+        batch_bytes = 0
+        for bulk_action, size in bulk_actions:
+            # the size of the action line, in addition to the size of the document
+            size += len(json.dumps(bulk_action[0])) + 1
+            if batch and batch_bytes + size > self.elasticsearch_batch_bytes:
+                yield batch, batch_bytes
+                batch = []
+                batch_bytes = 0
+
+            batch.append(bulk_action)
+            batch_bytes += size
+            if len(batch) == self.elasticsearch_batch_size:
+                yield batch, batch_bytes
+                batch = []
+                batch_bytes = 0
+
+        # Do the final bulk actions
+        if batch:
+            yield batch, batch_bytes
+
+    def _send_batch(self, batch: List[List[Dict[str, Any]]]) -> int:
+        """
+        Send a bulk request, and retry the actions rejected with 429 Too Many Requests with exponential backoff
+        :param batch: each item is a bulk action, followed by its document if it has one
+        :return: number of actions that failed
+        """
+        attempt = 0
+        while True:
+            response = self.elasticsearch_client.bulk([row for bulk_action in batch for row in bulk_action])
+            if not response.get('errors'):
+                LOGGER.info('Publish %i of records to ES', len(batch))
+                return 0
+
+            rejected = []
+            failed_cnt = 0
+            for bulk_action, item in zip(batch, response['items']):
+                op_type, result = next(iter(item.items()))
+                status = result.get('status', 200)
+                if status == 429:
+                    rejected.append(bulk_action)
+                elif status >= 300 and not (op_type == 'delete' and status == 404):
+                    if not failed_cnt:
+                        LOGGER.error('Failed to %s document in ES: %s', op_type, result.get('error'))
+                    failed_cnt += 1
+
+            if not rejected or attempt >= self.bulk_max_retries:
+                LOGGER.info('Publish %i of records to ES', len(batch) - failed_cnt - len(rejected))
+                return failed_cnt + len(rejected)
+
+            backoff = self.bulk_initial_backoff * 2 ** attempt
+            LOGGER.warning('%i actions rejected by ES, retrying in %.1f seconds', len(rejected), backoff)
+            time.sleep(backoff)
+            batch = rejected
+            attempt += 1
+
+    def _get_mapping_hash(self) -> str:
+        mapping = self.elasticsearch_mapping
+        if isinstance(mapping, str):
+            mapping = json.loads(mapping)
+        return self._get_content_hash(mapping)
+
+    def _get_mapping_with_hash(self) -> Dict[str, Any]:
+        """
+        Add the hash of the mapping into the _meta of the mapping, so that a later incremental publish can tell
+        whether the mapping has changed since the index was created
+        """
+        mapping_hash = self._get_mapping_hash()
+        mapping = self.elasticsearch_mapping
+        mapping = json.loads(mapping) if isinstance(mapping, str) else dict(mapping)
+        for type_mapping in mapping.get('mappings', {}).values():
+            type_mapping.setdefault('_meta', {})[ElasticsearchPublisher.MAPPING_HASH_META_KEY] = mapping_hash
+        return mapping
+
+    def _get_content_hash(self, document: Union[Dict[str, Any], List[Any]]) -> str:
+        return hashlib.md5(json.dumps(document, sort_keys=True).encode('utf-8')).hexdigest()
+
+    def _get_incremental_index(self) -> Optional[str]:
+        """
+        Find the index behind {elasticsearch_alias} that can be updated incrementally
+        :return: name of the index, or None if the index needs to be rebuilt
+        """
+        indices = list(self._fetch_old_index())
+        if len(indices) != 1:
+            LOGGER.info('Rebuilding the index, as alias %s points to %i indices',
+                        self.elasticsearch_alias, len(indices))
+            return None
+
+        index = indices[0]
+        mappings = self.elasticsearch_client.indices.get_mapping(index=index, doc_type=self.elasticsearch_type)
+        meta = mappings.get(index, {}).get('mappings', {}).get(self.elasticsearch_type, {}).get('_meta', {})
+        if meta.get(ElasticsearchPublisher.MAPPING_HASH_META_KEY) != self._get_mapping_hash():
+            LOGGER.info('Rebuilding the index, as the mapping of index %s has changed', index)
+            return None
+
+        return index
+
+    def _publish_incremental(self, index: str, documents: Iterable[Tuple[Dict[str, Any], int]]) -> None:
+        """
+        Index the documents that are new or changed compared to {index}, and delete the documents missing from the
+        new documents
+        """
+        live_hashes = {hit['_id']: self._get_content_hash(hit['_source'])
+                       for hit in scan(self.elasticsearch_client, index=index, doc_type=self.elasticsearch_type,
+                                       query={'query': {'match_all': {}}})}
+        LOGGER.info('Fetched %i documents from index %s', len(live_hashes), index)
+
+        counts = {'changed': 0, 'unchanged': 0}
+
+        def changed_actions() -> Iterator[Tuple[List[Dict[str, Any]], int]]:
+            for document, size in documents:
+                live_hash = live_hashes.pop(document[self.document_key], None)
+                if live_hash == self._get_content_hash(document):
+                    counts['unchanged'] += 1
+                else:
+                    counts['changed'] += 1
+                    yield [self._index_action(index, document), document], size
+
+        def delete_actions() -> Iterator[Tuple[List[Dict[str, Any]], int]]:
+            # the documents left in live_hashes once all the documents have been read were removed
+            for doc_id in list(live_hashes):
+                yield [dict(delete=dict(_index=index, _type=self.elasticsearch_type, _id=doc_id))], 0
+
+        self._bulk(itertools.chain(changed_actions(), delete_actions()))
+        LOGGER.info('Indexed %i new or changed documents, deleted %i and left %i unchanged in index %s',
+                    counts['changed'], len(live_hashes), counts['unchanged'], index)
+
     def get_scope(self) -> str:
         return 'publisher.elasticsearch'
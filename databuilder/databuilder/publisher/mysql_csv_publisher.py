@@ -11,7 +11,6 @@ from typing import (
     Dict, List, Optional, Type,
 )
 
-import pandas
 from amundsen_rds.models import RDSModel
 from amundsen_rds.models.base import Base
 from pyhocon import ConfigFactory, ConfigTree
@@ -19,6 +18,7 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import Session, sessionmaker
 
 from databuilder.publisher.base_publisher import Publisher
+from databuilder.publisher.csv_reader import read_csv_records
 
 LOGGER = logging.getLogger(__name__)
 
@@ -148,17 +148,16 @@ class MySQLCSVPublisher(Publisher):
         :param session:
         :return:
         """
-        with open(record_file, 'r', encoding='utf8') as record_csv:
-            table_name = self._get_table_name_from_file(record_file)
-            table_model = self._get_model_from_table_name(table_name)
-            if not table_model:
-                raise RuntimeError(f'Failed to get model for table: {table_name}')
+        table_name = self._get_table_name_from_file(record_file)
+        table_model = self._get_model_from_table_name(table_name)
+        if not table_model:
+            raise RuntimeError(f'Failed to get model for table: {table_name}')
 
-            for record_dict in pandas.read_csv(record_csv, na_filter=False).to_dict(orient='records'):
-                record = self._create_record(model=table_model, record_dict=record_dict)
-                session.merge(record)
-                self._execute(session)
-            session.commit()
+        for record_dict in read_csv_records(record_file):
+            record = self._create_record(model=table_model, record_dict=record_dict)
+            session.merge(record)
+            self._execute(session)
+        session.commit()
 
     def _get_model_from_table_name(self, table_name: str) -> Optional[Type[RDSModel]]:
         """
@@ -203,5 +202,8 @@ class MySQLCSVPublisher(Publisher):
             LOGGER.exception('Failed to commit changes')
             raise e
 
+    def get_published_count(self) -> Optional[int]:
+        return self._count
+
     def get_scope(self) -> str:
         return 'publisher.mysql'
@@ -1,23 +1,27 @@
 # Copyright Contributors to the Amundsen project.
 # SPDX-License-Identifier: Apache-2.0
 
+import concurrent.futures
+import copy
 import csv
 import ctypes
 import logging
+import threading
 import time
-from io import open
 from os import listdir
 from os.path import isfile, join
-from typing import List, Set
+from typing import (
+    Callable, Dict, Iterable, List, Optional, Set, Tuple,
+)
 
 import neo4j
-import pandas
 from jinja2 import Template
 from neo4j import GraphDatabase, Transaction
 from neo4j.exceptions import CypherError, TransientError
 from pyhocon import ConfigFactory, ConfigTree
 
 from databuilder.publisher.base_publisher import Publisher
+from databuilder.publisher.csv_reader import read_csv_records, read_first_csv_record
 from databuilder.publisher.neo4j_preprocessor import NoopRelationPreprocessor
 
 # Setting field_size_limit to solve the error below
@@ -47,6 +51,19 @@ NEO4J_CREATE_ONLY_NODES = 'neo4j_create_only_nodes'
 # list of node labels that could attempt to be accessed simultaneously
 NEO4J_DEADLOCK_NODE_LABELS = 'neo4j_deadlock_node_labels'
 
+# Number of CSV rows sent in one UNWIND statement. When it's 0 (default), one MERGE statement is sent per CSV row.
+# Note that NEO4J_TRANSACTION_SIZE counts statements, so each commit carries up to
+# NEO4J_UNWIND_BATCH_SIZE * NEO4J_TRANSACTION_SIZE rows when batching is enabled.
+NEO4J_UNWIND_BATCH_SIZE = 'neo4j_unwind_batch_size'
+
+# Number of worker sessions used to publish files in parallel. When it's more than 1, node files are published in
+# parallel and then relation files are published in parallel. Files are partitioned by the labels they contain so that
+# files of the same labels are published sequentially by the same worker, and all the files that contain a label
+# in NEO4J_DEADLOCK_NODE_LABELS are published sequentially by a single worker.
+# Each worker commits its own transaction. Once any worker fails, the rest of the workers stop at the next file
+# and roll back their uncommitted transaction. (Statements already committed per NEO4J_TRANSACTION_SIZE stay.)
+NEO4J_PUBLISH_WORKERS = 'neo4j_publish_workers'
+
 NEO4J_USER = 'neo4j_user'
 NEO4J_PASSWORD = 'neo4j_password'
 NEO4J_ENCRYPTED = 'neo4j_encrypted'
@@ -99,6 +116,8 @@ DEFAULT_CONFIG = ConfigFactory.from_dict({NEO4J_TRANSACTION_SIZE: 500,
                                           NEO4J_MAX_CONN_LIFE_TIME_SEC: 50,
                                           NEO4J_ENCRYPTED: True,
                                           NEO4J_VALIDATE_SSL: False,
+                                          NEO4J_UNWIND_BATCH_SIZE: 0,
+                                          NEO4J_PUBLISH_WORKERS: 1,
                                           RELATION_PREPROCESSOR: NoopRelationPreprocessor()})
 
 # transient error retries and sleep time
@@ -116,7 +135,8 @@ class Neo4jCsvPublisher(Publisher):
     Neo4j follows Label Node properties Graph and more information about this is in:
     https://neo4j.com/docs/developer-manual/current/introduction/graphdb-concepts/
 
-    #TODO User UNWIND batch operation for better performance
+    When NEO4J_UNWIND_BATCH_SIZE is set, rows that produce the same statement shape are grouped and sent as
+    a single parameterized UNWIND statement instead of one MERGE statement per row.
     """
 
     def __init__(self) -> None:
@@ -144,6 +164,8 @@ class Neo4jCsvPublisher(Publisher):
         self._transaction_size = conf.get_int(NEO4J_TRANSACTION_SIZE)
         self._session = self._driver.session()
         self._confirm_rel_created = conf.get_bool(NEO4J_RELATIONSHIP_CREATION_CONFIRM)
+        self._unwind_batch_size = conf.get_int(NEO4J_UNWIND_BATCH_SIZE)
+        self._publish_workers = conf.get_int(NEO4J_PUBLISH_WORKERS)
 
         # config is list of node label.
         # When set, this list specifies a list of nodes that shouldn't be updated, if exists
@@ -156,6 +178,10 @@ class Neo4jCsvPublisher(Publisher):
 
         self._relation_preprocessor = conf.get(RELATION_PREPROCESSOR)
 
+        # Rendered Cypher statements keyed by statement shape. All rows of a CSV file share the same header, so
+        # a statement is rendered once per shape instead of once per row.
+        self._statement_cache: Dict[Tuple, str] = {}
+
         LOGGER.info('Publishing Node csv files %s, and Relation CSV files %s', self._node_files, self._relation_files)
 
     def _list_files(self, conf: ConfigTree, path_key: str) -> List[str]:
@@ -183,6 +209,11 @@ class Neo4jCsvPublisher(Publisher):
         for node_file in self._node_files:
             self._create_indices(node_file=node_file)
 
+        if self._publish_workers > 1:
+            self._publish_parallel()
+            LOGGER.info('Successfully published. Elapsed: %i seconds', time.time() - start)
+            return
+
         LOGGER.info('Publishing Node files: %s', self._node_files)
         try:
             tx = self._session.begin_transaction()
@@ -212,23 +243,130 @@ class Neo4jCsvPublisher(Publisher):
                 tx.rollback()
             raise e
 
+    def _publish_parallel(self) -> None:
+        """
+        Publishes node files in parallel and then relation files in parallel, using NEO4J_PUBLISH_WORKERS sessions.
+        :return:
+        """
+        abort_event = threading.Event()
+
+        node_partitions = self._partition_files(self._node_files, [NODE_LABEL_KEY])
+        LOGGER.info('Publishing Node files with %i workers: %s', self._publish_workers, node_partitions)
+        self._publish_partitions(node_partitions, '_publish_node', abort_event)
+
+        relation_partitions = self._partition_files(self._relation_files, [RELATION_START_LABEL, RELATION_END_LABEL])
+        LOGGER.info('Publishing Relationship files with %i workers: %s', self._publish_workers, relation_partitions)
+        self._publish_partitions(relation_partitions, '_publish_relation', abort_event)
+
+        LOGGER.info('Committed total %i statements', self._count)
+
+    def _partition_files(self, files: List[str], label_columns: List[str]) -> List[List[str]]:
+        """
+        Groups files by the set of labels they contain. Files that contain any of NEO4J_DEADLOCK_NODE_LABELS are grouped
+        into a single partition so that they are never published concurrently.
+        :param files:
+        :param label_columns: CSV columns that hold the labels (e.g: LABEL, or START_LABEL and END_LABEL)
+        :return: List of partitions where each partition is a list of files to be published sequentially
+        """
+        partitions: Dict[Optional[Tuple[str, ...]], List[str]] = {}
+        for file in files:
+            labels = self._get_labels(file, label_columns)
+            partition_key = None if labels & self.deadlock_node_labels else tuple(sorted(labels))
+            partitions.setdefault(partition_key, []).append(file)
+
+        return list(partitions.values())
+
+    def _get_labels(self, file: str, label_columns: List[str]) -> Set[str]:
+        """
+        Gets labels of the file from its first row, as every row of a file written by FsNeo4jCSVLoader shares the
+        same label(s).
+        :param file:
+        :param label_columns:
+        :return:
+        """
+        record = read_first_csv_record(file)
+        if not record:
+            return set()
+        return {record[label_column] for label_column in label_columns}
+
+    def _publish_partitions(self,
+                            partitions: List[List[str]],
+                            publish_method: str,
+                            abort_event: threading.Event) -> None:
+        """
+        Publishes partitions concurrently and waits for all of them. Raises the first failure after every worker has
+        stopped.
+        :param partitions:
+        :param publish_method: Name of the method that publishes a single file. e.g: _publish_node
+        :param abort_event: Event shared with all workers that is set when any worker fails
+        :return:
+        """
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self._publish_workers) as executor:
+            futures = [executor.submit(self._publish_partition, partition, publish_method, abort_event)
+                       for partition in partitions]
+            concurrent.futures.wait(futures)
+
+        for future in futures:
+            if future.exception():
+                raise future.exception()  # type: ignore
+            self._count += future.result()
+
+    def _publish_partition(self, files: List[str], publish_method: str, abort_event: threading.Event) -> int:
+        """
+        Publishes files sequentially with a dedicated session and transaction.
+        :param files:
+        :param publish_method:
+        :param abort_event:
+        :return: Number of statements executed by this worker
+        """
+        # A shallow copy shares the driver and configuration while having its own session and statement count.
+        worker = copy.copy(self)
+        worker._count = 0
+        worker._session = self._driver.session()
+        tx = worker._session.begin_transaction()
+        try:
+            for file in files:
+                if abort_event.is_set():
+                    break
+                tx = getattr(worker, publish_method)(file, tx=tx)
+
+            if abort_event.is_set():
+                LOGGER.warning('Aborting publish of %s as another worker failed. Rolling back.', files)
+                if not tx.closed():
+                    tx.rollback()
+                return worker._count
+
+            tx.commit()
+            LOGGER.info('Worker committed %i statements for %s', worker._count, files)
+            return worker._count
+        except Exception:
+            abort_event.set()
+            LOGGER.exception('Failed to publish %s. Rolling back.', files)
+            if not tx.closed():
+                tx.rollback()
+            raise
+        finally:
+            worker._session.close()
+
+    def get_published_count(self) -> Optional[int]:
+        return self._count
+
     def get_scope(self) -> str:
         return 'publisher.neo4j'
 
     def _create_indices(self, node_file: str) -> None:
         """
-        Go over the node file and try creating unique index
+        Try creating unique index for the label of the node file. The label is taken from the first row, as every
+        row of a node file written by FsNeo4jCSVLoader shares the same label.
         :param node_file:
         :return:
         """
         LOGGER.info('Creating indices. (Existing indices will be ignored)')
 
-        with open(node_file, 'r', encoding='utf8') as node_csv:
-            for node_record in pandas.read_csv(node_csv, na_filter=False).to_dict(orient='records'):
-                label = node_record[NODE_LABEL_KEY]
-                if label not in self.labels:
-                    self._try_create_index(label)
-                    self.labels.add(label)
+        for label in self._get_labels(node_file, [NODE_LABEL_KEY]):
+            if label not in self.labels:
+                self._try_create_index(label)
+                self.labels.add(label)
 
         LOGGER.info('Indices have been created.')
 
@@ -249,14 +387,57 @@ class Neo4jCsvPublisher(Publisher):
         :param node_file:
         :return:
         """
+        if self._unwind_batch_size > 0:
+            return self._publish_node_batch(node_file, tx=tx)
 
-        with open(node_file, 'r', encoding='utf8') as node_csv:
-            for node_record in pandas.read_csv(node_csv, na_filter=False).to_dict(orient="records"):
-                stmt = self.create_node_merge_statement(node_record=node_record)
-                params = self._create_props_param(node_record)
-                tx = self._execute_statement(stmt, tx, params)
+        for node_record in read_csv_records(node_file):
+            stmt = self.create_node_merge_statement(node_record=node_record)
+            params = self._create_props_param(node_record)
+            tx = self._execute_statement(stmt, tx, params)
+        return tx
+
+    def _publish_node_batch(self, node_file: str, tx: Transaction) -> Transaction:
+        """
+        Same as _publish_node, but rows sharing the same label and header are sent in batches of
+        NEO4J_UNWIND_BATCH_SIZE rows using a single UNWIND statement.
+        Example of Cypher query executed by this method:
+        UNWIND $batch AS row
+        MERGE (node:Column {key: row.KEY})
+        ON CREATE SET node.name = row.name, node.order_pos = row.order_pos, node.type = row.type
+        ON MATCH SET node.name = row.name, node.order_pos = row.order_pos, node.type = row.type
+
+        :param node_file:
+        :param tx:
+        :return:
+        """
+        return self._publish_node_records(read_csv_records(node_file), tx=tx)
+
+    def _publish_node_records(self, node_records: Iterable[dict], tx: Transaction) -> Transaction:
+        """
+        Groups node records by label and header, and executes an UNWIND statement per NEO4J_UNWIND_BATCH_SIZE rows.
+        :param node_records:
+        :param tx:
+        :return:
+        """
+        batches: Dict[Tuple, List[dict]] = {}
+
+        for node_record in node_records:
+            batch_key = (node_record[NODE_LABEL_KEY], tuple(node_record.keys()))
+            batch = batches.setdefault(batch_key, [])
+            batch.append(node_record)
+            if len(batch) >= self._unwind_batch_size:
+                tx = self._execute_node_batch(batch, tx)
+                del batches[batch_key]
+
+        for batch in batches.values():
+            tx = self._execute_node_batch(batch, tx)
         return tx
 
+    def _execute_node_batch(self, node_records: List[dict], tx: Transaction) -> Transaction:
+        stmt = self.create_node_merge_batch_statement(node_record=node_records[0])
+        params = {'batch': [self._create_props_param(node_record) for node_record in node_records]}
+        return self._execute_statement(stmt, tx, params)
+
     def is_create_only_node(self, node_record: dict) -> bool:
         """
         Check if node can be updated
@@ -274,6 +455,11 @@ class Neo4jCsvPublisher(Publisher):
         :param node_record:
         :return:
         """
+        cache_key = ('node', node_record[NODE_LABEL_KEY], tuple(node_record.keys()),
+                     self.is_create_only_node(node_record))
+        return self._get_or_create_statement(cache_key, lambda: self._render_node_merge_statement(node_record))
+
+    def _render_node_merge_statement(self, node_record: dict) -> str:
         template = Template("""
             MERGE (node:{{ LABEL }} {key: $KEY})
             ON CREATE SET {{ PROP_BODY }}
@@ -286,6 +472,31 @@ class Neo4jCsvPublisher(Publisher):
                                PROP_BODY=prop_body,
                                update=(not self.is_create_only_node(node_record)))
 
+    def create_node_merge_batch_statement(self, node_record: dict) -> str:
+        """
+        Creates node merge statement that UNWINDs a list of rows passed as $batch parameter.
+        All the rows in the batch must share the label and the header of the given node_record.
+        :param node_record: A representative row of the batch
+        :return:
+        """
+        cache_key = ('node_batch', node_record[NODE_LABEL_KEY], tuple(node_record.keys()),
+                     self.is_create_only_node(node_record))
+        return self._get_or_create_statement(cache_key, lambda: self._render_node_merge_batch_statement(node_record))
+
+    def _render_node_merge_batch_statement(self, node_record: dict) -> str:
+        template = Template("""
+            UNWIND $batch AS row
+            MERGE (node:{{ LABEL }} {key: row.KEY})
+            ON CREATE SET {{ PROP_BODY }}
+            {% if update %} ON MATCH SET {{ PROP_BODY }} {% endif %}
+        """)
+
+        prop_body = self._create_props_body(node_record, NODE_REQUIRED_KEYS, 'node', param_prefix='row.')
+
+        return template.render(LABEL=node_record["LABEL"],
+                               PROP_BODY=prop_body,
+                               update=(not self.is_create_only_node(node_record)))
+
     def _publish_relation(self, relation_file: str, tx: Transaction) -> Transaction:
         """
         Creates relation between two nodes.
@@ -305,50 +516,163 @@ class Neo4jCsvPublisher(Publisher):
             LOGGER.info('Pre-processing relation with %s', self._relation_preprocessor)
 
             count = 0
-            with open(relation_file, 'r', encoding='utf8') as relation_csv:
-                for rel_record in pandas.read_csv(relation_csv, na_filter=False).to_dict(orient="records"):
-                    # TODO not sure if deadlock on badge node arises in preporcessing or not
-                    stmt, params = self._relation_preprocessor.preprocess_cypher(
-                        start_label=rel_record[RELATION_START_LABEL],
-                        end_label=rel_record[RELATION_END_LABEL],
-                        start_key=rel_record[RELATION_START_KEY],
-                        end_key=rel_record[RELATION_END_KEY],
-                        relation=rel_record[RELATION_TYPE],
-                        reverse_relation=rel_record[RELATION_REVERSE_TYPE])
-
-                    if stmt:
-                        tx = self._execute_statement(stmt, tx=tx, params=params)
-                        count += 1
+            for rel_record in read_csv_records(relation_file):
+                # TODO not sure if deadlock on badge node arises in preporcessing or not
+                stmt, params = self._relation_preprocessor.preprocess_cypher(
+                    start_label=rel_record[RELATION_START_LABEL],
+                    end_label=rel_record[RELATION_END_LABEL],
+                    start_key=rel_record[RELATION_START_KEY],
+                    end_key=rel_record[RELATION_END_KEY],
+                    relation=rel_record[RELATION_TYPE],
+                    reverse_relation=rel_record[RELATION_REVERSE_TYPE])
+
+                if stmt:
+                    tx = self._execute_statement(stmt, tx=tx, params=params)
+                    count += 1
 
             LOGGER.info('Executed pre-processing Cypher statement %i times', count)
 
-        with open(relation_file, 'r', encoding='utf8') as relation_csv:
-            for rel_record in pandas.read_csv(relation_csv, na_filter=False).to_dict(orient="records"):
-                exception_exists = True
-                retries_for_exception = RETRIES_NUMBER
-                while exception_exists and retries_for_exception > 0:
-                    try:
-                        stmt = self.create_relationship_merge_statement(rel_record=rel_record)
-                        params = self._create_props_param(rel_record)
-                        tx = self._execute_statement(stmt, tx, params,
-                                                     expect_result=self._confirm_rel_created)
-                        exception_exists = False
-                    except TransientError as e:
-                        if rel_record[RELATION_START_LABEL] in self.deadlock_node_labels \
-                                or rel_record[RELATION_END_LABEL] in self.deadlock_node_labels:
-                            time.sleep(SLEEP_TIME)
-                            retries_for_exception -= 1
-                        else:
-                            raise e
+        if self._unwind_batch_size > 0:
+            return self._publish_relation_batch(relation_file, tx=tx)
+
+        for rel_record in read_csv_records(relation_file):
+            stmt = self.create_relationship_merge_statement(rel_record=rel_record)
+            params = self._create_props_param(rel_record)
+            tx = self._execute_relation_statement(stmt, tx, params, rel_record)
 
         return tx
 
+    def _publish_relation_batch(self, relation_file: str, tx: Transaction) -> Transaction:
+        """
+        Same as the MERGE part of _publish_relation, but rows sharing the same start label, end label, types and
+        header are sent in batches of NEO4J_UNWIND_BATCH_SIZE rows using a single UNWIND statement.
+        Example of Cypher query executed by this method:
+        UNWIND $batch AS row
+        MATCH (n1:Table {key: row.START_KEY}), (n2:Column {key: row.END_KEY})
+        MERGE (n1)-[r1:COLUMN]->(n2)-[r2:BELONG_TO_TABLE]->(n1)
+        RETURN count(*) AS relation_count
+
+        :param relation_file:
+        :param tx:
+        :return:
+        """
+        return self._publish_relation_records(read_csv_records(relation_file), tx=tx)
+
+    def _publish_relation_records(self, rel_records: Iterable[dict], tx: Transaction) -> Transaction:
+        """
+        Groups relation records by labels, types and header, and executes an UNWIND statement per
+        NEO4J_UNWIND_BATCH_SIZE rows.
+        :param rel_records:
+        :param tx:
+        :return:
+        """
+        batches: Dict[Tuple, List[dict]] = {}
+
+        for rel_record in rel_records:
+            batch_key = (rel_record[RELATION_START_LABEL], rel_record[RELATION_END_LABEL],
+                         rel_record[RELATION_TYPE], rel_record[RELATION_REVERSE_TYPE],
+                         tuple(rel_record.keys()))
+            batch = batches.setdefault(batch_key, [])
+            batch.append(rel_record)
+            if len(batch) >= self._unwind_batch_size:
+                tx = self._execute_relation_batch(batch, tx)
+                del batches[batch_key]
+
+        for batch in batches.values():
+            tx = self._execute_relation_batch(batch, tx)
+        return tx
+
+    def _execute_relation_batch(self, rel_records: List[dict], tx: Transaction) -> Transaction:
+        """
+        Executes UNWIND relationship statement for the batch, retrying on TransientError when one of the labels is
+        in NEO4J_DEADLOCK_NODE_LABELS. If NEO4J_RELATIONSHIP_CREATION_CONFIRM is set, it confirms that every row in
+        the batch has been matched.
+        :param rel_records:
+        :param tx:
+        :return:
+        """
+        stmt = self.create_relationship_merge_batch_statement(rel_record=rel_records[0])
+        params = {'batch': [self._create_props_param(record) for record in rel_records]}
+        return self._execute_relation_statement(stmt, tx, params, rel_records[0], expected_count=len(rel_records))
+
+    def _execute_relation_statement(self,
+                                    stmt: str,
+                                    tx: Transaction,
+                                    params: dict,
+                                    rel_record: dict,
+                                    expected_count: Optional[int] = None) -> Transaction:
+        """
+        Executes a relationship statement. When one of the labels is in NEO4J_DEADLOCK_NODE_LABELS, it retries on
+        TransientError up to RETRIES_NUMBER times. A failed statement rolls back its transaction, so the statements
+        executed so far are committed first, and each attempt runs in a new transaction.
+        :param stmt:
+        :param tx:
+        :param params:
+        :param rel_record: The record, or the first record of the batch, the statement was created from
+        :param expected_count: See _execute_statement
+        :return: The transaction to execute the next statements in
+        """
+        if rel_record[RELATION_START_LABEL] not in self.deadlock_node_labels \
+                and rel_record[RELATION_END_LABEL] not in self.deadlock_node_labels:
+            return self._execute_statement(stmt, tx, params, expect_result=self._confirm_rel_created,
+                                           expected_count=expected_count)
+
+        tx.commit()
+        for attempt in range(1, RETRIES_NUMBER + 1):
+            tx = self._session.begin_transaction()
+            try:
+                return self._execute_statement(stmt, tx, params, expect_result=self._confirm_rel_created,
+                                               expected_count=expected_count)
+            except TransientError:
+                if attempt == RETRIES_NUMBER:
+                    raise
+                LOGGER.warning('Transient error on attempt %i of %i, retrying', attempt, RETRIES_NUMBER)
+                time.sleep(SLEEP_TIME)
+        return tx
+
+    def create_relationship_merge_batch_statement(self, rel_record: dict) -> str:
+        """
+        Creates relationship merge statement that UNWINDs a list of rows passed as $batch parameter.
+        All the rows in the batch must share the labels, types and the header of the given rel_record.
+        :param rel_record: A representative row of the batch
+        :return:
+        """
+        return self._get_or_create_statement(self._relation_cache_key('relation_batch', rel_record),
+                                             lambda: self._render_relationship_merge_batch_statement(rel_record))
+
+    def _render_relationship_merge_batch_statement(self, rel_record: dict) -> str:
+        template = Template("""
+            UNWIND $batch AS row
+            MATCH (n1:{{ START_LABEL }} {key: row.START_KEY}), (n2:{{ END_LABEL }} {key: row.END_KEY})
+            MERGE (n1)-[r1:{{ TYPE }}]->(n2)-[r2:{{ REVERSE_TYPE }}]->(n1)
+            {% if update_prop_body %}
+            ON CREATE SET {{ prop_body }}
+            ON MATCH SET {{ prop_body }}
+            {% endif %}
+            RETURN count(*) AS relation_count
+        """)
+
+        prop_body_r1 = self._create_props_body(rel_record, RELATION_REQUIRED_KEYS, 'r1', param_prefix='row.')
+        prop_body_r2 = self._create_props_body(rel_record, RELATION_REQUIRED_KEYS, 'r2', param_prefix='row.')
+        prop_body = ' , '.join([prop_body_r1, prop_body_r2])
+
+        return template.render(START_LABEL=rel_record["START_LABEL"],
+                               END_LABEL=rel_record["END_LABEL"],
+                               TYPE=rel_record["TYPE"],
+                               REVERSE_TYPE=rel_record["REVERSE_TYPE"],
+                               update_prop_body=prop_body_r1,
+                               prop_body=prop_body)
+
     def create_relationship_merge_statement(self, rel_record: dict) -> str:
         """
         Creates relationship merge statement
         :param rel_record:
         :return:
         """
+        return self._get_or_create_statement(self._relation_cache_key('relation', rel_record),
+                                             lambda: self._render_relationship_merge_statement(rel_record))
+
+    def _render_relationship_merge_statement(self, rel_record: dict) -> str:
         template = Template("""
             MATCH (n1:{{ START_LABEL }} {key: $START_KEY}), (n2:{{ END_LABEL }} {key: $END_KEY})
             MERGE (n1)-[r1:{{ TYPE }}]->(n2)-[r2:{{ REVERSE_TYPE }}]->(n1)
@@ -370,6 +694,23 @@ class Neo4jCsvPublisher(Publisher):
                                update_prop_body=prop_body_r1,
                                prop_body=prop_body)
 
+    def _relation_cache_key(self, statement_type: str, rel_record: dict) -> Tuple:
+        return (statement_type, rel_record[RELATION_START_LABEL], rel_record[RELATION_END_LABEL],
+                rel_record[RELATION_TYPE], rel_record[RELATION_REVERSE_TYPE], tuple(rel_record.keys()))
+
+    def _get_or_create_statement(self, cache_key: Tuple, create_statement: Callable[[], str]) -> str:
+        """
+        Returns the statement cached under the cache key, creating and caching it first if it's not there.
+        :param cache_key: Statement shape. (e.g: label, CSV header and create only flag for node)
+        :param create_statement: Renders the statement on cache miss
+        :return:
+        """
+        stmt = self._statement_cache.get(cache_key)
+        if stmt is None:
+            stmt = create_statement()
+            self._statement_cache[cache_key] = stmt
+        return stmt
+
     def _create_props_param(self, record_dict: dict) -> dict:
         params = {}
         for k, v in record_dict.items():
@@ -382,7 +723,8 @@ class Neo4jCsvPublisher(Publisher):
     def _create_props_body(self,
                            record_dict: dict,
                            excludes: Set,
-                           identifier: str) -> str:
+                           identifier: str,
+                           param_prefix: str = '$') -> str:
         """
         Creates properties body with params required for resolving template.
 
@@ -392,6 +734,7 @@ class Neo4jCsvPublisher(Publisher):
         :param record_dict: A dict represents CSV row
         :param excludes: set of excluded columns that does not need to be in properties (e.g: KEY, LABEL ...)
         :param identifier: identifier that will be used in CYPHER query as shown on above example
+        :param param_prefix: prefix used to reference the value, '$' for statement parameters or 'row.' for UNWIND
         :return: Properties body for Cypher statement
         """
         props = []
@@ -402,7 +745,7 @@ class Neo4jCsvPublisher(Publisher):
             if k.endswith(UNQUOTED_SUFFIX):
                 k = k[:-len(UNQUOTED_SUFFIX)]
 
-            props.append(f'{identifier}.{k} = ${k}')
+            props.append(f'{identifier}.{k} = {param_prefix}{k}')
 
         props.append(f"{identifier}.{PUBLISHED_TAG_PROPERTY_NAME} = '{self.publish_tag}'")
         props.append(f"{identifier}.{LAST_UPDATED_EPOCH_MS} = timestamp()")
@@ -413,7 +756,8 @@ class Neo4jCsvPublisher(Publisher):
                            stmt: str,
                            tx: Transaction,
                            params: dict = None,
-                           expect_result: bool = False) -> Transaction:
+                           expect_result: bool = False,
+                           expected_count: Optional[int] = None) -> Transaction:
         """
         Executes statement against Neo4j. If execution fails, it rollsback and raise exception.
         If 'expect_result' flag is True, it confirms if result object is not null.
@@ -421,14 +765,18 @@ class Neo4jCsvPublisher(Publisher):
         :param tx:
         :param count:
         :param expect_result: By having this True, it will validate if result object is not None.
+        :param expected_count: When provided along with expect_result, it also validates that the first value of
+        the result equals to it. (e.g: number of rows matched by UNWIND statement)
         :return:
         """
         try:
             LOGGER.debug('Executing statement: %s with params %s', stmt, params)
 
             result = tx.run(str(stmt).encode('utf-8', 'ignore'), parameters=params)
-            if expect_result and not result.single():
-                raise RuntimeError(f'Failed to executed statement: {stmt}')
+            if expect_result:
+                record = result.single()
+                if not record or (expected_count is not None and record[0] != expected_count):
+                    raise RuntimeError(f'Failed to executed statement: {stmt}')
 
             self._count += 1
             if self._count > 1 and self._count % self._transaction_size == 0:
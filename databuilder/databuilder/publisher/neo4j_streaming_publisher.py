@@ -0,0 +1,176 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import logging
+import queue
+import threading
+import time
+from typing import (
+    Any, Dict, List, Optional, Tuple,
+)
+
+from neo4j import Transaction
+from pyhocon import ConfigFactory, ConfigTree
+
+from databuilder.publisher.base_publisher import StreamingPublisher
+from databuilder.publisher.neo4j_csv_publisher import (
+    NEO4J_UNWIND_BATCH_SIZE, NODE_LABEL_KEY, Neo4jCsvPublisher,
+)
+
+# Config keys
+# Maximum number of batches waiting to be published. The loader blocks once the queue is full, which bounds the memory
+# to roughly STREAMING_QUEUE_SIZE * the loader's batch size rows.
+STREAMING_QUEUE_SIZE = 'streaming_queue_size'
+
+DEFAULT_CONFIG = ConfigFactory.from_dict({STREAMING_QUEUE_SIZE: 10,
+                                          NEO4J_UNWIND_BATCH_SIZE: 1000})
+
+NODE_BATCH = 'node'
+RELATION_BATCH = 'relation'
+
+# How often a blocked producer re-checks whether the publisher is still running
+_PUT_TIMEOUT_SEC = 1
+
+# Marks the end of the stream
+_END_OF_STREAM: Tuple[str, List[Dict[str, Any]]] = ('end', [])
+
+LOGGER = logging.getLogger(__name__)
+
+
+class Neo4jStreamingPublisher(Neo4jCsvPublisher, StreamingPublisher):
+    """
+    A Publisher that receives serialized node and relation batches from Neo4jStreamingLoader through a bounded queue
+    and publishes them to Neo4j while the task is still running, so that no intermediate CSV file is needed.
+
+    Batches are published in the order the loader hands them over, and the loader hands over pending nodes before any
+    relation, so a relation can refer to the nodes loaded before it. Unlike Neo4jCsvPublisher, where every node is
+    published before any relation, a relation to a node that is loaded later by the same job is not created. Use the
+    CSV based publisher for such jobs.
+
+    Rows are published with UNWIND statements (NEO4J_UNWIND_BATCH_SIZE defaults to 1000) and committed every
+    NEO4J_TRANSACTION_SIZE statements. Relation pre-processing is not supported, as it assumes every relation of a
+    kind is available upfront.
+    """
+
+    def __init__(self) -> None:
+        super(Neo4jStreamingPublisher, self).__init__()
+        self._queue: Optional[queue.Queue] = None
+        self._stopped = threading.Event()
+        self._aborted = threading.Event()
+        self._error: Optional[Exception] = None
+
+    def init(self, conf: ConfigTree) -> None:
+        conf = conf.with_fallback(DEFAULT_CONFIG)
+        super(Neo4jStreamingPublisher, self).init(conf)
+
+        if self._unwind_batch_size <= 0:
+            raise Exception(f'{NEO4J_UNWIND_BATCH_SIZE} should be positive')
+
+        if self._relation_preprocessor.is_perform_preprocess():
+            raise Exception(f'Relation pre-processing is not supported by {self.__class__.__name__}')
+
+        self._queue = queue.Queue(maxsize=conf.get_int(STREAMING_QUEUE_SIZE))
+
+    def put_nodes(self, node_records: List[Dict[str, Any]]) -> None:
+        """
+        Hands over a batch of serialized nodes. Blocks while the queue is full.
+        :param node_records: Nodes serialized by neo4_serializer
+        :return:
+        """
+        self._put((NODE_BATCH, node_records))
+
+    def put_relations(self, rel_records: List[Dict[str, Any]]) -> None:
+        """
+        Hands over a batch of serialized relations. Blocks while the queue is full.
+        :param rel_records: Relations serialized by neo4_serializer
+        :return:
+        """
+        self._put((RELATION_BATCH, rel_records))
+
+    def _put(self, item: Tuple[str, List[Dict[str, Any]]]) -> None:
+        if self._queue is None:
+            raise RuntimeError(f'{self.__class__.__name__} has not been initialized')
+
+        while True:
+            if self._error:
+                raise RuntimeError('Streaming publisher has failed') from self._error
+            if self._stopped.is_set():
+                raise RuntimeError('Streaming publisher has already stopped')
+            try:
+                self._queue.put(item, timeout=_PUT_TIMEOUT_SEC)
+                return
+            except queue.Full:
+                continue
+
+    def finish(self) -> None:
+        if self._queue is not None and not self._stopped.is_set():
+            # Nothing to signal if the publisher has already stopped on failure
+            self._put(_END_OF_STREAM)
+
+    def abort(self) -> None:
+        self._aborted.set()
+        if self._queue is not None:
+            try:
+                self._queue.put_nowait(_END_OF_STREAM)
+            except queue.Full:
+                # The consumer is not waiting on the queue and will notice the abort with the next batch
+                pass
+
+    def publish_impl(self) -> None:
+        """
+        Publishes batches from the queue until the end of the stream, then commits.
+        :return:
+        """
+        if self._queue is None:
+            raise RuntimeError(f'{self.__class__.__name__} has not been initialized')
+
+        start = time.time()
+        tx = self._session.begin_transaction()
+        try:
+            while True:
+                item = self._queue.get()
+                if self._aborted.is_set():
+                    raise RuntimeError('Streaming publish has been aborted')
+                if item is _END_OF_STREAM:
+                    break
+
+                batch_type, records = item
+
+                if batch_type == NODE_BATCH:
+                    tx = self._create_new_indices(records, tx)
+                    tx = self._publish_node_records(records, tx=tx)
+                else:
+                    tx = self._publish_relation_records(records, tx=tx)
+
+            tx.commit()
+            LOGGER.info('Committed total %i statements', self._count)
+            LOGGER.info('Successfully published. Elapsed: %i seconds', time.time() - start)
+        except Exception as e:
+            self._error = e
+            LOGGER.exception('Failed to publish. Rolling back.')
+            if not tx.closed():
+                tx.rollback()
+            raise e
+        finally:
+            self._stopped.set()
+
+    def _create_new_indices(self, node_records: List[Dict[str, Any]], tx: Transaction) -> Transaction:
+        """
+        Creates unique index for the labels seen for the first time. The pending transaction is committed first, so
+        that the schema change does not wait for the locks it holds.
+        :param node_records:
+        :param tx:
+        :return:
+        """
+        new_labels = {record[NODE_LABEL_KEY] for record in node_records} - self.labels
+        if not new_labels:
+            return tx
+
+        tx.commit()
+        for label in new_labels:
+            self._try_create_index(label)
+            self.labels.add(label)
+        return self._session.begin_transaction()
+
+    def get_scope(self) -> str:
+        return 'publisher.neo4j_streaming'
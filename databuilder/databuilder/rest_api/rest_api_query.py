@@ -1,20 +1,62 @@
 # Copyright Contributors to the Amundsen project.
 # SPDX-License-Identifier: Apache-2.0
 
+import concurrent.futures
 import copy
 import logging
+import threading
+import time
+from collections import deque
 from typing import (
-    Any, Callable, Dict, Iterator, List, Union,
+    Any, Callable, Deque, Dict, Iterator, List, Optional, Union,
 )
+from urllib.parse import urlsplit
 
 import requests
 from jsonpath_rw import parse
+from requests.adapters import HTTPAdapter
 from retrying import retry
 
 from databuilder.rest_api.base_rest_api_query import BaseRestApiQuery
+from databuilder.rest_api.rest_api_response_cache import ResponseNotCachedException, RestApiResponseCache
 
 LOGGER = logging.getLogger(__name__)
 
+# Number of upstream records submitted per worker ahead of the records being yielded, to bound the memory
+MAX_PENDING_RECORDS_PER_WORKER = 4
+
+
+def _is_retryable(exception: Exception) -> bool:
+    # retrying would not cache the response
+    return not isinstance(exception, ResponseNotCachedException)
+
+
+class HostRateLimiter(object):
+    """
+    Spaces out the calls to each host so that there are no more than max_calls_per_sec of them. Thread-safe, so a
+    single instance can be shared by the queries calling the same hosts, see RestApiQuery.set_rate_limiter.
+    """
+
+    def __init__(self, max_calls_per_sec: float) -> None:
+        self._interval = 1.0 / max_calls_per_sec
+        self._next_call_by_host: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url: str) -> None:
+        """
+        Blocks until the host of the URL can be called
+        :param url:
+        :return:
+        """
+        host = urlsplit(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            call_at = max(now, self._next_call_by_host.get(host, now))
+            self._next_call_by_host[host] = call_at + self._interval
+
+        if call_at > now:
+            time.sleep(call_at - now)
+
 
 class RestApiQuery(BaseRestApiQuery):
     """
@@ -50,6 +92,13 @@ class RestApiQuery(BaseRestApiQuery):
     All extension point is designed for subclass because there's no exact standard on Oauth and pagination.
 
     (How it would work with Tableau/Looker is described in docstring of _authenticate method)
+
+    By default, the records of the previous query are processed one after the other. With max_workers > 1, they are
+    processed concurrently, each by a copy of the query so that the pagination state of _preprocess_url and
+    _post_process is per record, and the requests share a session that keeps the connections alive.
+
+    The responses can be cached on disk with a RestApiResponseCache, see set_response_cache. The joined queries each
+    limit their own rate of calls with max_calls_per_sec, unless they share a HostRateLimiter, see set_rate_limiter.
     """
 
     def __init__(self,
@@ -62,6 +111,11 @@ class RestApiQuery(BaseRestApiQuery):
                  skip_no_result: bool = False,
                  json_path_contains_or: bool = False,
                  can_skip_failure: Callable = None,
+                 max_workers: int = 1,
+                 ordered: bool = True,
+                 max_calls_per_sec: Optional[float] = None,
+                 response_cache: Optional[RestApiResponseCache] = None,
+                 rate_limiter: Optional[HostRateLimiter] = None,
                  **kwargs: Any
                  ) -> None:
         """
@@ -114,6 +168,13 @@ class RestApiQuery(BaseRestApiQuery):
 
         :param can_skip_failure A function that can determine if it can skip the failure. See BaseFailureHandler for
         the function interface
+        :param max_workers: Number of records of the previous query processed concurrently. 1 processes them one after
+        the other.
+        :param ordered: If max_workers > 1, whether the results are yielded in the order of the previous query's
+        records. Otherwise they are yielded as soon as they are available.
+        :param max_calls_per_sec: Maximum number of calls per second to each host, or None for no limit
+        :param response_cache: Cache of the responses, or None to always call the REST API
+        :param rate_limiter: Rate limiter shared with other queries, used instead of max_calls_per_sec
 
         """
         self._inner_rest_api_query = query_to_join
@@ -131,58 +192,155 @@ class RestApiQuery(BaseRestApiQuery):
         self._can_skip_failure = can_skip_failure
         self._more_pages = False
 
-    def execute(self) -> Iterator[Dict[str, Any]]:  # noqa: C901
+        self._max_workers = max_workers
+        self._ordered = ordered
+        if rate_limiter is None and max_calls_per_sec:
+            rate_limiter = HostRateLimiter(max_calls_per_sec)
+        self._rate_limiter = rate_limiter
+        self._session: Optional[requests.Session] = None
+        self._response_cache = response_cache
+
+    def set_response_cache(self, response_cache: Optional[RestApiResponseCache]) -> None:
+        """
+        Sets the cache of the responses of this query and of the RestApiQuery it joins, recursively
+        :param response_cache:
+        :return:
+        """
+        self._response_cache = response_cache
+        if isinstance(self._inner_rest_api_query, RestApiQuery):
+            self._inner_rest_api_query.set_response_cache(response_cache)
+
+    def set_rate_limiter(self, rate_limiter: Optional[HostRateLimiter]) -> None:
+        """
+        Sets the rate limiter of this query and of the RestApiQuery it joins, recursively, so that the calls of the
+        whole chain to a host are limited together
+        :param rate_limiter:
+        :return:
+        """
+        self._rate_limiter = rate_limiter
+        if isinstance(self._inner_rest_api_query, RestApiQuery):
+            self._inner_rest_api_query.set_rate_limiter(rate_limiter)
+
+    def execute(self) -> Iterator[Dict[str, Any]]:
         self._authenticate()
 
-        for record_dict in self._inner_rest_api_query.execute():
+        if self._max_workers <= 1:
+            for record_dict in self._inner_rest_api_query.execute():
+                yield from self._execute_record(record_dict)
+            return
+
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_maxsize=self._max_workers)
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+        try:
+            yield from self._execute_concurrently()
+        finally:
+            self._session.close()
+            self._session = None
+
+    def _execute_concurrently(self) -> Iterator[Dict[str, Any]]:
+        """
+        Processes the records of the previous query with up to max_workers threads
+        :return:
+        """
+        max_pending = self._max_workers * MAX_PENDING_RECORDS_PER_WORKER
+        pending: Deque[concurrent.futures.Future] = deque()
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            try:
+                for record_dict in self._inner_rest_api_query.execute():
+                    pending.append(executor.submit(self._fetch_record, record_dict))
+                    while len(pending) >= max_pending:
+                        yield from self._next_results(pending)
+
+                while pending:
+                    yield from self._next_results(pending)
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def _next_results(self, pending: Deque[concurrent.futures.Future]) -> Iterator[Dict[str, Any]]:
+        """
+        Removes the next processed records from pending, in the order of submission if ordered, and yields their results
+        :param pending:
+        :return:
+        """
+        if self._ordered:
+            yield from pending.popleft().result()
+            return
+
+        done, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+        for future in done:
+            pending.remove(future)
+        for future in done:
+            yield from future.result()
+
+    def _fetch_record(self, record_dict: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Processes a record of the previous query with a copy of this query, which shares the session and rate limiter
+        but has its own pagination state
+        :param record_dict:
+        :return:
+        """
+        query = copy.copy(self)
+        query._params = copy.deepcopy(self._params)
+        query._more_pages = False
+        return list(query._execute_record(record_dict))
 
-            first_try = True  # To control pagination. Always pass the while loop on the first try
-            while first_try or self._more_pages:
-                first_try = False
+    def _execute_record(self, record_dict: Dict[str, Any]) -> Iterator[Dict[str, Any]]:  # noqa: C901
+        """
+        Calls the URL computed from a record of the previous query, following pagination, and yields the results
+        :param record_dict:
+        :return:
+        """
+        first_try = True  # To control pagination. Always pass the while loop on the first try
+        while first_try or self._more_pages:
+            first_try = False
 
-                url = self._preprocess_url(record=record_dict)
+            url = self._preprocess_url(record=record_dict)
 
-                try:
-                    response = self._send_request(url=url)
-                except Exception as e:
-                    if self._can_skip_failure and self._can_skip_failure(exception=e):
-                        continue
-                    raise e
+            try:
+                response = self._send_request(url=url)
+            except Exception as e:
+                if self._can_skip_failure and self._can_skip_failure(exception=e):
+                    continue
+                raise e
 
-                response_json: Union[List[Any], Dict[str, Any]] = response.json()
+            response_json: Union[List[Any], Dict[str, Any]] = response.json()
 
-                # value extraction via JSON Path
-                result_list: List[Any] = [match.value for match in self._jsonpath_expr.find(response_json)]
+            # value extraction via JSON Path
+            result_list: List[Any] = [match.value for match in self._jsonpath_expr.find(response_json)]
 
-                if not result_list:
-                    log_msg = f'No result from URL: {self._url}, JSONPATH: {self._json_path} , ' \
-                              f'response payload: {response_json}'
-                    LOGGER.info(log_msg)
+            if not result_list:
+                log_msg = f'No result from URL: {self._url}, JSONPATH: {self._json_path} , ' \
+                          f'response payload: {response_json}'
+                LOGGER.info(log_msg)
 
-                    self._post_process(response)
+                self._post_process(response)
 
-                    if self._fail_no_result:
-                        raise Exception(log_msg)
+                if self._fail_no_result:
+                    raise Exception(log_msg)
 
-                    if self._skip_no_result:
-                        continue
+                if self._skip_no_result:
+                    continue
 
-                    yield copy.deepcopy(record_dict)
+                yield copy.deepcopy(record_dict)
 
-                sub_records = RestApiQuery._compute_sub_records(result_list=result_list,
-                                                                field_names=self._field_names,
-                                                                json_path_contains_or=self._json_path_contains_or)
+            sub_records = RestApiQuery._compute_sub_records(result_list=result_list,
+                                                            field_names=self._field_names,
+                                                            json_path_contains_or=self._json_path_contains_or)
 
-                for sub_record in sub_records:
-                    if not sub_record or len(sub_record) != len(self._field_names):
-                        # skip the record
-                        continue
-                    record_dict = copy.deepcopy(record_dict)
-                    for field_name in self._field_names:
-                        record_dict[field_name] = sub_record.pop(0)
-                    yield record_dict
+            for sub_record in sub_records:
+                if not sub_record or len(sub_record) != len(self._field_names):
+                    # skip the record
+                    continue
+                record_dict = copy.deepcopy(record_dict)
+                for field_name in self._field_names:
+                    record_dict[field_name] = sub_record.pop(0)
+                yield record_dict
 
-                self._post_process(response)
+            self._post_process(response)
 
     def _preprocess_url(self, record: Dict[str, Any]) -> str:
         """
@@ -192,18 +350,29 @@ class RestApiQuery(BaseRestApiQuery):
         """
         return self._url.format(**record)
 
-    @retry(stop_max_attempt_number=5, wait_exponential_multiplier=1000, wait_exponential_max=10000)
+    @retry(stop_max_attempt_number=5, wait_exponential_multiplier=1000, wait_exponential_max=10000,
+           retry_on_exception=_is_retryable)
     def _send_request(self, url: str) -> requests.Response:
         """
         Performs HTTP GET operation with retry on failure.
         :param url:
         :return:
         """
-        LOGGER.info('Calling URL %s', url)
-        response = requests.get(url, **self._params)
+        if self._response_cache:
+            response = self._response_cache.send(url=url, params=self._params, send_request=self._get)
+        else:
+            response = self._get(url, **self._params)
         response.raise_for_status()
         return response
 
+    def _get(self, url: str, **params: Any) -> requests.Response:
+        LOGGER.info('Calling URL %s', url)
+        if self._rate_limiter:
+            self._rate_limiter.wait(url)
+        if self._session:
+            return self._session.get(url, **params)
+        return requests.get(url, **params)
+
     @classmethod
     def _compute_sub_records(cls,
                              result_list: List[Any],
@@ -0,0 +1,128 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import base64
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from http import HTTPStatus
+from typing import (
+    Any, Callable, Dict, Optional,
+)
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+LOGGER = logging.getLogger(__name__)
+
+# Response headers stored along with the body
+CACHED_HEADERS = ['Content-Type', 'ETag', 'Last-Modified']
+
+
+class ResponseNotCachedException(Exception):
+    """
+    Raised in offline mode when there's no cached response for the request
+    """
+    pass
+
+
+class RestApiResponseCache(object):
+    """
+    Caches the responses of the REST API calls on disk, keyed by URL and query parameters, so that unchanged
+    resources are not downloaded again by the next run.
+
+    Online, a cached response with an ETag or Last-Modified header is revalidated with a conditional request, and
+    returned if the server answers 304 Not Modified. Otherwise the response is downloaded and cached again.
+
+    Offline, the cached responses are returned without calling the REST API, e.g. to replay a previous run in tests
+    and benchmarks, and ResponseNotCachedException is raised for the requests that were not cached.
+
+    The cached responses contain the payloads of the REST API, so the directory must be protected accordingly.
+    """
+
+    def __init__(self, directory: str, offline: bool = False) -> None:
+        """
+        :param directory: Directory of the cached responses. It's created if it does not exist.
+        :param offline: Whether the cached responses are returned without calling the REST API
+        """
+        self._directory = directory
+        self._offline = offline
+        os.makedirs(self._directory, mode=0o700, exist_ok=True)
+
+    def send(self,
+             url: str,
+             params: Dict[str, Any],
+             send_request: Callable[..., requests.Response]
+             ) -> requests.Response:
+        """
+        Returns the response of the request, from the cache if it's still valid
+        :param url:
+        :param params: Keyword arguments of send_request. The query parameters in params['params'] are part of the
+        cache key, the other arguments (e.g. auth, headers) are not.
+        :param send_request: Sends the request, e.g. requests.get
+        :return:
+        """
+        path = self._path(url=url, query_params=params.get('params'))
+        cached_response = self._load(path)
+
+        if self._offline:
+            if cached_response is None:
+                raise ResponseNotCachedException(f'No cached response for URL: {url}, params: {params.get("params")}')
+            return cached_response
+
+        if cached_response is not None:
+            validators = {}
+            if 'ETag' in cached_response.headers:
+                validators['If-None-Match'] = cached_response.headers['ETag']
+            if 'Last-Modified' in cached_response.headers:
+                validators['If-Modified-Since'] = cached_response.headers['Last-Modified']
+            if validators:
+                params = dict(params, headers=dict(params.get('headers') or {}, **validators))
+
+        response = send_request(url, **params)
+        if response.status_code == HTTPStatus.NOT_MODIFIED and cached_response is not None:
+            LOGGER.debug('Using cached response for URL %s', url)
+            return cached_response
+
+        if response.status_code == HTTPStatus.OK:
+            self._store(path, response)
+        return response
+
+    def _path(self, url: str, query_params: Any) -> str:
+        key = json.dumps([url, query_params], sort_keys=True, default=str)
+        return os.path.join(self._directory, hashlib.sha256(key.encode('utf-8')).hexdigest() + '.json')
+
+    def _load(self, path: str) -> Optional[requests.Response]:
+        try:
+            with open(path) as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+
+        response = requests.Response()
+        response.url = entry['url']
+        response.status_code = HTTPStatus.OK
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        response.encoding = entry['encoding']
+        response._content = base64.b64decode(entry['content'])
+        return response
+
+    def _store(self, path: str, response: requests.Response) -> None:
+        entry = {
+            'url': response.url,
+            'headers': {header: response.headers[header] for header in CACHED_HEADERS if header in response.headers},
+            'encoding': response.encoding,
+            'content': base64.b64encode(response.content).decode('ascii'),
+        }
+
+        # write then rename, so that the cache never contains a partial response
+        fd, temp_path = tempfile.mkstemp(dir=self._directory, prefix='.')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(entry, f)
+            os.replace(temp_path, path)
+        except Exception:
+            os.remove(temp_path)
+            raise
@@ -2,10 +2,12 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import abc
+from typing import Dict
 
 from pyhocon import ConfigTree
 
 from databuilder import Scoped
+from databuilder.utils.instrumentation import StageStats
 
 
 class Task(Scoped):
@@ -24,5 +26,12 @@ class Task(Scoped):
         """
         pass
 
+    def get_stage_stats(self) -> Dict[str, StageStats]:
+        """
+        Stats of each stage of the last run, keyed by stage name. (e.g: extractor, transformer, loader)
+        :return: Empty if the task doesn't record stats
+        """
+        return {}
+
     def get_scope(self) -> str:
         return 'task'
@@ -0,0 +1,167 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import logging
+import queue
+import threading
+import time
+from typing import (
+    Any, Callable, Iterator, List,
+)
+
+from pyhocon import ConfigTree
+
+from databuilder.task.task import DefaultTask
+from databuilder.utils.instrumentation import StageStats, get_bytes_written
+
+LOGGER = logging.getLogger(__name__)
+
+# Marks the end of the records between stages
+_END_OF_RECORDS = object()
+
+# How often a blocked stage re-checks whether another stage has failed
+_QUEUE_TIMEOUT_SEC = 1
+
+
+class _StageStopped(Exception):
+    """
+    Raised within a stage when another stage has failed.
+    """
+    pass
+
+
+class PipelinedTask(DefaultTask):
+    """
+    A task that extracts, transforms and loads like DefaultTask, but runs the extractor and the transformer in
+    their own threads, connected with the loader by bounded queues. It lets network bound extraction overlap with
+    transformation and disk bound loading.
+
+    A stage blocks once the queue to the next stage is full, which bounds the memory to QUEUE_SIZE records per queue.
+    If any stage fails, the other stages stop and the first failure is raised from run().
+    Each of extractor, transformer and loader is only called from its own thread, so they don't need to be
+    thread-safe.
+    """
+
+    # Maximum number of records waiting between two stages
+    QUEUE_SIZE = 'queue_size'
+
+    def init(self, conf: ConfigTree) -> None:
+        super(PipelinedTask, self).init(conf)
+        self._queue_size = conf.get_int(f'{self.get_scope()}.{PipelinedTask.QUEUE_SIZE}', 1000)
+
+    def run(self) -> None:
+        """
+        Runs a task
+        """
+        LOGGER.info('Running a pipelined task')
+        self.stats = {name: StageStats(name) for name in ('extractor', 'transformer', 'loader')}
+        bytes_written_start = get_bytes_written()
+        self._stop = threading.Event()
+        self._errors: List[Exception] = []
+
+        extracted: queue.Queue = queue.Queue(maxsize=self._queue_size)
+        transformed: queue.Queue = queue.Queue(maxsize=self._queue_size)
+        threads = [
+            threading.Thread(target=self._run_stage, args=(self._extract_stage, extracted),
+                             name='task-extractor', daemon=True),
+            threading.Thread(target=self._run_stage, args=(self._transform_stage, extracted, transformed),
+                             name='task-transformer', daemon=True),
+        ]
+        try:
+            for thread in threads:
+                thread.start()
+            self._run_stage(self._load_stage, transformed)
+            for thread in threads:
+                thread.join()
+
+            if self._errors:
+                raise self._errors[0]
+
+            LOGGER.info('Task completed: %s', list(self.stats.values()))
+        finally:
+            self._stop.set()
+            self._record_bytes_written(bytes_written_start)
+            self._closer.close()
+
+    def _run_stage(self, stage: Callable[..., None], *queues: queue.Queue) -> None:
+        try:
+            stage(*queues)
+        except _StageStopped:
+            pass
+        except Exception as e:
+            LOGGER.exception('Task stage %s failed', threading.current_thread().name)
+            self._errors.append(e)
+            self._stop.set()
+
+    def _extract_stage(self, out_queue: queue.Queue) -> None:
+        stats = self.stats['extractor']
+        while True:
+            start = time.time()
+            record = self.extractor.extract()
+            stats.busy_time += time.time() - start
+            if not record:
+                break
+
+            stats.record_count += 1
+            self._put(out_queue, record)
+
+        self._put(out_queue, _END_OF_RECORDS)
+
+    def _transform_stage(self, in_queue: queue.Queue, out_queue: queue.Queue) -> None:
+        stats = self.stats['transformer']
+        while True:
+            record = self._get(in_queue)
+            if record is _END_OF_RECORDS:
+                break
+
+            start = time.time()
+            record = self.transformer.transform(record)
+            if not record:
+                # Move on if the transformer filtered the record out
+                stats.busy_time += time.time() - start
+                continue
+
+            # Support transformers which return one record, or yield multiple
+            results = record if isinstance(record, Iterator) else [record]
+            for result in results:
+                stats.busy_time += time.time() - start
+                if result:
+                    stats.record_count += 1
+                    self._put(out_queue, result)
+                start = time.time()
+
+        self._put(out_queue, _END_OF_RECORDS)
+
+    def _load_stage(self, in_queue: queue.Queue) -> None:
+        stats = self.stats['loader']
+        while True:
+            record = self._get(in_queue)
+            if record is _END_OF_RECORDS:
+                break
+
+            start = time.time()
+            self.loader.load(record)
+            stats.busy_time += time.time() - start
+            stats.record_count += 1
+
+            if stats.record_count % self._progress_report_frequency == 0:
+                LOGGER.info('Loaded %i records so far: %s', stats.record_count, list(self.stats.values()))
+
+    def _put(self, out_queue: queue.Queue, record: Any) -> None:
+        while True:
+            if self._stop.is_set():
+                raise _StageStopped()
+            try:
+                out_queue.put(record, timeout=_QUEUE_TIMEOUT_SEC)
+                return
+            except queue.Full:
+                continue
+
+    def _get(self, in_queue: queue.Queue) -> Any:
+        while True:
+            if self._stop.is_set():
+                raise _StageStopped()
+            try:
+                return in_queue.get(timeout=_QUEUE_TIMEOUT_SEC)
+            except queue.Empty:
+                continue
@@ -2,7 +2,10 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import logging
-from typing import Iterator
+import time
+from typing import (
+    Any, Dict, Iterable, Iterator, Optional,
+)
 
 from pyhocon import ConfigTree
 
@@ -12,6 +15,7 @@ from databuilder.loader.base_loader import Loader
 from databuilder.task.base_task import Task
 from databuilder.transformer.base_transformer import NoopTransformer, Transformer
 from databuilder.utils.closer import Closer
+from databuilder.utils.instrumentation import StageStats, get_bytes_written
 
 LOGGER = logging.getLogger(__name__)
 
@@ -20,6 +24,8 @@ class DefaultTask(Task):
     """
     A default task expecting to extract, transform and load.
 
+    Time spent and records produced by each of extractor, transformer and loader are recorded in StageStats. As they
+    run interleaved, bytes written while the task runs are attributed to the loader.
     """
 
     # Determines the frequency of the log on task progress
@@ -38,6 +44,8 @@ class DefaultTask(Task):
         self._closer.register(self.transformer.close)
         self._closer.register(self.loader.close)
 
+        self.stats: Dict[str, StageStats] = {}
+
     def init(self, conf: ConfigTree) -> None:
         self._progress_report_frequency = \
             conf.get_int(f'{self.get_scope()}.{DefaultTask.PROGRESS_REPORT_FREQUENCY}', 500)
@@ -51,27 +59,69 @@ class DefaultTask(Task):
         Runs a task
         """
         LOGGER.info('Running a task')
+        self.stats = {name: StageStats(name) for name in ('extractor', 'transformer', 'loader')}
+        extractor_stats, transformer_stats, loader_stats = \
+            self.stats['extractor'], self.stats['transformer'], self.stats['loader']
+        bytes_written_start = get_bytes_written()
         try:
-            record = self.extractor.extract()
+            record = self._extract(extractor_stats)
             count = 0
             while record:
+                start = time.time()
                 record = self.transformer.transform(record)
+                transformer_stats.busy_time += time.time() - start
                 if not record:
                     # Move on if the transformer filtered the record out
-                    record = self.extractor.extract()
+                    record = self._extract(extractor_stats)
                     continue
 
                 # Support transformers which return one record, or yield multiple
                 results = record if isinstance(record, Iterator) else [record]
-                for result in results:
+                for result in self._timed_iter(results, transformer_stats):
                     if result:
+                        transformer_stats.record_count += 1
+                        start = time.time()
                         self.loader.load(result)
+                        loader_stats.busy_time += time.time() - start
+                        loader_stats.record_count += 1
                         count += 1
 
                 if count > 0 and count % self._progress_report_frequency == 0:
                     LOGGER.info(f'Extracted %i records so far', count)
 
                 # Prepare the next record
-                record = self.extractor.extract()
+                record = self._extract(extractor_stats)
         finally:
+            self._record_bytes_written(bytes_written_start)
             self._closer.close()
+
+    def _extract(self, stats: StageStats) -> Any:
+        start = time.time()
+        record = self.extractor.extract()
+        stats.busy_time += time.time() - start
+        if record:
+            stats.record_count += 1
+        return record
+
+    def _timed_iter(self, records: Iterable[Any], stats: StageStats) -> Iterator[Any]:
+        """
+        Adds the time spent producing each record, such as a transformer yielding records, to the stats.
+        """
+        records_iter = iter(records)
+        while True:
+            start = time.time()
+            try:
+                record = next(records_iter)
+            except StopIteration:
+                return
+            finally:
+                stats.busy_time += time.time() - start
+            yield record
+
+    def _record_bytes_written(self, bytes_written_start: Optional[int]) -> None:
+        bytes_written_end = get_bytes_written()
+        if bytes_written_start is not None and bytes_written_end is not None:
+            self.stats['loader'].bytes_written = bytes_written_end - bytes_written_start
+
+    def get_stage_stats(self) -> Dict[str, StageStats]:
+        return self.stats
@@ -1,30 +1,51 @@
 # Copyright Contributors to the Amundsen project.
 # SPDX-License-Identifier: Apache-2.0
 
-from typing import Optional, Tuple
+from typing import (
+    Any, Optional, Tuple,
+)
 
 from pyhocon import ConfigTree
 
-from databuilder.extractor.bigquery_usage_extractor import TableColumnUsageTuple
-from databuilder.models.table_column_usage import ColumnReader, TableColumnUsage
+from databuilder.extractor.bigquery_usage_extractor import TableColumnUsageTuple, TableUsageTuple
+from databuilder.models.table_column_usage import (
+    ColumnReader, SerializedUsers, TableColumnUsage,
+)
 from databuilder.transformer.base_transformer import Transformer
 
 
 class BigqueryUsageTransformer(Transformer):
+    # Serialize each user once per run, instead of once per table they read
+    DEDUPE_USERS = 'dedupe_users'
 
     def init(self, conf: ConfigTree) -> None:
         """
         Transformer to convert TableColumnUsageTuple data to bigquery usage data
-        which can be uploaded to Neo4j
+        which can be uploaded to Neo4j.
+        The TableUsageTuple records of BigQueryTableUsageExtractor's aggregate_by_table mode are converted to one
+        TableColumnUsage per table.
         """
         self.conf = conf
+        self.serialized_users: Optional[SerializedUsers] = \
+            SerializedUsers() if conf.get_bool(BigqueryUsageTransformer.DEDUPE_USERS, False) else None
 
-    def transform(self, record: Tuple[TableColumnUsageTuple, int]) -> Optional[TableColumnUsage]:
+    def transform(self, record: Tuple[Any, Any]) -> Optional[TableColumnUsage]:
         if not record:
             return None
 
         (key, count) = record
 
+        if isinstance(key, TableUsageTuple):
+            return TableColumnUsage(col_readers=[ColumnReader(database=key.database,
+                                                              cluster=key.cluster,
+                                                              schema=key.schema,
+                                                              table=key.table,
+                                                              column=key.column,
+                                                              user_email=email,
+                                                              read_count=read_count)
+                                                 for email, read_count in count.items()],
+                                    serialized_users=self.serialized_users)
+
         if not isinstance(key, TableColumnUsageTuple):
             raise Exception("BigqueryUsageTransformer expects record of type TableColumnUsageTuple")
 
@@ -37,7 +58,7 @@ class BigqueryUsageTransformer(Transformer):
                                         user_email=key.email,
                                         read_count=count))
 
-        return TableColumnUsage(col_readers=col_readers)
+        return TableColumnUsage(col_readers=col_readers, serialized_users=self.serialized_users)
 
     def get_scope(self) -> str:
         return 'transformer.bigquery_usage'
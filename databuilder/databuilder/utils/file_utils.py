@@ -0,0 +1,21 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import gzip
+from typing import IO
+
+GZIP_FILE_EXTENSION = '.gz'
+# Faster than the default level 9, for a slightly larger file
+GZIP_COMPRESS_LEVEL = 6
+
+
+def open_text_file(path: str, mode: str) -> IO[str]:
+    """
+    Opens a text file, which is gzip compressed if its path ends with .gz
+    :param path:
+    :param mode: e.g. 'r', 'w' or 'a'
+    :return: file object
+    """
+    if path.endswith(GZIP_FILE_EXTENSION):
+        return gzip.open(path, mode.replace('t', '') + 't', compresslevel=GZIP_COMPRESS_LEVEL)  # type: ignore
+    return open(path, mode)
@@ -0,0 +1,76 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import logging
+import sys
+from typing import (
+    Any, Dict, Optional,
+)
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None  # type: ignore
+
+LOGGER = logging.getLogger(__name__)
+
+_PROC_IO_PATH = '/proc/self/io'
+
+
+class StageStats(object):
+    """
+    Throughput counters of a job stage, such as extractor, transformer, loader or publisher.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.record_count = 0
+        # Seconds spent in the stage. For a stage running in its own thread, it excludes the time waiting on
+        # other stages.
+        self.busy_time = 0.0
+        # Bytes written by the process while the stage ran, None if it's not measured or not available
+        self.bytes_written: Optional[int] = None
+
+    @property
+    def records_per_sec(self) -> float:
+        return self.record_count / self.busy_time if self.busy_time else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'record_count': self.record_count,
+            'busy_time_sec': round(self.busy_time, 3),
+            'records_per_sec': round(self.records_per_sec, 1),
+            'bytes_written': self.bytes_written,
+        }
+
+    def __repr__(self) -> str:
+        return f'StageStats({self.name!r}, record_count={self.record_count}, busy_time={self.busy_time:.3f}, ' \
+               f'records_per_sec={self.records_per_sec:.1f})'
+
+
+def get_peak_rss_bytes() -> Optional[int]:
+    """
+    :return: Peak resident set size of the process so far, or None if it's not available on the platform
+    """
+    if resource is None:
+        return None
+
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes on Linux
+    return max_rss if sys.platform == 'darwin' else max_rss * 1024
+
+
+def get_bytes_written() -> Optional[int]:
+    """
+    :return: Number of bytes the process has written so far (including to files and sockets), or None if it's not
+    available on the platform
+    """
+    try:
+        with open(_PROC_IO_PATH, 'r') as proc_io:
+            for line in proc_io:
+                key, value = line.split(':', 1)
+                if key == 'wchar':
+                    return int(value)
+    except (OSError, ValueError):
+        LOGGER.debug('Failed to read %s', _PROC_IO_PATH, exc_info=True)
+    return None
@@ -40,7 +40,8 @@ athena = ['PyAthena[SQLAlchemy]>=1.0.0, <2.0.0']
 bigquery = [
     'google-api-python-client>=1.6.0, <2.0.0dev',
     'google-auth-httplib2>=0.0.1',
-    'google-auth>=1.0.0, <2.0.0dev'
+    'google-auth>=1.0.0, <2.0.0dev',
+    'python-dateutil>=2.7.0'
 ]
 
 jsonpath = ['jsonpath_rw==1.4.0']
@@ -0,0 +1,79 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Micro-benchmark of Cypher statement generation in Neo4jCsvPublisher.
+
+Compares rendering a statement per CSV row (as it was before the statement cache) with the cached path, which renders
+once per statement shape. Run from the databuilder directory:
+
+    python -m tests.benchmark.neo4j_statement_benchmark
+"""
+
+import argparse
+import time
+from typing import (
+    Callable, Dict, List,
+)
+
+from mock import patch
+from neo4j import GraphDatabase
+from pyhocon import ConfigFactory
+
+from databuilder.publisher import neo4j_csv_publisher
+from databuilder.publisher.neo4j_csv_publisher import Neo4jCsvPublisher
+
+
+def _create_publisher() -> Neo4jCsvPublisher:
+    with patch.object(GraphDatabase, 'driver'):
+        publisher = Neo4jCsvPublisher()
+        publisher.init(ConfigFactory.from_dict({
+            neo4j_csv_publisher.NEO4J_END_POINT_KEY: 'dummy://999.999.999.999:7687/',
+            neo4j_csv_publisher.NEO4J_USER: 'neo4j_user',
+            neo4j_csv_publisher.NEO4J_PASSWORD: 'neo4j_password',
+            neo4j_csv_publisher.JOB_PUBLISH_TAG: 'benchmark',
+        }))
+    return publisher
+
+
+def _node_records(count: int) -> List[Dict]:
+    return [{'KEY': f'hive://gold.schema/table/col{i}', 'name': f'col{i}', 'order_pos:UNQUOTED': i,
+             'type': 'bigint', 'LABEL': 'Column'} for i in range(count)]
+
+
+def _relation_records(count: int) -> List[Dict]:
+    return [{'START_LABEL': 'Table', 'START_KEY': 'hive://gold.schema/table', 'END_LABEL': 'Column',
+             'END_KEY': f'hive://gold.schema/table/col{i}', 'TYPE': 'COLUMN', 'REVERSE_TYPE': 'COLUMN_OF'}
+            for i in range(count)]
+
+
+def _statements_per_sec(render: Callable[[Dict], str], records: List[Dict]) -> float:
+    start = time.perf_counter()
+    for record in records:
+        render(record)
+    return len(records) / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=20000, help='Number of CSV rows to render statements for')
+    args = parser.parse_args()
+
+    publisher = _create_publisher()
+    node_records = _node_records(args.rows)
+    relation_records = _relation_records(args.rows)
+
+    benchmarks = [
+        ('node', publisher._render_node_merge_statement, publisher.create_node_merge_statement, node_records),
+        ('relation', publisher._render_relationship_merge_statement, publisher.create_relationship_merge_statement,
+         relation_records),
+    ]
+    for name, uncached, cached, records in benchmarks:
+        before = _statements_per_sec(uncached, records)
+        after = _statements_per_sec(cached, records)
+        print(f'{name:<10} uncached: {before:>12,.0f} statements/sec   '
+              f'cached: {after:>12,.0f} statements/sec   speedup: {after / before:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
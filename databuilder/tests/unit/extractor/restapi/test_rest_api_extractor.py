@@ -1,15 +1,20 @@
 # Copyright Contributors to the Amundsen project.
 # SPDX-License-Identifier: Apache-2.0
 
+import shutil
+import tempfile
 import unittest
 
+from mock import patch
 from pyhocon import ConfigFactory
 
 from databuilder.extractor.restapi.rest_api_extractor import (
-    MODEL_CLASS, REST_API_QUERY, STATIC_RECORD_DICT, RestAPIExtractor,
+    MODEL_CLASS, RESPONSE_CACHE_DIRECTORY, RESPONSE_CACHE_OFFLINE, REST_API_QUERY, STATIC_RECORD_DICT, RestAPIExtractor,
 )
 from databuilder.models.dashboard.dashboard_metadata import DashboardMetadata
 from databuilder.rest_api.base_rest_api_query import RestApiQuerySeed
+from databuilder.rest_api.rest_api_query import RestApiQuery
+from databuilder.rest_api.rest_api_response_cache import ResponseNotCachedException
 
 
 class TestRestAPIExtractor(unittest.TestCase):
@@ -49,3 +54,24 @@ class TestRestAPIExtractor(unittest.TestCase):
                                      dashboard_group_description='doe')
 
         self.assertEqual(expected.__repr__(), record.__repr__())
+
+    def test_response_cache_offline(self) -> None:
+        directory = tempfile.mkdtemp()
+        try:
+            conf = ConfigFactory.from_dict(
+                {
+                    REST_API_QUERY: RestApiQuery(query_to_join=RestApiQuerySeed(seed_record=[{'id': 1}]),
+                                                 url='http://foo.bar/{id}', params={}, json_path='name',
+                                                 field_names=['name']),
+                    RESPONSE_CACHE_DIRECTORY: directory,
+                    RESPONSE_CACHE_OFFLINE: True,
+                }
+            )
+            extractor = RestAPIExtractor()
+            extractor.init(conf=conf)
+
+            with patch('databuilder.rest_api.rest_api_query.requests.get') as mock_get:
+                self.assertRaises(ResponseNotCachedException, extractor.extract)
+                mock_get.assert_not_called()
+        finally:
+            shutil.rmtree(directory)
@@ -0,0 +1,93 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import threading
+import unittest
+from typing import (
+    Any, Dict, List,
+)
+
+from mock import patch
+from pyhocon import ConfigFactory
+
+from databuilder import Scoped
+from databuilder.extractor.atlas_search_data_extractor import AtlasSearchDataExtractor
+
+ENTITY_COUNT = 95
+
+
+class TestAtlasSearchDataExtractor(unittest.TestCase):
+    def setUp(self) -> None:
+        self.guid_calls: List[int] = []
+        self.details_calls: List[List[str]] = []
+        self.lock = threading.Lock()
+
+    def _extractor(self, **conf: Any) -> AtlasSearchDataExtractor:
+        config_dict: Dict[str, Any] = {
+            f'extractor.atlas_search_data.{AtlasSearchDataExtractor.ENTITY_TYPE_KEY}': 'Table',
+            f'extractor.atlas_search_data.{AtlasSearchDataExtractor.ATLAS_SEARCH_CHUNK_SIZE_KEY}': 10,
+            f'extractor.atlas_search_data.{AtlasSearchDataExtractor.ATLAS_DETAILS_CHUNK_SIZE_KEY}': 4,
+            f'extractor.atlas_search_data.{AtlasSearchDataExtractor.PROCESS_POOL_SIZE_KEY}': 2,
+        }
+        config_dict.update({f'extractor.atlas_search_data.{key}': value for key, value in conf.items()})
+
+        extractor = AtlasSearchDataExtractor()
+        with patch.object(AtlasSearchDataExtractor, '_get_driver'):
+            extractor.init(Scoped.get_scoped_conf(conf=ConfigFactory.from_dict(config_dict),
+                                                  scope=extractor.get_scope()))
+
+        extractor._get_count_of_active_entities = lambda: ENTITY_COUNT  # type: ignore
+        extractor._get_entity_guids = self._get_entity_guids  # type: ignore
+        extractor._get_entity_details = self._get_entity_details  # type: ignore
+        return extractor
+
+    def _get_entity_guids(self, start_offset: int) -> List[str]:
+        with self.lock:
+            self.guid_calls.append(start_offset)
+        return [f'guid_{i:03}' for i in range(start_offset, min(start_offset + 10, ENTITY_COUNT))]
+
+    def _get_entity_details(self, guid_list: List[str]) -> List[str]:
+        with self.lock:
+            self.details_calls.append(guid_list)
+        return [guid.replace('guid', 'entity') for guid in guid_list]
+
+    def test_streaming_ordered(self) -> None:
+        """
+        Test that streaming yields the same entities in the same order as collecting all guids first
+        """
+        expected = list(self._extractor()._execute_query())
+        self.assertEqual(expected, [f'entity_{i:03}' for i in range(ENTITY_COUNT)])
+
+        self.details_calls = []
+        actual = list(self._extractor(**{AtlasSearchDataExtractor.STREAMING_KEY: True})._execute_query())
+
+        self.assertEqual(actual, expected)
+        self.assertTrue(all(len(guid_list) == 4 for guid_list in self.details_calls[:-1]))
+
+    def test_streaming_unordered(self) -> None:
+        """
+        Test that unordered streaming yields every entity once
+        """
+        extractor = self._extractor(**{AtlasSearchDataExtractor.STREAMING_KEY: True,
+                                       AtlasSearchDataExtractor.ORDERED_KEY: False})
+
+        actual = list(extractor._execute_query())
+
+        self.assertEqual(sorted(actual), [f'entity_{i:03}' for i in range(ENTITY_COUNT)])
+
+    def test_streaming_bounds_in_flight_chunks(self) -> None:
+        """
+        Test that streaming only fetches max_in_flight_chunks chunks ahead of the extracted entities
+        """
+        extractor = self._extractor(**{AtlasSearchDataExtractor.STREAMING_KEY: True,
+                                       AtlasSearchDataExtractor.MAX_IN_FLIGHT_CHUNKS_KEY: 2})
+        entities = extractor._execute_query()
+
+        self.assertEqual(next(entities), 'entity_000')
+
+        self.assertLessEqual(len(self.details_calls), 2)
+        self.assertLessEqual(len(self.guid_calls), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,7 +3,9 @@
 
 import logging
 import unittest
-from typing import Any
+from typing import (
+    Any, List, cast,
+)
 
 from mock import Mock, patch
 from pyhocon import ConfigFactory
@@ -349,3 +351,38 @@ class TestBigQueryMetadataExtractor(unittest.TestCase):
 
         self.assertEqual(count, 1)
         self.assertEqual(table_name, 'date_range_')
+
+    @patch('databuilder.extractor.base_bigquery_extractor.build')
+    def test_concurrent_fetch(self, mock_build: Any) -> None:
+        """
+        Test that fetching the tables concurrently extracts the same tables, with the sharded tables grouped
+        """
+        tables = cast(List[Any], ONE_TABLE['tables']) + cast(List[Any], ONE_VIEW['tables']) + \
+            cast(List[Any], TABLE_DATE_RANGE['tables'])
+        table_list = dict(ONE_TABLE, tables=tables)
+        client = MockBigQueryClient(ONE_DATASET, table_list, TABLE_DATA)
+        mock_build.return_value = client
+
+        config_dict = {
+            f'extractor.bigquery_table_metadata.{BigQueryMetadataExtractor.PROJECT_ID_KEY}': 'your-project-here',
+            f'extractor.bigquery_table_metadata.{BigQueryMetadataExtractor.MAX_WORKERS_KEY}': 4,
+        }
+        conf = ConfigFactory.from_dict(config_dict)
+
+        extractor = BigQueryMetadataExtractor()
+        extractor.init(Scoped.get_scoped_conf(conf=conf,
+                                              scope=extractor.get_scope()))
+
+        table_names = []
+        result = extractor.extract()
+        while result:
+            self.assertIsInstance(result, TableMetadata)
+            table_names.append(result.name)
+            result = extractor.extract()
+
+        self.assertEqual(sorted(table_names), ['abab', 'date_range_', 'nested_recs'])
+        self.assertEqual(client.get_execute.execute.call_count, 3)
+        for call in client.get_execute.execute.call_args_list:
+            # each worker thread sends its requests with its own http object
+            self.assertIsNotNone(call[1]['http'])
+            self.assertEqual(call[1]['num_retries'], BigQueryMetadataExtractor.NUM_RETRIES)
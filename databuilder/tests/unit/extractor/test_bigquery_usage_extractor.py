@@ -2,15 +2,20 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import base64
+import json
+import os
 import tempfile
 import unittest
+from datetime import datetime
 from typing import Any
 
 from mock import Mock, patch
 from pyhocon import ConfigFactory
 
 from databuilder import Scoped
-from databuilder.extractor.bigquery_usage_extractor import BigQueryTableUsageExtractor, TableColumnUsageTuple
+from databuilder.extractor.bigquery_usage_extractor import (
+    BigQueryTableUsageExtractor, TableColumnUsageTuple, TableUsageAggregator, TableUsageTuple,
+)
 
 CORRECT_DATA = {
     "entries": [{
@@ -348,3 +353,186 @@ class TestBigqueryUsageExtractor(unittest.TestCase):
         self.assertEqual(key.table, 'incidents_2008')
         self.assertEqual(key.email, 'your-user-here@test.com')
         self.assertEqual(value, 1)
+
+    @patch('databuilder.extractor.base_bigquery_extractor.build')
+    def test_aggregate_by_table(self, mock_build: Any) -> None:
+        config_dict = {
+            f'extractor.bigquery_table_usage.{BigQueryTableUsageExtractor.PROJECT_ID_KEY}': 'your-project-here',
+            f'extractor.bigquery_table_usage.{BigQueryTableUsageExtractor.AGGREGATE_BY_TABLE}': True,
+        }
+        conf = ConfigFactory.from_dict(config_dict)
+
+        mock_build.return_value = MockLoggingClient(CORRECT_DATA)
+        extractor = BigQueryTableUsageExtractor()
+        extractor.init(Scoped.get_scoped_conf(conf=conf,
+                                              scope=extractor.get_scope()))
+        result = extractor.extract()
+        assert result is not None
+
+        (key, value) = result
+        self.assertEqual(key, TableUsageTuple(database='bigquery',
+                                              cluster='bigquery-public-data',
+                                              schema='austin_incidents',
+                                              table='incidents_2008',
+                                              column='*'))
+        self.assertEqual(value, {'your-user-here@test.com': 1})
+        self.assertIsNone(extractor.extract())
+
+    @patch('databuilder.extractor.base_bigquery_extractor.build')
+    def test_time_slices(self, mock_build: Any) -> None:
+        """
+        Test that each time slice is scanned with its own filter, and their counts merged
+        """
+        config_dict = {
+            f'extractor.bigquery_table_usage.{BigQueryTableUsageExtractor.PROJECT_ID_KEY}': 'your-project-here',
+            f'extractor.bigquery_table_usage.{BigQueryTableUsageExtractor.TIMESTAMP_KEY}': '2019-01-01T00:00:00Z',
+            f'extractor.bigquery_table_usage.{BigQueryTableUsageExtractor.TIME_SLICES}': 3,
+        }
+        conf = ConfigFactory.from_dict(config_dict)
+
+        client = MockLoggingClient(CORRECT_DATA)
+        mock_build.return_value = client
+        extractor = BigQueryTableUsageExtractor()
+        with patch.object(BigQueryTableUsageExtractor, '_get_time_slices', return_value=[
+                ('2019-01-01T00:00:00Z', '2019-01-02T00:00:00Z'),
+                ('2019-01-02T00:00:00Z', '2019-01-03T00:00:00Z'),
+                ('2019-01-03T00:00:00Z', None)]):
+            extractor.init(Scoped.get_scoped_conf(conf=conf,
+                                                  scope=extractor.get_scope()))
+
+        filters = sorted(kwargs['body']['filter'].split('jobcompleted" AND ')[1]
+                         for _, kwargs in client.b.list.call_args_list)
+        self.assertEqual(filters, ['timestamp >= "2019-01-01T00:00:00Z" AND timestamp < "2019-01-02T00:00:00Z"',
+                                   'timestamp >= "2019-01-02T00:00:00Z" AND timestamp < "2019-01-03T00:00:00Z"',
+                                   'timestamp >= "2019-01-03T00:00:00Z"'])
+
+        result = extractor.extract()
+        assert result is not None
+        (key, value) = result
+        self.assertEqual(key.table, 'incidents_2008')
+        self.assertEqual(value, 3)
+
+    @patch('databuilder.extractor.base_bigquery_extractor.build')
+    def test_time_slices_resume(self, mock_build: Any) -> None:
+        """
+        Test that the saved counts of the scanned slices are merged without scanning them again
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            progress_directory = os.path.join(directory, 'progress')
+            config_dict = {
+                f'extractor.bigquery_table_usage.{BigQueryTableUsageExtractor.PROJECT_ID_KEY}': 'your-project-here',
+                f'extractor.bigquery_table_usage.{BigQueryTableUsageExtractor.TIMESTAMP_KEY}': '2019-01-01T00:00:00Z',
+                f'extractor.bigquery_table_usage.{BigQueryTableUsageExtractor.TIME_SLICES}': 2,
+                f'extractor.bigquery_table_usage.{BigQueryTableUsageExtractor.PROGRESS_DIRECTORY}': progress_directory,
+            }
+            conf = ConfigFactory.from_dict(config_dict)
+
+            os.makedirs(progress_directory)
+            with open(os.path.join(progress_directory, 'plan.json'), 'w') as f:
+                json.dump({'timestamp': '2019-01-01T00:00:00Z', 'time_slices': 2, 'end': '2019-01-03T00:00:00Z'}, f)
+            with open(os.path.join(progress_directory, 'slice_0.json'), 'w') as f:
+                f.write(json.dumps([['bigquery', 'bigquery-public-data', 'austin_incidents', 'incidents_2008', '*'],
+                                    {'your-user-here@test.com': 5}]) + '\n')
+
+            client = MockLoggingClient(CORRECT_DATA)
+            mock_build.return_value = client
+            extractor = BigQueryTableUsageExtractor()
+            extractor.init(Scoped.get_scoped_conf(conf=conf,
+                                                  scope=extractor.get_scope()))
+
+            self.assertEqual(client.b.list.call_count, 1)
+            args, kwargs = client.b.list.call_args
+            self.assertTrue(kwargs['body']['filter'].endswith('timestamp >= "2019-01-02T00:00:00Z"'))
+
+            result = extractor.extract()
+            assert result is not None
+            self.assertEqual(result[1], 6)
+            self.assertFalse(os.path.exists(progress_directory))
+
+    @patch('databuilder.extractor.base_bigquery_extractor.build')
+    def test_time_slices_spill(self, mock_build: Any) -> None:
+        """
+        Test that the counts of each time slice are spilled like the ones of the extractor, and the spill files removed
+        """
+        with tempfile.TemporaryDirectory() as spill_directory:
+            config_dict = {
+                f'extractor.bigquery_table_usage.{BigQueryTableUsageExtractor.PROJECT_ID_KEY}': 'your-project-here',
+                f'extractor.bigquery_table_usage.{BigQueryTableUsageExtractor.TIMESTAMP_KEY}': '2019-01-01T00:00:00Z',
+                f'extractor.bigquery_table_usage.{BigQueryTableUsageExtractor.TIME_SLICES}': 2,
+                f'extractor.bigquery_table_usage.{BigQueryTableUsageExtractor.SPILL_THRESHOLD}': 1,
+                f'extractor.bigquery_table_usage.{BigQueryTableUsageExtractor.SPILL_DIRECTORY}': spill_directory,
+            }
+            conf = ConfigFactory.from_dict(config_dict)
+
+            mock_build.return_value = MockLoggingClient(CORRECT_DATA)
+            extractor = BigQueryTableUsageExtractor()
+            with patch.object(TableUsageAggregator, '_spill', autospec=True,
+                              side_effect=TableUsageAggregator._spill) as mock_spill:
+                extractor.init(Scoped.get_scoped_conf(conf=conf,
+                                                      scope=extractor.get_scope()))
+
+            spilling_aggregators = {id(args[0]) for args, _ in mock_spill.call_args_list}
+            # the aggregator of each slice, and the one of the extractor
+            self.assertEqual(len(spilling_aggregators), 3)
+
+            result = extractor.extract()
+            assert result is not None
+            self.assertEqual(result[1], 2)
+            self.assertIsNone(extractor.extract())
+            self.assertEqual(os.listdir(spill_directory), [])
+
+    def test_parse_timestamp(self) -> None:
+        """
+        Test that RFC3339 timestamps with any offset, and dates, are parsed into naive UTC datetimes
+        """
+        for timestamp, expected in [
+                ('2019-01-01T00:00:00Z', datetime(2019, 1, 1)),
+                ('2019-01-01T00:00:00.250Z', datetime(2019, 1, 1, 0, 0, 0, 250000)),
+                ('2019-01-01T00:00:00+00:00', datetime(2019, 1, 1)),
+                ('2019-01-01T02:00:00+02:00', datetime(2019, 1, 1)),
+                ('2019-01-01', datetime(2019, 1, 1))]:
+            self.assertEqual(BigQueryTableUsageExtractor._parse_timestamp(timestamp), expected)
+
+    @patch('databuilder.extractor.base_bigquery_extractor.build')
+    def test_time_slices_timestamp_offset(self, mock_build: Any) -> None:
+        """
+        Test that the window of a timestamp with an offset is split into UTC slices
+        """
+        config_dict = {
+            f'extractor.bigquery_table_usage.{BigQueryTableUsageExtractor.PROJECT_ID_KEY}': 'your-project-here',
+            f'extractor.bigquery_table_usage.{BigQueryTableUsageExtractor.TIMESTAMP_KEY}': '2019-01-01T02:00:00+02:00',
+            f'extractor.bigquery_table_usage.{BigQueryTableUsageExtractor.TIME_SLICES}': 2,
+        }
+        conf = ConfigFactory.from_dict(config_dict)
+
+        mock_build.return_value = MockLoggingClient(CORRECT_DATA)
+        extractor = BigQueryTableUsageExtractor()
+        with patch('databuilder.extractor.bigquery_usage_extractor.datetime') as mock_datetime:
+            mock_datetime.utcnow.return_value = datetime(2019, 1, 3)
+            extractor.init(Scoped.get_scoped_conf(conf=conf,
+                                                  scope=extractor.get_scope()))
+
+            self.assertEqual(extractor._get_time_slices(), [('2019-01-01T02:00:00+02:00', '2019-01-02T00:00:00Z'),
+                                                            ('2019-01-02T00:00:00Z', None)])
+
+
+class TestTableUsageAggregator(unittest.TestCase):
+    def test_spilled_counts_are_merged(self) -> None:
+        """
+        Test that the counts spilled to disk are merged per table, and the spill files removed
+        """
+        table1 = TableUsageTuple(database='bigquery', cluster='project', schema='dataset', table='table1', column='*')
+        table2 = TableUsageTuple(database='bigquery', cluster='project', schema='dataset', table='table2', column='*')
+
+        with tempfile.TemporaryDirectory() as spill_directory:
+            aggregator = TableUsageAggregator(spill_threshold=2, spill_directory=spill_directory)
+            for key, email in [(table2, 'a@test.com'), (table1, 'a@test.com'), (table2, 'b@test.com'),
+                               (table2, 'a@test.com'), (table1, 'a@test.com')]:
+                aggregator.add(key, email)
+
+            self.assertEqual(len(os.listdir(os.path.join(spill_directory, os.listdir(spill_directory)[0]))), 2)
+            self.assertEqual(list(aggregator.items()), [
+                (table1, {'a@test.com': 2}),
+                (table2, {'a@test.com': 2, 'b@test.com': 1}),
+            ])
+            self.assertEqual(os.listdir(spill_directory), [])
@@ -115,6 +115,103 @@ class MyTestCase(unittest.TestCase):
         self.assertIsInstance(actual_obj, TableESDocument)
         self.assertDictEqual(vars(actual_obj), expected_dict)
 
+    @patch.object(mysql_search_data_extractor, '_table_search_query')
+    @patch.object(mysql_search_data_extractor, 'sessionmaker')
+    @patch.object(mysql_search_data_extractor, 'create_engine')
+    def test_table_search_keyset_pagination(self,
+                                            mock_create_engine: Any,
+                                            mock_session_maker: Any,
+                                            mock_table_search_query: Any) -> None:
+        """
+        Test that the tables are queried page by page from the rk of the previous page, until a page is not full
+        """
+        config_dict = {
+            f'extractor.mysql_search_data.{MySQLSearchDataExtractor.CONN_STRING}': 'test_conn_string',
+            f'extractor.mysql_search_data.{MySQLSearchDataExtractor.ENTITY_TYPE}': 'table',
+            f'extractor.mysql_search_data.{MySQLSearchDataExtractor.QUERY_LIMIT}': 2,
+            f'extractor.mysql_search_data.{MySQLSearchDataExtractor.KEYSET_PAGINATION}': True,
+        }
+        self.conf = ConfigFactory.from_dict(config_dict)
+
+        extractor = MySQLSearchDataExtractor()
+        extractor.init(Scoped.get_scoped_conf(conf=self.conf,
+                                              scope=extractor.get_scope()))
+
+        mock_table_search_query.side_effect = [[self._table('t1'), self._table('t2')], [self._table('t3')]]
+
+        # the first page is extracted before the next one is queried
+        result = extractor.extract()
+        assert result is not None
+        self.assertEqual(result['key'], 't1')
+        self.assertEqual(mock_table_search_query.call_count, 1)
+
+        results = [extractor.extract() for _ in range(2)]
+        self.assertEqual([result['key'] for result in results if result is not None], ['t2', 't3'])
+        self.assertIsNone(extractor.extract())
+        self.assertEqual(mock_table_search_query.call_count, 2)
+
+        first_filter = mock_table_search_query.call_args_list[0][0][1]
+        next_filter = mock_table_search_query.call_args_list[1][0][1]
+        self.assertEqual(first_filter, [])
+        self.assertEqual(str(next_filter[0].compile(compile_kwargs={'literal_binds': True})),
+                         "table_metadata.rk > 't2'")
+        self.assertEqual(mock_table_search_query.call_args_list[1][0][2:], (0, 2))
+
+    @patch.object(mysql_search_data_extractor, '_rk_ranges')
+    @patch.object(mysql_search_data_extractor, '_table_search_query')
+    @patch.object(mysql_search_data_extractor, 'sessionmaker')
+    @patch.object(mysql_search_data_extractor, 'create_engine')
+    def test_table_search_keyset_pagination_parallel(self,
+                                                     mock_create_engine: Any,
+                                                     mock_session_maker: Any,
+                                                     mock_table_search_query: Any,
+                                                     mock_rk_ranges: Any) -> None:
+        """
+        Test that the pages of each rk range are queried with the session of the range
+        """
+        config_dict = {
+            f'extractor.mysql_search_data.{MySQLSearchDataExtractor.CONN_STRING}': 'test_conn_string',
+            f'extractor.mysql_search_data.{MySQLSearchDataExtractor.ENTITY_TYPE}': 'table',
+            f'extractor.mysql_search_data.{MySQLSearchDataExtractor.QUERY_LIMIT}': 1,
+            f'extractor.mysql_search_data.{MySQLSearchDataExtractor.KEYSET_PAGINATION}': True,
+            f'extractor.mysql_search_data.{MySQLSearchDataExtractor.QUERY_PARALLELISM}': 2,
+        }
+        self.conf = ConfigFactory.from_dict(config_dict)
+
+        range_session, first_session, second_session = MagicMock(), MagicMock(), MagicMock()
+        mock_session_maker.return_value.side_effect = [range_session, first_session, second_session]
+        mock_rk_ranges.return_value = [(None, 't2'), ('t2', None)]
+        pages = {
+            first_session: iter([[self._table('t1')], [self._table('t2')], []]),
+            second_session: iter([[self._table('t3')], []]),
+        }
+        mock_table_search_query.side_effect = lambda session, query_filter, offset, limit: next(pages[session])
+
+        extractor = MySQLSearchDataExtractor()
+        extractor.init(Scoped.get_scoped_conf(conf=self.conf,
+                                              scope=extractor.get_scope()))
+
+        keys = []
+        result = extractor.extract()
+        while result:
+            keys.append(result['key'])
+            result = extractor.extract()
+
+        self.assertEqual(sorted(keys), ['t1', 't2', 't3'])
+        mock_rk_ranges.assert_called_once_with(range_session, mysql_search_data_extractor.Table.rk, [], 2)
+        for session in [range_session, first_session, second_session]:
+            session.close.assert_called_once()
+
+    @staticmethod
+    def _table(rk: str) -> Table:
+        cluster = Cluster(rk='test_cluster_key', name='test_cluster')
+        cluster.database = Database(rk='test_database_key', name='test_database')
+        schema = Schema(rk='test_schema_key', name='test_schema')
+        schema.cluster = cluster
+        table = Table(rk=rk, name=rk)
+        table.schema = schema
+        return table
+
     @patch.object(mysql_search_data_extractor, '_user_search_query')
     @patch.object(mysql_search_data_extractor, 'sessionmaker')
     @patch.object(mysql_search_data_extractor, 'create_engine')
@@ -2,9 +2,11 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import unittest
-from typing import Any
+from typing import (
+    Any, Dict, List,
+)
 
-from mock import patch
+from mock import MagicMock, patch
 from pyhocon import ConfigFactory
 
 from databuilder import Scoped
@@ -120,3 +122,84 @@ class TestNeo4jExtractor(unittest.TestCase):
 
             self.assertIsInstance(result_obj, TableESDocument)
             self.assertDictEqual(vars(result_obj), result_dict)
+
+    def _mock_pages(self, extractor: Neo4jExtractor, keys: List[str]) -> MagicMock:
+        """
+        Serve the records of the given keys page by page, the way a keyset paginated query does
+        """
+        def run(query: str, last_key: str, page_size: int) -> List[Dict[str, str]]:
+            return [{'key': key} for key in keys if key > last_key][:page_size]
+
+        mock_tx = MagicMock()
+        mock_tx.run.side_effect = run
+        mock_session = extractor.driver.session.return_value.__enter__.return_value
+        mock_session.read_transaction.side_effect = lambda fn, *args: fn(mock_tx, *args)
+        return mock_tx
+
+    def _extract_all(self, extractor: Neo4jExtractor) -> List[Any]:
+        results = []
+        result = extractor.extract()
+        while result:
+            results.append(result)
+            result = extractor.extract()
+        return results
+
+    def test_extraction_with_pagination(self: Any) -> None:
+        """
+        Test Extraction with keyset pagination, with and without prefetching the next page
+        """
+        keys = ['a', 'b', 'c', 'd', 'e']
+        for prefetch in (False, True):
+            conf = ConfigFactory.from_dict({
+                f'extractor.neo4j.{Neo4jExtractor.PAGE_SIZE}': 2,
+                f'extractor.neo4j.{Neo4jExtractor.PREFETCH_PAGE}': prefetch,
+            }).with_fallback(self.conf)
+            with patch.object(Neo4jExtractor, '_get_driver', return_value=MagicMock()):
+                extractor = Neo4jExtractor()
+                extractor.init(Scoped.get_scoped_conf(conf=conf, scope=extractor.get_scope()))
+                mock_tx = self._mock_pages(extractor, keys)
+
+                self.assertEqual(self._extract_all(extractor), [{'key': key} for key in keys])
+                self.assertEqual([call[1]['last_key'] for call in mock_tx.run.call_args_list], ['', 'b', 'd'])
+                self.assertEqual(extractor.last_key, 'e')
+
+    def test_extraction_with_pagination_resumed(self: Any) -> None:
+        """
+        Test Extraction with keyset pagination starting after a given key
+        """
+        conf = ConfigFactory.from_dict({
+            f'extractor.neo4j.{Neo4jExtractor.PAGE_SIZE}': 2,
+            f'extractor.neo4j.{Neo4jExtractor.START_KEY}': 'c',
+        }).with_fallback(self.conf)
+        with patch.object(Neo4jExtractor, '_get_driver', return_value=MagicMock()):
+            extractor = Neo4jExtractor()
+            extractor.init(Scoped.get_scoped_conf(conf=conf, scope=extractor.get_scope()))
+            self._mock_pages(extractor, ['a', 'b', 'c', 'd', 'e', 'f'])
+
+            self.assertEqual(self._extract_all(extractor), [{'key': 'd'}, {'key': 'e'}, {'key': 'f'}])
+
+    def test_extraction_with_pagination_failure(self: Any) -> None:
+        """
+        Test the last emitted key is kept when fetching a page fails, so that the extraction can resume from it
+        """
+        conf = ConfigFactory.from_dict({
+            f'extractor.neo4j.{Neo4jExtractor.PAGE_SIZE}': 2,
+        }).with_fallback(self.conf)
+        with patch.object(Neo4jExtractor, '_get_driver', return_value=MagicMock()):
+            extractor = Neo4jExtractor()
+            extractor.init(Scoped.get_scoped_conf(conf=conf, scope=extractor.get_scope()))
+            mock_tx = self._mock_pages(extractor, ['a', 'b', 'c', 'd', 'e'])
+            run_page = mock_tx.run.side_effect
+
+            def run(query: str, last_key: str, page_size: int) -> List[Dict[str, str]]:
+                if last_key >= 'b':
+                    raise RuntimeError('timeout')
+                return run_page(query, last_key, page_size)
+
+            mock_tx.run.side_effect = run
+
+            self.assertEqual(extractor.extract(), {'key': 'a'})
+            self.assertEqual(extractor.extract(), {'key': 'b'})
+            with self.assertRaises(RuntimeError):
+                extractor.extract()
+            self.assertEqual(extractor.last_key, 'b')
@@ -58,6 +58,24 @@ class TestNeo4jExtractor(unittest.TestCase):
                              Neo4jSearchDataExtractor.DEFAULT_NEO4J_DASHBOARD_CYPHER_QUERY.format
                              (publish_tag_filter="""WHERE dashboard.published_tag = 'test-date'"""))
 
+    def test_paginated_search_query(self: Any) -> None:
+        with patch.object(Neo4jExtractor, '_get_driver'):
+            extractor = Neo4jSearchDataExtractor()
+            conf = ConfigFactory.from_dict({
+                f'extractor.search_data.extractor.neo4j.{Neo4jExtractor.GRAPH_URL_CONFIG_KEY}': 'test-endpoint',
+                f'extractor.search_data.extractor.neo4j.{Neo4jExtractor.NEO4J_AUTH_USER}': 'test-user',
+                f'extractor.search_data.extractor.neo4j.{Neo4jExtractor.NEO4J_AUTH_PW}': 'test-passwd',
+                f'extractor.search_data.extractor.neo4j.{Neo4jExtractor.PAGE_SIZE}': 500,
+                f'extractor.search_data.{Neo4jSearchDataExtractor.ENTITY_TYPE}': 'dashboard',
+            })
+            extractor.init(Scoped.get_scoped_conf(conf=conf,
+                                                  scope=extractor.get_scope()))
+
+            self.assertEqual(extractor.cypher_query, Neo4jSearchDataExtractor
+                             .DEFAULT_NEO4J_PAGINATED_DASHBOARD_CYPHER_QUERY.format(publish_tag_filter=''))
+            self.assertEqual(extractor.neo4j_extractor.page_size, 500)
+            self.assertEqual(extractor.neo4j_extractor.pagination_key, 'uri')
+
 
 if __name__ == '__main__':
     unittest.main()
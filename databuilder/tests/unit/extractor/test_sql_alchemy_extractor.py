@@ -4,7 +4,7 @@
 import unittest
 from typing import Any, Dict
 
-from mock import patch
+from mock import MagicMock, patch
 from pyhocon import ConfigFactory
 
 from databuilder import Scoped
@@ -94,6 +94,49 @@ class TestSqlAlchemyExtractor(unittest.TestCase):
         self.assertIsInstance(result, TableMetadataResult)
         self.assertEqual(result.name, 'test_table')
 
+    @patch.object(SQLAlchemyExtractor, '_get_connection')
+    def test_extraction_with_fetch_size(self: Any, mock_method: Any) -> None:
+        """
+        Test Extraction streams results fetch_size rows at a time, converting them to model class lazily
+        """
+        config_dict = {
+            'extractor.sqlalchemy.conn_string': 'TEST_CONNECTION',
+            'extractor.sqlalchemy.extract_sql': 'SELECT 1 FROM TEST_TABLE;',
+            'extractor.sqlalchemy.fetch_size': 2,
+            'extractor.sqlalchemy.model_class':
+                'tests.unit.extractor.test_sql_alchemy_extractor.TableMetadataResult'
+        }
+        self.conf = ConfigFactory.from_dict(config_dict)
+        rows = [dict(database='test_database',
+                     schema='test_schema',
+                     name=f'test_table{i}',
+                     description='test_description',
+                     column_name='test_column_name',
+                     column_type='test_column_type',
+                     column_comment='test_column_comment',
+                     owner='test_owner') for i in range(3)]
+        # A row that can't be converted to the model class, which should not fail before it's extracted
+        rows.append(dict(unknown_column='test'))
+
+        mock_results = MagicMock()
+        mock_results.fetchmany.side_effect = [rows[:2], rows[2:], []]
+        mock_connection = mock_method.return_value
+        mock_connection.execution_options.return_value.execute.return_value = mock_results
+
+        extractor = SQLAlchemyExtractor()
+        extractor.init(Scoped.get_scoped_conf(conf=self.conf,
+                                              scope=extractor.get_scope()))
+
+        mock_connection.execution_options.assert_called_with(stream_results=True)
+        mock_results.fetchmany.assert_not_called()
+
+        self.assertEqual(extractor.extract().name, 'test_table0')
+        mock_results.fetchmany.assert_called_once_with(2)
+        self.assertEqual(extractor.extract().name, 'test_table1')
+        self.assertEqual(extractor.extract().name, 'test_table2')
+        with self.assertRaises(TypeError):
+            extractor.extract()
+
     @patch('databuilder.extractor.sql_alchemy_extractor.create_engine')
     def test_get_connection(self: Any, mock_method: Any) -> None:
         """
@@ -1,6 +1,7 @@
 # Copyright Contributors to the Amundsen project.
 # SPDX-License-Identifier: Apache-2.0
 
+import gzip
 import json
 import shutil
 import tempfile
@@ -159,3 +160,50 @@ class TestFSElasticsearchJSONLoader(unittest.TestCase):
         ] * 5
 
         self._check_results_helper(expected=expected)
+
+    def _table_document(self, name: str) -> TableESDocument:
+        return TableESDocument(database='test_database', cluster='test_cluster', schema='test_schema', name=name,
+                               key=name, last_updated_timestamp=123456789, description='test_description',
+                               column_names=[], column_descriptions=[], total_usage=10, unique_usage=5, tags=[])
+
+    def test_loading_with_flush_thresholds(self) -> None:
+        """
+        Test that the records are written to file once the buffer reaches the flush thresholds, and on close
+        """
+        conf = ConfigFactory.from_dict({FSElasticsearchJSONLoader.FILE_PATH_CONFIG_KEY: self.dest_file_name,
+                                        FSElasticsearchJSONLoader.FLUSH_RECORD_COUNT_CONFIG_KEY: 2})
+        loader = FSElasticsearchJSONLoader()
+        loader.init(conf=conf)
+
+        for name in ['table1', 'table2', 'table3']:
+            loader.load(self._table_document(name))
+        with open(self.dest_file_name) as file:
+            self.assertEqual([json.loads(line)['name'] for line in file], ['table1', 'table2'])
+
+        loader.close()
+        with open(self.dest_file_name) as file:
+            self.assertEqual([json.loads(line)['name'] for line in file], ['table1', 'table2', 'table3'])
+
+        conf = ConfigFactory.from_dict({FSElasticsearchJSONLoader.FILE_PATH_CONFIG_KEY: self.dest_file_name,
+                                        FSElasticsearchJSONLoader.FLUSH_BUFFER_SIZE_CONFIG_KEY: 1})
+        loader = FSElasticsearchJSONLoader()
+        loader.init(conf=conf)
+        loader.load(self._table_document('table1'))
+        with open(self.dest_file_name) as file:
+            self.assertEqual([json.loads(line)['name'] for line in file], ['table1'])
+        loader.close()
+
+    def test_loading_with_gzip(self) -> None:
+        """
+        Test that the file is gzip compressed if its path ends with .gz
+        """
+        dest_file_name = f'{self.temp_dir_path}/test_file.json.gz'
+        loader = FSElasticsearchJSONLoader()
+        loader.init(conf=ConfigFactory.from_dict({FSElasticsearchJSONLoader.FILE_PATH_CONFIG_KEY: dest_file_name}))
+
+        for name in ['table1', 'table2']:
+            loader.load(self._table_document(name))
+        loader.close()
+
+        with gzip.open(dest_file_name, 'rt') as file:
+            self.assertEqual([json.loads(line)['name'] for line in file], ['table1', 'table2'])
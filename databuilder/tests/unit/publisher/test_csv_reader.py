@@ -0,0 +1,77 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+import tempfile
+import unittest
+
+import pandas
+
+from databuilder.publisher.csv_reader import read_csv_records, read_first_csv_record
+
+here = os.path.dirname(__file__)
+
+
+class TestCsvReader(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self._node_file = os.path.join(here, '../resources/csv_publisher/nodes/test_column.csv')
+
+    def test_read_csv_records(self) -> None:
+        with open(self._node_file, 'r', encoding='utf8') as node_csv:
+            expected = pandas.read_csv(node_csv, na_filter=False).to_dict(orient='records')
+
+        self.assertEqual(list(read_csv_records(self._node_file)), expected)
+        self.assertEqual(list(read_csv_records(self._node_file, chunk_size=1)), expected)
+
+    def test_read_csv_records_types_over_chunks(self) -> None:
+        """
+        Test that a column is converted with the type inferred over all chunks, when its values only change type after
+        the first chunk
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, 'nodes.csv')
+            with open(file_path, 'w', encoding='utf8') as csv_file:
+                csv_file.write('KEY,name,count:UNQUOTED,ratio:UNQUOTED,is_view:UNQUOTED\n'
+                               '1,1,1,1,True\n'
+                               '2,2,2,2,False\n'
+                               '3,three,3,3.5,True\n'
+                               '4,four,4,4.5,False\n')
+
+            with open(file_path, 'r', encoding='utf8') as csv_file:
+                expected = pandas.read_csv(csv_file, na_filter=False).to_dict(orient='records')
+
+            records = list(read_csv_records(file_path, chunk_size=2))
+
+        self.assertEqual(records, expected)
+        self.assertEqual([type(record['name']) for record in records], [str, str, str, str])
+        self.assertEqual([type(record['count:UNQUOTED']) for record in records], [int, int, int, int])
+        self.assertEqual([type(record['ratio:UNQUOTED']) for record in records], [float, float, float, float])
+        self.assertEqual([type(record['is_view:UNQUOTED']) for record in records], [bool, bool, bool, bool])
+
+    def test_read_csv_records_int_float_int_chunks(self) -> None:
+        """
+        Test that a column is float when its chunks are inferred as int, then float, then int again
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, 'nodes.csv')
+            with open(file_path, 'w', encoding='utf8') as csv_file:
+                csv_file.write('KEY,v\n1,1\n2,2\n3,3.5\n4,4.5\n5,5\n6,6\n')
+
+            records = list(read_csv_records(file_path, chunk_size=2))
+
+        self.assertEqual([record['v'] for record in records], [1.0, 2.0, 3.5, 4.5, 5.0, 6.0])
+        self.assertEqual({type(record['v']) for record in records}, {float})
+
+    def test_read_first_csv_record(self) -> None:
+        record = read_first_csv_record(self._node_file)
+
+        self.assertEqual(record, {'KEY': 'presto://gold.test_schema1/test_table1/test_id1',
+                                  'name': 'test_id1',
+                                  'order_pos:UNQUOTED': 1,
+                                  'type': 'bigint',
+                                  'LABEL': 'Column'})
+
+
+if __name__ == '__main__':
+    unittest.main()
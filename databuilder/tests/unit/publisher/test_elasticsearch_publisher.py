@@ -1,13 +1,20 @@
 # Copyright Contributors to the Amundsen project.
 # SPDX-License-Identifier: Apache-2.0
 
+import gzip
 import json
+import os
+import shutil
+import tempfile
 import unittest
+from typing import (
+    Any, Dict, List,
+)
 
 from mock import (
     MagicMock, mock_open, patch,
 )
-from pyhocon import ConfigFactory
+from pyhocon import ConfigFactory, ConfigTree
 
 from databuilder import Scoped
 from databuilder.publisher.elasticsearch_publisher import ElasticsearchPublisher
@@ -115,3 +122,184 @@ class TestElasticsearchPublisher(unittest.TestCase):
                 {'actions': [{"add": {"index": self.test_es_new_index, "alias": self.test_es_alias}},
                              {"remove_index": {"index": 'test_old_index'}}]}
             )
+
+    def _incremental_conf(self) -> ConfigTree:
+        self.conf.put(f'publisher.elasticsearch.{ElasticsearchPublisher.ELASTICSEARCH_INCREMENTAL_CONFIG_KEY}', True)
+        return self.conf
+
+    def test_publish_incremental_with_changed_documents(self) -> None:
+        """
+        Test incremental Publish only indexes new and changed documents, and deletes removed documents
+        """
+        documents = [{'key': 'unchanged', 'description': 'foo'},
+                     {'key': 'changed', 'description': 'new'},
+                     {'key': 'new', 'description': 'bar'}]
+        mock_data = '\n'.join(json.dumps(doc) for doc in documents)
+        live_documents = [{'_id': 'unchanged', '_source': {'description': 'foo', 'key': 'unchanged'}},
+                          {'_id': 'changed', '_source': {'key': 'changed', 'description': 'old'}},
+                          {'_id': 'removed', '_source': {'key': 'removed', 'description': 'baz'}}]
+        self.mock_es_client.indices.get_alias.return_value = {'test_old_index': 'DOES_NOT_MATTER'}
+
+        with patch('builtins.open', mock_open(read_data=mock_data)), \
+                patch('databuilder.publisher.elasticsearch_publisher.scan', return_value=live_documents) as mock_scan:
+            publisher = ElasticsearchPublisher()
+            publisher.init(conf=Scoped.get_scoped_conf(conf=self._incremental_conf(),
+                                                       scope=publisher.get_scope()))
+            mapping_hash = publisher._get_mapping_hash()
+            self.mock_es_client.indices.get_mapping.return_value = {'test_old_index': {'mappings': {
+                self.test_doc_type: {'_meta': {ElasticsearchPublisher.MAPPING_HASH_META_KEY: mapping_hash}}
+            }}}
+
+            publisher.publish()
+
+            self.assertEqual(mock_scan.call_args[1]['index'], 'test_old_index')
+            self.mock_es_client.indices.create.assert_not_called()
+            self.mock_es_client.indices.update_aliases.assert_not_called()
+            self.mock_es_client.bulk.assert_called_once_with(
+                [{'index': {'_type': self.test_doc_type, '_index': 'test_old_index', '_id': 'changed'}},
+                 {'key': 'changed', 'description': 'new'},
+                 {'index': {'_type': self.test_doc_type, '_index': 'test_old_index', '_id': 'new'}},
+                 {'key': 'new', 'description': 'bar'},
+                 {'delete': {'_type': self.test_doc_type, '_index': 'test_old_index', '_id': 'removed'}}]
+            )
+
+    def test_publish_incremental_with_changed_mapping(self) -> None:
+        """
+        Test incremental Publish rebuilds the index when the mapping has changed
+        """
+        mock_data = json.dumps({'key': 'table_key', 'description': 'foo'})
+        self.mock_es_client.indices.get_alias.return_value = {'test_old_index': 'DOES_NOT_MATTER'}
+        self.mock_es_client.indices.get_mapping.return_value = {'test_old_index': {'mappings': {
+            self.test_doc_type: {'_meta': {ElasticsearchPublisher.MAPPING_HASH_META_KEY: 'outdated_hash'}}
+        }}}
+
+        with patch('builtins.open', mock_open(read_data=mock_data)), \
+                patch('databuilder.publisher.elasticsearch_publisher.scan') as mock_scan:
+            publisher = ElasticsearchPublisher()
+            publisher.init(conf=Scoped.get_scoped_conf(conf=self._incremental_conf(),
+                                                       scope=publisher.get_scope()))
+            publisher.publish()
+
+            mock_scan.assert_not_called()
+            # the new index is created with the hash of its mapping
+            mapping = self.mock_es_client.indices.create.call_args[1]['body']
+            self.assertEqual(mapping['mappings']['table']['_meta'][ElasticsearchPublisher.MAPPING_HASH_META_KEY],
+                             publisher._get_mapping_hash())
+            self.mock_es_client.bulk.assert_called_once_with(
+                [{'index': {'_type': self.test_doc_type, '_index': self.test_es_new_index, '_id': 'table_key'}},
+                 {'key': 'table_key', 'description': 'foo'}]
+            )
+            self.mock_es_client.indices.update_aliases.assert_called_once_with(
+                {'actions': [{"add": {"index": self.test_es_new_index, "alias": self.test_es_alias}},
+                             {"remove_index": {"index": 'test_old_index'}}]}
+            )
+
+    def test_publish_gzip_file(self) -> None:
+        """
+        Test that a JSON file whose path ends with .gz is read as gzip compressed
+        """
+        temp_dir_path = tempfile.mkdtemp()
+        try:
+            file_path = os.path.join(temp_dir_path, 'test_publisher_file.json.gz')
+            with gzip.open(file_path, 'wt') as file:
+                file.write(json.dumps({'key': 'table1'}) + '\n')
+            self.mock_es_client.indices.get_alias.return_value = {}
+
+            publisher = ElasticsearchPublisher()
+            conf = Scoped.get_scoped_conf(conf=self.conf, scope=publisher.get_scope())
+            conf.put(ElasticsearchPublisher.FILE_PATH_CONFIG_KEY, file_path)
+            publisher.init(conf=conf)
+            publisher.publish()
+
+            self.mock_es_client.bulk.assert_called_once_with(
+                [{'index': {'_type': self.test_doc_type, '_index': self.test_es_new_index}}, {'key': 'table1'}])
+        finally:
+            shutil.rmtree(temp_dir_path)
+
+    def _publisher(self, **conf: Any) -> ElasticsearchPublisher:
+        for key, value in conf.items():
+            self.conf.put(f'publisher.elasticsearch.{key}', value)
+        publisher = ElasticsearchPublisher()
+        publisher.init(conf=Scoped.get_scoped_conf(conf=self.conf, scope=publisher.get_scope()))
+        return publisher
+
+    def _index_rows(self, *keys: str) -> List[Dict[str, Any]]:
+        rows: List[Dict[str, Any]] = []
+        for key in keys:
+            rows.extend([{'index': {'_type': self.test_doc_type, '_index': self.test_es_new_index}}, {'key': key}])
+        return rows
+
+    def test_publish_batches_by_bytes_concurrently(self) -> None:
+        """
+        Test that the bulk requests are limited to batch_bytes, and sent concurrently
+        """
+        mock_data = '\n'.join(json.dumps({'key': f'table{i}'}) for i in range(5))
+        self.mock_es_client.indices.get_alias.return_value = {}
+        self.mock_es_client.bulk.return_value = {'errors': False}
+
+        with patch('builtins.open', mock_open(read_data=mock_data)):
+            # an action line and a document line fit in 100 bytes, but not two of them
+            self._publisher(batch_bytes=100, bulk_concurrency=2).publish()
+
+        self.assertEqual(sorted(call[0][0][1]['key'] for call in self.mock_es_client.bulk.call_args_list),
+                         [f'table{i}' for i in range(5)])
+
+    def test_publish_retries_rejected_documents(self) -> None:
+        """
+        Test that the documents rejected with 429 are retried with backoff
+        """
+        mock_data = '\n'.join(json.dumps({'key': key}) for key in ['table1', 'table2'])
+        self.mock_es_client.indices.get_alias.return_value = {}
+        self.mock_es_client.bulk.side_effect = [
+            {'errors': True, 'items': [{'index': {'status': 429}}, {'index': {'status': 201}}]},
+            {'errors': True, 'items': [{'index': {'status': 429}}]},
+            {'errors': False, 'items': [{'index': {'status': 201}}]},
+        ]
+
+        with patch('builtins.open', mock_open(read_data=mock_data)), \
+                patch('databuilder.publisher.elasticsearch_publisher.time.sleep') as mock_sleep:
+            self._publisher(bulk_initial_backoff=1).publish()
+
+        self.assertEqual([call[0][0] for call in self.mock_es_client.bulk.call_args_list],
+                         [self._index_rows('table1', 'table2'), self._index_rows('table1'),
+                          self._index_rows('table1')])
+        self.assertEqual([call[0][0] for call in mock_sleep.call_args_list], [1, 2])
+        self.mock_es_client.indices.update_aliases.assert_called_once()
+
+    def test_publish_failed_documents(self) -> None:
+        """
+        Test that the alias is not swapped to the new index if some documents could not be indexed
+        """
+        mock_data = '\n'.join(json.dumps({'key': key}) for key in ['table1', 'table2'])
+        self.mock_es_client.indices.get_alias.return_value = {}
+        self.mock_es_client.bulk.return_value = {
+            'errors': True, 'items': [{'index': {'status': 201}}, {'index': {'status': 400, 'error': 'mapping'}}]}
+
+        with patch('builtins.open', mock_open(read_data=mock_data)):
+            publisher = self._publisher()
+            with self.assertRaises(Exception) as context:
+                publisher.publish()
+
+        self.assertIn('Failed to publish 1 of 2 actions', str(context.exception))
+        self.mock_es_client.indices.update_aliases.assert_not_called()
+        # the partially loaded index is not left behind with its refresh disabled
+        self.mock_es_client.indices.delete.assert_called_once_with(index=self.test_es_new_index)
+
+    def test_publish_disables_refresh_during_load(self) -> None:
+        """
+        Test that the refresh and the replicas of the new index are disabled while it's loaded
+        """
+        self.mock_es_client.indices.get_alias.return_value = {}
+        self.mock_es_client.indices.get_settings.return_value = {
+            self.test_es_new_index: {'settings': {'index': {'number_of_replicas': '2'}}}}
+        self.mock_es_client.bulk.return_value = {'errors': False}
+
+        with patch('builtins.open', mock_open(read_data=json.dumps({'key': 'table1'}))):
+            self._publisher().publish()
+
+        self.assertEqual([call[1] for call in self.mock_es_client.indices.put_settings.call_args_list], [
+            {'index': self.test_es_new_index, 'body': {'index': {'refresh_interval': '-1', 'number_of_replicas': 0}}},
+            {'index': self.test_es_new_index,
+             'body': {'index': {'refresh_interval': None, 'number_of_replicas': '2'}}},
+        ])
+        self.mock_es_client.indices.refresh.assert_called_once_with(index=self.test_es_new_index)
@@ -8,6 +8,7 @@ import uuid
 
 from mock import MagicMock, patch
 from neo4j import GraphDatabase
+from neo4j.exceptions import TransientError
 from pyhocon import ConfigFactory
 
 from databuilder.publisher import neo4j_csv_publisher
@@ -89,6 +90,204 @@ class TestPublish(unittest.TestCase):
             # 2 node files, 1 relation file
             self.assertEqual(mock_commit.call_count, 1)
 
+    def test_publisher_unwind_batch(self) -> None:
+        with patch.object(GraphDatabase, 'driver') as mock_driver:
+            mock_session = MagicMock()
+            mock_driver.return_value.session.return_value = mock_session
+
+            mock_transaction = MagicMock()
+            mock_session.begin_transaction.return_value = mock_transaction
+
+            mock_run = MagicMock()
+            mock_transaction.run = mock_run
+            mock_run.return_value.single.return_value = [2]
+            mock_commit = MagicMock()
+            mock_transaction.commit = mock_commit
+
+            publisher = Neo4jCsvPublisher()
+
+            conf = ConfigFactory.from_dict(
+                {neo4j_csv_publisher.NEO4J_END_POINT_KEY: 'dummy://999.999.999.999:7687/',
+                 neo4j_csv_publisher.NODE_FILES_DIR: f'{self._resource_path}/nodes',
+                 neo4j_csv_publisher.RELATION_FILES_DIR: f'{self._resource_path}/relations',
+                 neo4j_csv_publisher.NEO4J_USER: 'neo4j_user',
+                 neo4j_csv_publisher.NEO4J_PASSWORD: 'neo4j_password',
+                 neo4j_csv_publisher.NEO4J_UNWIND_BATCH_SIZE: 100,
+                 neo4j_csv_publisher.NEO4J_RELATIONSHIP_CREATION_CONFIRM: True,
+                 neo4j_csv_publisher.JOB_PUBLISH_TAG: str(uuid.uuid4())}
+            )
+            publisher.init(conf)
+            publisher.publish()
+
+            # one UNWIND statement per node file and per relation file
+            self.assertEqual(mock_run.call_count, 3)
+            for call in mock_run.call_args_list:
+                self.assertIn(b'UNWIND $batch AS row', call[0][0])
+                self.assertEqual(len(call[1]['parameters']['batch']), 2)
+
+            self.assertEqual(mock_commit.call_count, 1)
+
+    def test_publisher_unwind_batch_deadlock_retry(self) -> None:
+        with patch.object(GraphDatabase, 'driver') as mock_driver, \
+                patch.object(neo4j_csv_publisher.time, 'sleep'):
+            mock_session = MagicMock()
+            mock_driver.return_value.session.return_value = mock_session
+
+            transactions = [MagicMock() for _ in range(3)]
+            for transaction in transactions:
+                transaction.closed.return_value = False
+                transaction.run.return_value.single.return_value = [2]
+            # the relation batch fails with a deadlock in its first transaction
+            transactions[1].run.side_effect = TransientError('deadlock')
+            mock_session.begin_transaction.side_effect = transactions
+
+            publisher = Neo4jCsvPublisher()
+
+            conf = ConfigFactory.from_dict(
+                {neo4j_csv_publisher.NEO4J_END_POINT_KEY: 'dummy://999.999.999.999:7687/',
+                 neo4j_csv_publisher.NODE_FILES_DIR: f'{self._resource_path}/nodes',
+                 neo4j_csv_publisher.RELATION_FILES_DIR: f'{self._resource_path}/relations',
+                 neo4j_csv_publisher.NEO4J_USER: 'neo4j_user',
+                 neo4j_csv_publisher.NEO4J_PASSWORD: 'neo4j_password',
+                 neo4j_csv_publisher.NEO4J_UNWIND_BATCH_SIZE: 100,
+                 neo4j_csv_publisher.NEO4J_RELATIONSHIP_CREATION_CONFIRM: True,
+                 neo4j_csv_publisher.NEO4J_DEADLOCK_NODE_LABELS: ['Table'],
+                 neo4j_csv_publisher.JOB_PUBLISH_TAG: str(uuid.uuid4())}
+            )
+            publisher.init(conf)
+            publisher.publish()
+
+            # the node batches are committed before the relation batch, which is retried in a new transaction
+            self.assertEqual(transactions[0].run.call_count, 2)
+            transactions[0].commit.assert_called_once()
+            transactions[1].rollback.assert_called_once()
+            transactions[1].commit.assert_not_called()
+            self.assertEqual(transactions[2].run.call_count, 1)
+            transactions[2].commit.assert_called_once()
+
+    def test_create_node_merge_batch_statement(self) -> None:
+        with patch.object(GraphDatabase, 'driver'):
+            publisher = Neo4jCsvPublisher()
+            conf = ConfigFactory.from_dict(
+                {neo4j_csv_publisher.NEO4J_END_POINT_KEY: 'dummy://999.999.999.999:7687/',
+                 neo4j_csv_publisher.NEO4J_USER: 'neo4j_user',
+                 neo4j_csv_publisher.NEO4J_PASSWORD: 'neo4j_password',
+                 neo4j_csv_publisher.NEO4J_CREATE_ONLY_NODES: ['Column'],
+                 neo4j_csv_publisher.JOB_PUBLISH_TAG: 'unit_test'}
+            )
+            publisher.init(conf)
+
+            stmt = publisher.create_node_merge_batch_statement(
+                {'KEY': 'foo', 'LABEL': 'Column', 'name': 'bar', 'order_pos:UNQUOTED': 1})
+            self.assertIn('MERGE (node:Column {key: row.KEY})', stmt)
+            self.assertIn('node.name = row.name', stmt)
+            self.assertIn('node.order_pos = row.order_pos', stmt)
+            self.assertNotIn('ON MATCH SET', stmt)
+
+    def test_publisher_parallel(self) -> None:
+        with patch.object(GraphDatabase, 'driver') as mock_driver:
+            mock_session = MagicMock()
+            mock_driver.return_value.session.return_value = mock_session
+
+            mock_transaction = MagicMock()
+            mock_session.begin_transaction.return_value = mock_transaction
+
+            mock_run = MagicMock()
+            mock_transaction.run = mock_run
+            mock_commit = MagicMock()
+            mock_transaction.commit = mock_commit
+
+            publisher = Neo4jCsvPublisher()
+
+            conf = ConfigFactory.from_dict(
+                {neo4j_csv_publisher.NEO4J_END_POINT_KEY: 'dummy://999.999.999.999:7687/',
+                 neo4j_csv_publisher.NODE_FILES_DIR: f'{self._resource_path}/nodes',
+                 neo4j_csv_publisher.RELATION_FILES_DIR: f'{self._resource_path}/relations',
+                 neo4j_csv_publisher.NEO4J_USER: 'neo4j_user',
+                 neo4j_csv_publisher.NEO4J_PASSWORD: 'neo4j_password',
+                 neo4j_csv_publisher.NEO4J_PUBLISH_WORKERS: 3,
+                 neo4j_csv_publisher.JOB_PUBLISH_TAG: str(uuid.uuid4())}
+            )
+            publisher.init(conf)
+            publisher.publish()
+
+            self.assertEqual(mock_run.call_count, 6)
+
+            # 2 node partitions (Table, Column), 1 relation partition, each committed by its own worker
+            self.assertEqual(mock_commit.call_count, 3)
+            self.assertEqual(publisher._count, 6)
+
+    def test_publisher_parallel_failure(self) -> None:
+        with patch.object(GraphDatabase, 'driver') as mock_driver:
+            mock_session = MagicMock()
+            mock_driver.return_value.session.return_value = mock_session
+
+            mock_transaction = MagicMock()
+            mock_transaction.closed.return_value = False
+            mock_session.begin_transaction.return_value = mock_transaction
+            mock_transaction.run.side_effect = RuntimeError('boom')
+
+            publisher = Neo4jCsvPublisher()
+
+            conf = ConfigFactory.from_dict(
+                {neo4j_csv_publisher.NEO4J_END_POINT_KEY: 'dummy://999.999.999.999:7687/',
+                 neo4j_csv_publisher.NODE_FILES_DIR: f'{self._resource_path}/nodes',
+                 neo4j_csv_publisher.RELATION_FILES_DIR: f'{self._resource_path}/relations',
+                 neo4j_csv_publisher.NEO4J_USER: 'neo4j_user',
+                 neo4j_csv_publisher.NEO4J_PASSWORD: 'neo4j_password',
+                 neo4j_csv_publisher.NEO4J_PUBLISH_WORKERS: 2,
+                 neo4j_csv_publisher.JOB_PUBLISH_TAG: str(uuid.uuid4())}
+            )
+            publisher.init(conf)
+            with self.assertRaises(RuntimeError):
+                publisher.publish()
+
+            mock_transaction.commit.assert_not_called()
+            self.assertTrue(mock_transaction.rollback.called)
+
+    def test_partition_files_with_deadlock_labels(self) -> None:
+        with patch.object(GraphDatabase, 'driver'):
+            publisher = Neo4jCsvPublisher()
+            conf = ConfigFactory.from_dict(
+                {neo4j_csv_publisher.NEO4J_END_POINT_KEY: 'dummy://999.999.999.999:7687/',
+                 neo4j_csv_publisher.NODE_FILES_DIR: f'{self._resource_path}/nodes',
+                 neo4j_csv_publisher.NEO4J_USER: 'neo4j_user',
+                 neo4j_csv_publisher.NEO4J_PASSWORD: 'neo4j_password',
+                 neo4j_csv_publisher.NEO4J_DEADLOCK_NODE_LABELS: ['Column', 'Table'],
+                 neo4j_csv_publisher.JOB_PUBLISH_TAG: 'unit_test'}
+            )
+            publisher.init(conf)
+
+            partitions = publisher._partition_files(publisher._node_files, [neo4j_csv_publisher.NODE_LABEL_KEY])
+            self.assertEqual(len(partitions), 1)
+            self.assertEqual(sorted(partitions[0]), sorted(publisher._node_files))
+
+    def test_statement_cache(self) -> None:
+        with patch.object(GraphDatabase, 'driver'):
+            publisher = Neo4jCsvPublisher()
+            conf = ConfigFactory.from_dict(
+                {neo4j_csv_publisher.NEO4J_END_POINT_KEY: 'dummy://999.999.999.999:7687/',
+                 neo4j_csv_publisher.NEO4J_USER: 'neo4j_user',
+                 neo4j_csv_publisher.NEO4J_PASSWORD: 'neo4j_password',
+                 neo4j_csv_publisher.NEO4J_CREATE_ONLY_NODES: ['Tag'],
+                 neo4j_csv_publisher.JOB_PUBLISH_TAG: 'unit_test'}
+            )
+            publisher.init(conf)
+
+            with patch.object(publisher, '_render_node_merge_statement',
+                              wraps=publisher._render_node_merge_statement) as mock_render:
+                stmt1 = publisher.create_node_merge_statement({'KEY': 'foo', 'LABEL': 'Column', 'name': 'foo'})
+                stmt2 = publisher.create_node_merge_statement({'KEY': 'bar', 'LABEL': 'Column', 'name': 'bar'})
+                self.assertEqual(stmt1, stmt2)
+                self.assertEqual(mock_render.call_count, 1)
+
+                # Different label, header or create only flag is a different statement shape
+                publisher.create_node_merge_statement({'KEY': 'foo', 'LABEL': 'Table', 'name': 'foo'})
+                publisher.create_node_merge_statement({'KEY': 'foo', 'LABEL': 'Column', 'type': 'foo'})
+                tag_stmt = publisher.create_node_merge_statement({'KEY': 'foo', 'LABEL': 'Tag', 'name': 'foo'})
+                self.assertEqual(mock_render.call_count, 4)
+                self.assertNotIn('ON MATCH SET', tag_stmt)
+
 
 if __name__ == '__main__':
     unittest.main()
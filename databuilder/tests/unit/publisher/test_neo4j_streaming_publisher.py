@@ -0,0 +1,149 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+import tempfile
+import unittest
+from typing import Any, List
+
+from mock import MagicMock, patch
+from neo4j import GraphDatabase
+from pyhocon import ConfigFactory
+
+from databuilder.extractor.base_extractor import Extractor
+from databuilder.extractor.generic_extractor import GenericExtractor
+from databuilder.job.job import DefaultJob
+from databuilder.loader.file_system_neo4j_csv_loader import FsNeo4jCSVLoader
+from databuilder.loader.neo4j_streaming_loader import Neo4jStreamingLoader
+from databuilder.models.table_metadata import ColumnMetadata, TableMetadata
+from databuilder.publisher import neo4j_csv_publisher
+from databuilder.publisher.neo4j_streaming_publisher import Neo4jStreamingPublisher
+from databuilder.task.task import DefaultTask
+
+
+def _tables() -> List[TableMetadata]:
+    return [
+        TableMetadata('hive', 'gold', 'test_schema', f'test_table{i}', 'test description',
+                      [ColumnMetadata('col1', None, 'bigint', 0), ColumnMetadata('col2', None, 'string', 1)])
+        for i in range(3)
+    ]
+
+
+class FailingExtractor(Extractor):
+    def init(self, conf: Any) -> None:
+        self._count = 0
+        self._tables = _tables()
+
+    def extract(self) -> Any:
+        self._count += 1
+        if self._count > 2:
+            raise RuntimeError('extraction failed')
+        return self._tables[self._count - 1]
+
+    def get_scope(self) -> str:
+        return 'extractor.failing'
+
+
+class TestNeo4jStreamingPublisher(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self._conf = {
+            f'extractor.generic.{GenericExtractor.EXTRACTION_ITEMS}': _tables(),
+            f'loader.neo4j_streaming.{Neo4jStreamingLoader.BATCH_SIZE}': 4,
+            f'publisher.neo4j_streaming.{neo4j_csv_publisher.NEO4J_END_POINT_KEY}': 'dummy://999.999.999.999:7687/',
+            f'publisher.neo4j_streaming.{neo4j_csv_publisher.NEO4J_USER}': 'neo4j_user',
+            f'publisher.neo4j_streaming.{neo4j_csv_publisher.NEO4J_PASSWORD}': 'neo4j_password',
+            f'publisher.neo4j_streaming.{neo4j_csv_publisher.JOB_PUBLISH_TAG}': 'unit_test',
+        }
+
+    def test_streaming_job(self) -> None:
+        with patch.object(GraphDatabase, 'driver') as mock_driver:
+            mock_session = MagicMock()
+            mock_driver.return_value.session.return_value = mock_session
+            mock_session.__enter__.return_value = mock_session
+            mock_transaction = MagicMock()
+            mock_session.begin_transaction.return_value = mock_transaction
+
+            publisher = Neo4jStreamingPublisher()
+            task = DefaultTask(extractor=GenericExtractor(), loader=Neo4jStreamingLoader(publisher))
+            DefaultJob(conf=ConfigFactory.from_dict(self._conf), task=task, publisher=publisher).launch()
+
+            statements = [call[0][0].decode('utf-8') for call in mock_transaction.run.call_args_list]
+            params = [call[1]['parameters'] for call in mock_transaction.run.call_args_list]
+            self.assertTrue(all('UNWIND $batch AS row' in stmt for stmt in statements))
+
+            node_keys = [row['KEY'] for param in params for row in param['batch'] if 'KEY' in row]
+            relation_keys = [(row['START_KEY'], row['END_KEY'])
+                             for param in params for row in param['batch'] if 'START_KEY' in row]
+            self.assertIn('hive://gold.test_schema/test_table2/col2', node_keys)
+            self.assertIn(('hive://gold.test_schema/test_table2', 'hive://gold.test_schema/test_table2/col2'),
+                          relation_keys)
+
+            # Every relationship is published after its nodes
+            first_relation = next(i for i, param in enumerate(params) if 'START_KEY' in param['batch'][0])
+            table_node = next(i for i, param in enumerate(params)
+                              if {'KEY': 'hive://gold.test_schema/test_table0'}.items() <= param['batch'][0].items())
+            self.assertLess(table_node, first_relation)
+
+            # Indices are created once per label, and the final transaction is committed
+            labels = {row['LABEL'] for param in params for row in param['batch'] if 'LABEL' in row}
+            self.assertEqual(mock_session.run.call_count, len(labels))
+            self.assertTrue(mock_transaction.commit.called)
+            mock_transaction.rollback.assert_not_called()
+
+    def test_streaming_job_with_csv_spill(self) -> None:
+        with patch.object(GraphDatabase, 'driver') as mock_driver, tempfile.TemporaryDirectory() as tmp_dir:
+            mock_driver.return_value.session.return_value.begin_transaction.return_value = MagicMock()
+
+            node_dir = os.path.join(tmp_dir, 'nodes')
+            relation_dir = os.path.join(tmp_dir, 'relations')
+            conf = dict(self._conf)
+            conf.update({
+                f'loader.neo4j_streaming.{Neo4jStreamingLoader.SPILL_TO_CSV}': True,
+                f'loader.neo4j_streaming.{FsNeo4jCSVLoader.NODE_DIR_PATH}': node_dir,
+                f'loader.neo4j_streaming.{FsNeo4jCSVLoader.RELATION_DIR_PATH}': relation_dir,
+                f'loader.neo4j_streaming.{FsNeo4jCSVLoader.SHOULD_DELETE_CREATED_DIR}': False,
+            })
+
+            publisher = Neo4jStreamingPublisher()
+            task = DefaultTask(extractor=GenericExtractor(), loader=Neo4jStreamingLoader(publisher))
+            DefaultJob(conf=ConfigFactory.from_dict(conf), task=task, publisher=publisher).launch()
+
+            self.assertTrue(os.listdir(node_dir))
+            self.assertTrue(os.listdir(relation_dir))
+
+    def test_streaming_job_extraction_failure(self) -> None:
+        with patch.object(GraphDatabase, 'driver') as mock_driver:
+            mock_transaction = MagicMock()
+            mock_transaction.closed.return_value = False
+            mock_driver.return_value.session.return_value.begin_transaction.return_value = mock_transaction
+
+            publisher = Neo4jStreamingPublisher()
+            task = DefaultTask(extractor=FailingExtractor(), loader=Neo4jStreamingLoader(publisher))
+            job = DefaultJob(conf=ConfigFactory.from_dict(self._conf), task=task, publisher=publisher)
+
+            with self.assertRaises(RuntimeError) as context:
+                job.launch()
+
+            self.assertEqual(str(context.exception), 'extraction failed')
+            self.assertTrue(mock_transaction.rollback.called)
+
+    def test_streaming_job_publish_failure(self) -> None:
+        with patch.object(GraphDatabase, 'driver') as mock_driver:
+            mock_transaction = MagicMock()
+            mock_transaction.closed.return_value = False
+            mock_transaction.run.side_effect = RuntimeError('publish failed')
+            mock_driver.return_value.session.return_value.begin_transaction.return_value = mock_transaction
+
+            publisher = Neo4jStreamingPublisher()
+            task = DefaultTask(extractor=GenericExtractor(), loader=Neo4jStreamingLoader(publisher))
+            job = DefaultJob(conf=ConfigFactory.from_dict(self._conf), task=task, publisher=publisher)
+
+            with self.assertRaises(RuntimeError):
+                job.launch()
+
+            self.assertTrue(mock_transaction.rollback.called)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,12 +1,17 @@
 # Copyright Contributors to the Amundsen project.
 # SPDX-License-Identifier: Apache-2.0
 
+import threading
+import time
 import unittest
+from typing import Any
 
-from mock import patch
+from mock import MagicMock, patch
 
 from databuilder.rest_api.base_rest_api_query import EmptyRestApiQuerySeed, RestApiQuerySeed
-from databuilder.rest_api.rest_api_query import RestApiQuery
+from databuilder.rest_api.mode_analytics.mode_paginated_rest_api_query import ModePaginatedRestApiQuery
+from databuilder.rest_api.rest_api_query import HostRateLimiter, RestApiQuery
+from databuilder.rest_api.rest_api_response_cache import ResponseNotCachedException
 
 
 class TestRestApiQuery(unittest.TestCase):
@@ -138,6 +143,110 @@ class TestRestApiQuery(unittest.TestCase):
 
         self.assertEqual(expected_records, sub_records)
 
+    def test_rest_api_query_concurrent(self) -> None:
+        seed_record = [{'id': i} for i in range(20)]
+        seed_query = RestApiQuerySeed(seed_record=seed_record)
+        thread_names = set()
+
+        def get(url: str, **kwargs: Any) -> MagicMock:
+            thread_names.add(threading.current_thread().name)
+            # the later records are answered first
+            time.sleep((20 - int(url.split('/')[-1])) * 0.001)
+            response = MagicMock()
+            response.json.return_value = {'foo': {'name': 'name_' + url.split('/')[-1]}}
+            return response
+
+        with patch('databuilder.rest_api.rest_api_query.requests.Session') as mock_session:
+            mock_session.return_value.get.side_effect = get
+            query = RestApiQuery(query_to_join=seed_query, url='http://foo.bar/{id}', params={},
+                                 json_path='foo.name', field_names=['name_field'], max_workers=4)
+
+            expected = [{'id': i, 'name_field': f'name_{i}'} for i in range(20)]
+            self.assertListEqual(expected, list(query.execute()))
+            self.assertGreater(len(thread_names), 1)
+            mock_session.return_value.close.assert_called_once()
+
+            query = RestApiQuery(query_to_join=seed_query, url='http://foo.bar/{id}', params={},
+                                 json_path='foo.name', field_names=['name_field'], max_workers=4, ordered=False)
+            actual = list(query.execute())
+            self.assertNotEqual(expected, actual)
+            self.assertListEqual(expected, sorted(actual, key=lambda record: record['id']))
+
+    def test_rest_api_query_concurrent_pagination(self) -> None:
+        seed_record = [{'space': 'a'}, {'space': 'b'}]
+        seed_query = RestApiQuerySeed(seed_record=seed_record)
+
+        def get(url: str, **kwargs: Any) -> MagicMock:
+            # two pages of reports per space
+            space, page = url.split('/')[-1].split('?page=')
+            response = MagicMock()
+            response.json.return_value = {'_embedded': {'reports': [
+                {'token': f'{space}_{page}_{i}'} for i in range(2 if page == '1' else 1)]}}
+            return response
+
+        with patch('databuilder.rest_api.rest_api_query.requests.Session') as mock_session:
+            mock_session.return_value.get.side_effect = get
+            query = ModePaginatedRestApiQuery(query_to_join=seed_query, url='http://foo.bar/{space}', params={},
+                                              json_path='_embedded.reports[*].token', field_names=['token'],
+                                              max_record_size=2, max_workers=2)
+
+            self.assertListEqual(
+                [record['token'] for record in query.execute()],
+                ['a_1_0', 'a_1_1', 'a_2_0', 'b_1_0', 'b_1_1', 'b_2_0'])
+
+    def test_host_rate_limiter(self) -> None:
+        rate_limiter = HostRateLimiter(max_calls_per_sec=2)
+
+        with patch('databuilder.rest_api.rest_api_query.time') as mock_time:
+            mock_time.monotonic.return_value = 100.0
+            for url in ['http://foo.bar/1', 'http://foo.bar/2', 'http://other.host/1', 'http://foo.bar/3']:
+                rate_limiter.wait(url)
+
+        self.assertListEqual([call[0][0] for call in mock_time.sleep.call_args_list], [0.5, 1.0])
+
+    def test_rate_limiter_shared_by_chain(self) -> None:
+        seed_query = RestApiQuerySeed(seed_record=[{'id': 1}, {'id': 2}])
+        inner_query = RestApiQuery(query_to_join=seed_query, url='http://foo.bar/{id}', params={},
+                                   json_path='foo.name', field_names=['name_field'], max_calls_per_sec=2)
+        query = RestApiQuery(query_to_join=inner_query, url='http://foo.bar/{id}/{name_field}', params={},
+                             json_path='foo.name', field_names=['other_name_field'], max_calls_per_sec=2)
+        query.set_rate_limiter(HostRateLimiter(max_calls_per_sec=2))
+
+        with patch('databuilder.rest_api.rest_api_query.requests.get') as mock_get, \
+                patch('databuilder.rest_api.rest_api_query.time') as mock_time:
+            mock_get.return_value.json.return_value = {'foo': {'name': 'john'}}
+            mock_time.monotonic.return_value = 100.0
+            self.assertEqual(len(list(query.execute())), 2)
+
+        # the 4 calls of both queries to the host are spaced out together
+        self.assertEqual(mock_get.call_count, 4)
+        self.assertListEqual([call[0][0] for call in mock_time.sleep.call_args_list], [0.5, 1.0, 1.5])
+
+    def test_rest_api_query_response_cache(self) -> None:
+        seed_query = RestApiQuerySeed(seed_record=[{'id': 1}])
+        response_cache = MagicMock()
+        response_cache.send.return_value.json.return_value = {'foo': {'name': 'john'}}
+
+        inner_query = RestApiQuery(query_to_join=seed_query, url='http://foo.bar/{id}', params={},
+                                   json_path='foo.name', field_names=['name_field'])
+        query = RestApiQuery(query_to_join=inner_query, url='http://foo.bar/{id}/{name_field}', params={},
+                             json_path='foo.name', field_names=['other_name_field'])
+        query.set_response_cache(response_cache)
+
+        with patch('databuilder.rest_api.rest_api_query.requests.get') as mock_get:
+            self.assertListEqual(list(query.execute()),
+                                 [{'id': 1, 'name_field': 'john', 'other_name_field': 'john'}])
+            mock_get.assert_not_called()
+
+        self.assertListEqual([call[1]['url'] for call in response_cache.send.call_args_list],
+                             ['http://foo.bar/1', 'http://foo.bar/1/john'])
+
+        # a response missing from the cache in offline mode is not retried
+        response_cache.send.side_effect = ResponseNotCachedException()
+        with self.assertRaises(ResponseNotCachedException):
+            list(query.execute())
+        self.assertEqual(response_cache.send.call_count, 3)
+
 
 if __name__ == '__main__':
     unittest.main()
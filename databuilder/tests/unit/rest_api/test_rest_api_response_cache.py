@@ -0,0 +1,106 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import shutil
+import tempfile
+import unittest
+from http import HTTPStatus
+from typing import (
+    Any, Dict, Optional,
+)
+
+import requests
+from mock import MagicMock
+
+from databuilder.rest_api.rest_api_response_cache import ResponseNotCachedException, RestApiResponseCache
+
+
+def _response(status_code: int, content: bytes = b'', headers: Optional[Dict[str, str]] = None) -> requests.Response:
+    response = requests.Response()
+    response.url = 'http://foo.bar/reports'
+    response.status_code = status_code
+    response.headers.update(headers or {})
+    response.encoding = 'utf-8'
+    response._content = content
+    return response
+
+
+class TestRestApiResponseCache(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directory = tempfile.mkdtemp()
+        self.url = 'http://foo.bar/reports'
+        self.params: Dict[str, Any] = {'params': {'page': 1}, 'headers': {'Authorization': 'token'}}
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.directory)
+
+    def test_revalidation(self) -> None:
+        cache = RestApiResponseCache(directory=self.directory)
+        send_request = MagicMock(side_effect=[
+            _response(HTTPStatus.OK, b'{"reports": [1]}', {'ETag': '"v1"', 'Set-Cookie': 'session'}),
+            _response(HTTPStatus.NOT_MODIFIED),
+            _response(HTTPStatus.OK, b'{"reports": [2]}', {'Last-Modified': 'Wed, 21 Oct 2020 07:28:00 GMT'}),
+        ])
+
+        self.assertEqual(cache.send(url=self.url, params=self.params, send_request=send_request).json(),
+                         {'reports': [1]})
+        send_request.assert_called_with(self.url, **self.params)
+
+        response = cache.send(url=self.url, params=self.params, send_request=send_request)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(response.json(), {'reports': [1]})
+        self.assertNotIn('Set-Cookie', response.headers)
+        send_request.assert_called_with(self.url, params={'page': 1},
+                                        headers={'Authorization': 'token', 'If-None-Match': '"v1"'})
+
+        self.assertEqual(cache.send(url=self.url, params=self.params, send_request=send_request).json(),
+                         {'reports': [2]})
+
+        send_request.side_effect = [_response(HTTPStatus.NOT_MODIFIED)]
+        self.assertEqual(cache.send(url=self.url, params=self.params, send_request=send_request).json(),
+                         {'reports': [2]})
+        send_request.assert_called_with(self.url, params={'page': 1},
+                                        headers={'Authorization': 'token',
+                                                 'If-Modified-Since': 'Wed, 21 Oct 2020 07:28:00 GMT'})
+
+    def test_keyed_by_url_and_query_params(self) -> None:
+        cache = RestApiResponseCache(directory=self.directory)
+        send_request = MagicMock(side_effect=[
+            _response(HTTPStatus.OK, b'1', {'ETag': '"v1"'}),
+            _response(HTTPStatus.OK, b'2', {'ETag': '"v1"'}),
+        ])
+
+        cache.send(url=self.url, params=self.params, send_request=send_request)
+        cache.send(url=self.url, params={'params': {'page': 2}}, send_request=send_request)
+
+        # the second page was not cached yet, so its request was not conditional
+        send_request.assert_called_with(self.url, params={'page': 2})
+
+    def test_failure_not_cached(self) -> None:
+        cache = RestApiResponseCache(directory=self.directory)
+        send_request = MagicMock(side_effect=[
+            _response(HTTPStatus.INTERNAL_SERVER_ERROR, b'error', {'ETag': '"v1"'}),
+            _response(HTTPStatus.OK, b'1'),
+        ])
+
+        for status_code in [HTTPStatus.INTERNAL_SERVER_ERROR, HTTPStatus.OK]:
+            response = cache.send(url=self.url, params=self.params, send_request=send_request)
+            self.assertEqual(response.status_code, status_code)
+        send_request.assert_called_with(self.url, **self.params)
+
+    def test_offline(self) -> None:
+        send_request = MagicMock(return_value=_response(HTTPStatus.OK, b'{"reports": [1]}'))
+        RestApiResponseCache(directory=self.directory).send(url=self.url, params=self.params,
+                                                            send_request=send_request)
+
+        cache = RestApiResponseCache(directory=self.directory, offline=True)
+        self.assertEqual(cache.send(url=self.url, params=self.params, send_request=send_request).json(),
+                         {'reports': [1]})
+        self.assertRaises(ResponseNotCachedException, cache.send, url=self.url, params={'params': {'page': 2}},
+                          send_request=send_request)
+        self.assertEqual(send_request.call_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
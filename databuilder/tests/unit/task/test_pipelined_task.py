@@ -0,0 +1,111 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import unittest
+from typing import (
+    Any, Iterator, List,
+)
+
+from pyhocon import ConfigFactory
+
+from databuilder.extractor.base_extractor import Extractor
+from databuilder.extractor.generic_extractor import GenericExtractor
+from databuilder.loader.base_loader import Loader
+from databuilder.task.pipelined_task import PipelinedTask
+from databuilder.transformer.base_transformer import Transformer
+
+
+class ListLoader(Loader):
+    def init(self, conf: Any) -> None:
+        self.records: List[Any] = []
+        self.closed = False
+
+    def load(self, record: Any) -> None:
+        if record == 'fail':
+            raise RuntimeError('load failed')
+        self.records.append(record)
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class SplitTransformer(Transformer):
+    """
+    Filters out odd numbers and yields each even number twice
+    """
+
+    def init(self, conf: Any) -> None:
+        pass
+
+    def transform(self, record: Any) -> Any:
+        if record % 2:
+            return None
+        return self._split(record)
+
+    def _split(self, record: int) -> Iterator[int]:
+        yield record
+        yield record
+
+    def get_scope(self) -> str:
+        return 'transformer.split'
+
+
+class FailingExtractor(Extractor):
+    def init(self, conf: Any) -> None:
+        self._count = 0
+
+    def extract(self) -> Any:
+        self._count += 1
+        if self._count > 5:
+            raise RuntimeError('extract failed')
+        return self._count
+
+    def get_scope(self) -> str:
+        return 'extractor.failing'
+
+
+class TestPipelinedTask(unittest.TestCase):
+
+    def test_run(self) -> None:
+        loader = ListLoader()
+        task = PipelinedTask(extractor=GenericExtractor(), loader=loader, transformer=SplitTransformer())
+        task.init(ConfigFactory.from_dict({
+            f'extractor.generic.{GenericExtractor.EXTRACTION_ITEMS}': list(range(1, 101)),
+            f'task.{PipelinedTask.QUEUE_SIZE}': 2,
+        }))
+        task.run()
+
+        self.assertEqual(loader.records, [i for i in range(2, 101, 2) for _ in range(2)])
+        self.assertTrue(loader.closed)
+        self.assertEqual(task.stats['extractor'].record_count, 100)
+        self.assertEqual(task.stats['transformer'].record_count, 100)
+        self.assertEqual(task.stats['loader'].record_count, 100)
+
+    def test_extractor_failure(self) -> None:
+        loader = ListLoader()
+        task = PipelinedTask(extractor=FailingExtractor(), loader=loader)
+        task.init(ConfigFactory.from_dict({}))
+
+        with self.assertRaises(RuntimeError) as context:
+            task.run()
+
+        self.assertEqual(str(context.exception), 'extract failed')
+        self.assertTrue(loader.closed)
+
+    def test_loader_failure(self) -> None:
+        loader = ListLoader()
+        task = PipelinedTask(extractor=GenericExtractor(), loader=loader)
+        task.init(ConfigFactory.from_dict({
+            f'extractor.generic.{GenericExtractor.EXTRACTION_ITEMS}': ['ok'] + ['fail'] * 100,
+            f'task.{PipelinedTask.QUEUE_SIZE}': 1,
+        }))
+
+        with self.assertRaises(RuntimeError) as context:
+            task.run()
+
+        self.assertEqual(str(context.exception), 'load failed')
+        self.assertEqual(loader.records, ['ok'])
+
+
+if __name__ == '__main__':
+    unittest.main()
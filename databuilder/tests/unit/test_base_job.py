@@ -105,6 +105,45 @@ class TestJobStatsd(unittest.TestCase):
                 self.assertFalse(file.readline())
 
             self.assertEqual(mock_statsd.return_value.incr.call_count, 1)
+            mock_statsd.return_value.gauge.assert_any_call('extractor.record_count', 2)
+            mock_statsd.return_value.gauge.assert_any_call('loader.record_count', 2)
+            timers = [call[0][0] for call in mock_statsd.return_value.timing.call_args_list]
+            self.assertEqual(timers, ['extractor.busy_time', 'transformer.busy_time', 'loader.busy_time',
+                                      'publisher.busy_time'])
+
+
+class TestJobRunReport(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.temp_dir_path = tempfile.mkdtemp()
+        self.dest_file_name = f'{self.temp_dir_path}/superhero.json'
+        self.report_file_name = f'{self.temp_dir_path}/report.json'
+        self.conf = ConfigFactory.from_dict(
+            {'loader.superhero.dest_file': self.dest_file_name,
+             'job.identifier': 'foobar',
+             'job.run_report_path': self.report_file_name})
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.temp_dir_path)
+
+    def test_job(self) -> None:
+        task = DefaultTask(SuperHeroExtractor(), SuperHeroLoader(), transformer=SuperHeroReverseNameTransformer())
+
+        job = DefaultJob(self.conf, task)
+        job.launch()
+
+        with open(self.report_file_name, 'r') as file:
+            report = json.load(file)
+
+        self.assertEqual(report['identifier'], 'foobar')
+        self.assertTrue(report['is_success'])
+        self.assertEqual(set(report['stages'].keys()), {'extractor', 'transformer', 'loader', 'publisher'})
+        for stage in ('extractor', 'transformer', 'loader'):
+            self.assertEqual(report['stages'][stage]['record_count'], 2)
+        self.assertEqual(report['stages']['publisher']['record_count'], 0)
+        # the peak RSS of the process is reported once for the job, not per stage
+        self.assertIn('peak_rss_bytes', report)
+        self.assertTrue(all('peak_rss_bytes' not in stats for stats in report['stages'].values()))
 
 
 class SuperHeroExtractor(Extractor):
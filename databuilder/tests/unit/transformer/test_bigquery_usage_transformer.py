@@ -3,9 +3,10 @@
 
 import unittest
 
+from amundsen_rds.models.user import User as RDSUser
 from pyhocon import ConfigFactory
 
-from databuilder.extractor.bigquery_usage_extractor import TableColumnUsageTuple
+from databuilder.extractor.bigquery_usage_extractor import TableColumnUsageTuple, TableUsageTuple
 from databuilder.models.table_column_usage import TableColumnUsage
 from databuilder.transformer.bigquery_usage_transformer import BigqueryUsageTransformer
 
@@ -49,6 +50,52 @@ class TestBigQueryUsageTransform(unittest.TestCase):
         self.assertEqual(col_reader.user_email, TestBigQueryUsageTransform.EMAIL)
         self.assertEqual(col_reader.read_count, TestBigQueryUsageTransform.READ_COUNT)
 
+    def test_transform_table_usage(self) -> None:
+        """
+        Test that the aggregated usage of a table is transformed to one TableColumnUsage, and that each user is
+        serialized once with dedupe_users
+        """
+        config = ConfigFactory.from_dict({BigqueryUsageTransformer.DEDUPE_USERS: True})
+
+        transformer = BigqueryUsageTransformer()
+        transformer.init(config)
+
+        user_nodes = []
+        user_records = []
+        for table in ['table1', 'table2']:
+            key = TableUsageTuple(database=TestBigQueryUsageTransform.DATABASE,
+                                  cluster=TestBigQueryUsageTransform.CLUSTER,
+                                  schema=TestBigQueryUsageTransform.DATASET,
+                                  table=table,
+                                  column=TestBigQueryUsageTransform.COLUMN)
+            xformed = transformer.transform((key, {'user1@test.com': 3, 'user2@test.com': 1}))
+
+            assert xformed is not None
+            col_readers = list(xformed.col_readers)
+            self.assertEqual([(col_reader.table, col_reader.user_email, col_reader.read_count)
+                              for col_reader in col_readers],
+                             [(table, 'user1@test.com', 3), (table, 'user2@test.com', 1)])
+
+            node = xformed.create_next_node()
+            while node:
+                user_nodes.append(node.key)
+                node = xformed.create_next_node()
+
+            relation_count = 0
+            while xformed.create_next_relation():
+                relation_count += 1
+            self.assertEqual(relation_count, 2)
+
+            # the users serialized as nodes are still serialized as records
+            record = xformed.create_next_record()
+            while record:
+                if isinstance(record, RDSUser):
+                    user_records.append(record.rk)
+                record = xformed.create_next_record()
+
+        self.assertEqual(user_nodes, ['user1@test.com', 'user2@test.com'])
+        self.assertEqual(user_records, ['user1@test.com', 'user2@test.com'])
+
     def test_scope(self) -> None:
         config = ConfigFactory.from_dict({})
 
@@ -18,6 +18,8 @@ from amundsen_application.models.user import load_user, dump_user
 from amundsen_application.api.utils.metadata_utils import is_table_editable, marshall_table_partial, \
     marshall_table_full, marshall_dashboard_partial, marshall_dashboard_full, marshall_lineage_table, TableUri
 from amundsen_application.api.utils.request_utils import get_query_param, request_metadata, request_search
+from amundsen_application.api.utils.response_cache import request_metadata_cached, invalidate_cached_responses, \
+    table_namespace, POPULAR_TABLES_NAMESPACE, TAGS_NAMESPACE, LAST_INDEXED_NAMESPACE, RELATED_DASHBOARDS_NAMESPACE
 
 
 LOGGER = logging.getLogger(__name__)
@@ -66,7 +68,7 @@ def popular_tables() -> Response:
         count = app.config['POPULAR_TABLE_COUNT']
         url = f'{service_base}{POPULAR_TABLES_ENDPOINT}/{user_id}?limit={count}'
 
-        response = request_metadata(url=url)
+        response = request_metadata_cached(url=url, namespace=POPULAR_TABLES_NAMESPACE)
         status_code = response.status_code
 
         if status_code == HTTPStatus.OK:
@@ -122,7 +124,7 @@ def _get_table_metadata(*, table_key: str, index: int, source: str) -> Dict[str,
     try:
         table_endpoint = _get_table_endpoint()
         url = '{0}/{1}'.format(table_endpoint, table_key)
-        response = request_metadata(url=url)
+        response = request_metadata_cached(url=url, namespace=table_namespace(table_key))
     except ValueError as e:
         # envoy client BadResponse is a subclass of ValueError
         message = 'Encountered exception: ' + str(e)
@@ -176,6 +178,7 @@ def update_table_owner() -> Response:
         _log_update_table_owner(table_key=table_key, method=method, owner=owner)
 
         response = request_metadata(url=url, method=method)
+        invalidate_cached_responses(table_namespace(table_key))
         status_code = response.status_code
 
         if status_code == HTTPStatus.OK:
@@ -201,7 +204,7 @@ def get_last_indexed() -> Response:
     try:
         url = app.config['METADATASERVICE_BASE'] + LAST_INDEXED_ENDPOINT
 
-        response = request_metadata(url=url)
+        response = request_metadata_cached(url=url, namespace=LAST_INDEXED_NAMESPACE)
         status_code = response.status_code
 
         if status_code == HTTPStatus.OK:
@@ -294,6 +297,7 @@ def put_table_description() -> Response:
         _log_put_table_description(table_key=table_key, description=description, source=src)
 
         response = request_metadata(url=url, method='PUT', data=json.dumps({'description': description}))
+        invalidate_cached_responses(table_namespace(table_key), POPULAR_TABLES_NAMESPACE)
         status_code = response.status_code
 
         if status_code == HTTPStatus.OK:
@@ -334,6 +338,7 @@ def put_column_description() -> Response:
         _log_put_column_description(table_key=table_key, column_name=column_name, description=description, source=src)
 
         response = request_metadata(url=url, method='PUT', data=json.dumps({'description': description}))
+        invalidate_cached_responses(table_namespace(table_key))
         status_code = response.status_code
 
         if status_code == HTTPStatus.OK:
@@ -358,7 +363,7 @@ def get_tags() -> Response:
     """
     try:
         url = app.config['METADATASERVICE_BASE'] + TAGS_ENDPOINT
-        response = request_metadata(url=url)
+        response = request_metadata_cached(url=url, namespace=TAGS_NAMESPACE)
         status_code = response.status_code
 
         if status_code == HTTPStatus.OK:
@@ -473,6 +478,7 @@ def update_table_tags() -> Response:
         _log_update_table_tags(table_key=table_key, method=method, tag=tag)
 
         metadata_status_code = _update_metadata_tag(table_key=table_key, method=method, tag=tag)
+        invalidate_cached_responses(table_namespace(table_key), POPULAR_TABLES_NAMESPACE, TAGS_NAMESPACE)
         search_status_code = _update_search_tag(table_key=table_key, method=method, tag=tag)
 
         http_status_code = HTTPStatus.OK
@@ -512,6 +518,7 @@ def update_dashboard_tags() -> Response:
         _log_update_dashboard_tags(uri_key=uri_key, method=method, tag=tag)
 
         response = request_metadata(url=url, method=method)
+        invalidate_cached_responses(RELATED_DASHBOARDS_NAMESPACE, TAGS_NAMESPACE)
         status_code = response.status_code
 
         if status_code == HTTPStatus.OK:
@@ -642,6 +649,10 @@ def update_bookmark() -> Response:
         _log_update_bookmark(resource_key=resource_key, resource_type=resource_type, method=request.method)
 
         response = request_metadata(url=url, method=request.method)
+        if resource_type == 'table':
+            invalidate_cached_responses(table_namespace(resource_key))
+        else:
+            invalidate_cached_responses(RELATED_DASHBOARDS_NAMESPACE)
         status_code = response.status_code
 
         return make_response(jsonify({'msg': 'success', 'response': response.json()}), status_code)
@@ -757,7 +768,7 @@ def _get_related_dashboards_metadata(*, url: str) -> Dict[str, Any]:
     }
 
     try:
-        response = request_metadata(url=url)
+        response = request_metadata_cached(url=url, namespace=RELATED_DASHBOARDS_NAMESPACE)
     except ValueError as e:
         # envoy client BadResponse is a subclass of ValueError
         message = 'Encountered exception: ' + str(e)
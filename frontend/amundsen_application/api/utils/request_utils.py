@@ -1,10 +1,25 @@
 # Copyright Contributors to the Amundsen project.
 # SPDX-License-Identifier: Apache-2.0
 
+import atexit
+import http.cookiejar
+import logging
+import threading
 from typing import Dict
 
 import requests
 from flask import current_app as app
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+LOGGER = logging.getLogger(__name__)
+
+METADATA_SERVICE = 'metadata'
+SEARCH_SERVICE = 'search'
+
+# Sessions shared by all requests of the process, one per target service
+_sessions = {}  # type: Dict[str, requests.Session]
+_sessions_lock = threading.Lock()
 
 
 def get_query_param(args: Dict, param: str, error_msg: str = None) -> str:
@@ -35,17 +50,27 @@ def request_metadata(*,     # type: ignore
     if headers is None:
         headers = {}
 
-    if app.config['REQUEST_HEADERS_METHOD']:
-        headers.update(app.config['REQUEST_HEADERS_METHOD'](app))
-    elif app.config['METADATASERVICE_REQUEST_HEADERS']:
-        headers.update(app.config['METADATASERVICE_REQUEST_HEADERS'])
+    headers.update(get_metadata_request_headers())
     return request_wrapper(method=method,
                            url=url,
                            client=app.config['METADATASERVICE_REQUEST_CLIENT'],
                            headers=headers,
                            timeout_sec=timeout_sec,
                            data=data,
-                           json=json)
+                           json=json,
+                           service=METADATA_SERVICE)
+
+
+def get_metadata_request_headers() -> Dict:
+    """
+    Returns the headers configured for the requests to metadata service
+    :return:
+    """
+    if app.config['REQUEST_HEADERS_METHOD']:
+        return app.config['REQUEST_HEADERS_METHOD'](app) or {}
+    elif app.config['METADATASERVICE_REQUEST_HEADERS']:
+        return dict(app.config['METADATASERVICE_REQUEST_HEADERS'])
+    return {}
 
 
 def request_search(*,     # type: ignore
@@ -79,11 +104,13 @@ def request_search(*,     # type: ignore
                            headers=headers,
                            timeout_sec=timeout_sec,
                            data=data,
-                           json=json)
+                           json=json,
+                           service=SEARCH_SERVICE)
 
 
 # TODO: Define an interface for envoy_client
-def request_wrapper(method: str, url: str, client, headers, timeout_sec: int, data=None, json=None):  # type: ignore
+def request_wrapper(method: str, url: str, client, headers, timeout_sec: int, data=None, json=None,  # type: ignore
+                    service: str = 'default'):
     """
     Wraps a request to use Envoy client and headers, if available
     :param method: DELETE | GET | POST | PUT
@@ -92,6 +119,7 @@ def request_wrapper(method: str, url: str, client, headers, timeout_sec: int, da
     :param headers: Optional Envoy request headers
     :param timeout_sec: Number of seconds before timeout is triggered. Not used with Envoy
     :param data: Optional request payload
+    :param service: The target service, whose pooled session is used. Not used with Envoy
     :return:
     """
     # If no timeout specified, use the one from the configurations.
@@ -109,21 +137,91 @@ def request_wrapper(method: str, url: str, client, headers, timeout_sec: int, da
         else:
             raise Exception('Method not allowed: {}'.format(method))
     else:
-        with build_session() as s:
-            if method == 'DELETE':
-                return s.delete(url, headers=headers, timeout=timeout_sec)
-            elif method == 'GET':
-                return s.get(url, headers=headers, timeout=timeout_sec)
-            elif method == 'POST':
-                return s.post(url, headers=headers, timeout=timeout_sec, data=data, json=json)
-            elif method == 'PUT':
-                return s.put(url, headers=headers, timeout=timeout_sec, data=data, json=json)
-            else:
-                raise Exception('Method not allowed: {}'.format(method))
+        s = get_session(service)
+        if method == 'DELETE':
+            return s.delete(url, headers=headers, timeout=timeout_sec)
+        elif method == 'GET':
+            return s.get(url, headers=headers, timeout=timeout_sec)
+        elif method == 'POST':
+            return s.post(url, headers=headers, timeout=timeout_sec, data=data, json=json)
+        elif method == 'PUT':
+            return s.put(url, headers=headers, timeout=timeout_sec, data=data, json=json)
+        else:
+            raise Exception('Method not allowed: {}'.format(method))
+
+
+def get_session(service: str) -> requests.Session:
+    """
+    Returns the session of the given service, shared by all threads of the process so that its connections are
+    kept alive and reused. The session is not modified after it is built, and urllib3 connection pools are
+    thread-safe.
+    :param service: The target service, e.g. METADATA_SERVICE
+    :return:
+    """
+    with _sessions_lock:
+        session = _sessions.get(service)
+        if session is None:
+            LOGGER.info('Building a pooled session for the %s service', service)
+            session = build_session()
+            _sessions[service] = session
+        return session
+
+
+def close_sessions() -> None:
+    """
+    Closes the shared sessions and their connections. The next request builds a new session.
+    """
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+
+
+# the kept alive connections are closed when the process exits
+atexit.register(close_sessions)
+
+
+def get_session_pool_stats() -> Dict[str, Dict[str, int]]:
+    """
+    Returns the connection pool metrics of the shared session of each service
+    :return: Per service, the number of requests ('requests'), how many of them opened a new connection ('misses')
+    and how many reused a kept alive connection ('hits')
+    """
+    stats = {}
+    with _sessions_lock:
+        sessions = dict(_sessions)
+
+    for service, session in sessions.items():
+        num_requests = num_connections = 0
+        adapters = {id(adapter): adapter for adapter in session.adapters.values() if isinstance(adapter, HTTPAdapter)}
+        for adapter in adapters.values():
+            pools = adapter.poolmanager.pools
+            for pool_key in pools.keys():
+                pool = pools.get(pool_key)
+                if pool is not None:
+                    num_requests += pool.num_requests
+                    num_connections += pool.num_connections
+        stats[service] = {
+            'requests': num_requests,
+            'hits': max(num_requests - num_connections, 0),
+            'misses': num_connections,
+        }
+    return stats
 
 
 def build_session() -> requests.Session:
     session = requests.Session()
+    # the session is shared by the requests of all users, so the cookies set by a response must not be sent with the
+    # next requests
+    session.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+
+    retries = Retry(total=app.config.get('REQUEST_SESSION_RETRIES', 0),
+                    backoff_factor=app.config.get('REQUEST_SESSION_RETRY_BACKOFF_FACTOR', 0),
+                    status_forcelist=(502, 503, 504),
+                    raise_on_status=False)
+    adapter = HTTPAdapter(pool_maxsize=app.config.get('REQUEST_SESSION_POOL_SIZE', 10), max_retries=retries)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
 
     cert = app.config.get('MTLS_CLIENT_CERT')
     key = app.config.get('MTLS_CLIENT_KEY')
@@ -0,0 +1,164 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import hashlib
+import json
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from http import HTTPStatus
+from typing import Any, Dict, Optional, Tuple  # noqa: F401
+
+from flask import current_app as app
+from werkzeug.utils import import_string
+
+from amundsen_application.api.utils.request_utils import get_metadata_request_headers, request_metadata
+from amundsen_application.base.base_response_cache import BaseResponseCache
+
+LOGGER = logging.getLogger(__name__)
+
+# Namespaces of cached responses, which are invalidated together
+POPULAR_TABLES_NAMESPACE = 'popular_tables'
+TAGS_NAMESPACE = 'tags'
+LAST_INDEXED_NAMESPACE = 'last_indexed'
+RELATED_DASHBOARDS_NAMESPACE = 'related_dashboards'
+
+_KEY_PREFIX = 'amundsen_frontend'
+_EXTENSION_NAME = 'response_cache'
+_extension_lock = threading.Lock()
+
+
+def table_namespace(table_key: str) -> str:
+    return 'table:' + table_key
+
+
+class InMemoryResponseCache(BaseResponseCache):
+    """
+    A least recently used cache in the memory of the process, holding up to RESPONSE_CACHE_MAX_SIZE values
+    """
+    def __init__(self) -> None:
+        self._max_size = app.config['RESPONSE_CACHE_MAX_SIZE']
+        self._entries = OrderedDict()  # type: OrderedDict[str, Tuple[Optional[float], str]]
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str, ttl_sec: Optional[int] = None) -> None:
+        expires_at = time.monotonic() + ttl_sec if ttl_sec is not None else None
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+
+class CachedResponse:
+    """
+    Stands in for the response of a successful metadata service request served from the cache
+    """
+    def __init__(self, text: str) -> None:
+        self.status_code = HTTPStatus.OK
+        self.text = text
+
+    def json(self) -> Any:
+        return json.loads(self.text)
+
+
+def get_response_cache() -> Optional[BaseResponseCache]:
+    """
+    Returns the response cache of the application, or None if RESPONSE_CACHE is not configured
+    """
+    class_path = app.config.get('RESPONSE_CACHE')
+    if not class_path:
+        return None
+
+    with _extension_lock:
+        cache = app.extensions.get(_EXTENSION_NAME)
+        if cache is None:
+            cache = import_string(class_path)()
+            app.extensions[_EXTENSION_NAME] = cache
+        return cache
+
+
+def _digest(*parts: Any) -> str:
+    return hashlib.sha256(json.dumps(parts, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def _version_key(namespace: str) -> str:
+    return '{0}:version:{1}'.format(_KEY_PREFIX, _digest(namespace))
+
+
+def _get_version(cache: BaseResponseCache, namespace: str) -> str:
+    """
+    Returns the current version of the namespace, which is part of the keys of its responses. A new version is set
+    when the namespace is invalidated, or when the version has been evicted, so outdated responses are never served.
+    """
+    key = _version_key(namespace)
+    version = cache.get(key)
+    if version is None:
+        version = uuid.uuid4().hex
+        cache.set(key, version)
+    return version
+
+
+def _get_key_headers() -> Dict[str, str]:
+    headers = get_metadata_request_headers()
+    key_headers = app.config['RESPONSE_CACHE_KEY_HEADERS']
+    if key_headers is None:
+        return headers
+
+    key_headers = {header.lower() for header in key_headers}
+    return {name: value for name, value in headers.items() if name.lower() in key_headers}
+
+
+def request_metadata_cached(*, url: str, namespace: str) -> Any:
+    """
+    GET request to metadata service, served from the response cache if configured. Only successful responses are
+    cached, for RESPONSE_CACHE_TTL_SEC or until the namespace is invalidated.
+    :param url: The request URL
+    :param namespace: The namespace of the response, e.g. table_namespace(table_key)
+    :return: The response of the request, or a CachedResponse
+    """
+    cache = get_response_cache()
+    if cache is None:
+        return request_metadata(url=url)
+
+    version = _get_version(cache, namespace)
+    key = '{0}:response:{1}:{2}'.format(_KEY_PREFIX, version, _digest(url, _get_key_headers()))
+    cached_text = cache.get(key)
+    if cached_text is not None:
+        LOGGER.debug('Serving %s from the response cache', url)
+        return CachedResponse(cached_text)
+
+    response = request_metadata(url=url)
+    if response.status_code == HTTPStatus.OK:
+        cache.set(key, response.text, app.config['RESPONSE_CACHE_TTL_SEC'])
+    return response
+
+
+def invalidate_cached_responses(*namespaces: str) -> None:
+    """
+    Invalidates the cached responses of the namespaces, after they have been updated
+    :param namespaces:
+    :return:
+    """
+    cache = get_response_cache()
+    if cache is None:
+        return
+
+    for namespace in namespaces:
+        cache.set(_version_key(namespace), uuid.uuid4().hex)
@@ -10,7 +10,7 @@ from flask import current_app as app
 from flask.blueprints import Blueprint
 
 from amundsen_application.api.metadata.v0 import USER_ENDPOINT
-from amundsen_application.api.utils.request_utils import request_metadata
+from amundsen_application.api.utils.request_utils import get_session_pool_stats, request_metadata
 from amundsen_application.models.user import load_user, dump_user
 
 
@@ -47,3 +47,11 @@ def current_user() -> Response:
         logging.exception(message)
         payload = jsonify({'msg': message})
         return make_response(payload, HTTPStatus.INTERNAL_SERVER_ERROR)
+
+
+@blueprint.route('/session_pool_stats', methods=['GET'])
+def session_pool_stats() -> Response:
+    """
+    Returns the connection pool metrics of the sessions to the metadata and search services, in this process
+    """
+    return make_response(jsonify(get_session_pool_stats()), HTTPStatus.OK)
@@ -0,0 +1,37 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import abc
+from typing import Optional
+
+
+class BaseResponseCache(abc.ABC):
+    """
+    Stores serialized responses of the metadata service, see amundsen_application.api.utils.response_cache.
+    Implementations are instantiated once per application, within the application context, and called from
+    concurrent requests, so they need to be thread-safe.
+    """
+    @abc.abstractmethod
+    def __init__(self) -> None:
+        pass  # pragma: no cover
+
+    @abc.abstractmethod
+    def get(self, key: str) -> Optional[str]:
+        """
+        Returns the value stored under the key, or None if it's missing or expired
+        :param key:
+        :return:
+        """
+        raise NotImplementedError  # pragma: no cover
+
+    @abc.abstractmethod
+    def set(self, key: str, value: str, ttl_sec: Optional[int] = None) -> None:
+        """
+        Stores the value under the key
+        :param key:
+        :param value:
+        :param ttl_sec: Number of seconds before the value expires, or None if it does not expire. The cache may
+            still evict the value earlier.
+        :return:
+        """
+        raise NotImplementedError  # pragma: no cover
@@ -0,0 +1,31 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+from typing import Optional
+
+from amundsen_application.base.base_response_cache import BaseResponseCache
+
+try:
+    import redis
+except ModuleNotFoundError:
+    pass
+
+
+class RedisResponseCache(BaseResponseCache):
+    """
+    A response cache shared by all processes of the application, so that the updates made through one process
+    invalidate the cached responses of every process. Set RESPONSE_CACHE to
+    'amundsen_application.base.examples.example_redis_response_cache.RedisResponseCache' to use it.
+
+    Redis should be configured with an eviction policy, e.g. maxmemory-policy allkeys-lru, to bound its memory.
+    """
+    def __init__(self) -> None:
+        self._client = redis.Redis.from_url(os.getenv('RESPONSE_CACHE_REDIS_URL', 'redis://localhost:6379/0'))
+
+    def get(self, key: str) -> Optional[str]:
+        value = self._client.get(key)
+        return value.decode('utf-8') if value is not None else None
+
+    def set(self, key: str, value: str, ttl_sec: Optional[int] = None) -> None:
+        self._client.set(key, value, ex=ttl_sec)
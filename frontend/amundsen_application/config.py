@@ -44,6 +44,26 @@ class Config:
     # Request Timeout Configurations in Seconds
     REQUEST_SESSION_TIMEOUT_SEC = 3
 
+    # Requests to the metadata and search services share one session per service, which keeps connections alive.
+    # Maximum number of connections kept alive per host
+    REQUEST_SESSION_POOL_SIZE = 10  # type: int
+    # Number of times a failed connection, or a GET, PUT or DELETE request answered with a 502, 503 or 504, is retried
+    REQUEST_SESSION_RETRIES = 0  # type: int
+    # Retries wait {backoff factor} * (2 ^ ({number of retries} - 1)) seconds
+    REQUEST_SESSION_RETRY_BACKOFF_FACTOR = 0.1  # type: float
+
+    # Cache for the read-only metadata service requests, such as popular tables, tags and table metadata.
+    # Maps to a class path and name of a BaseResponseCache implementation, e.g.
+    # 'amundsen_application.api.utils.response_cache.InMemoryResponseCache'. The cache is disabled if None.
+    # Updates made through the application invalidate the cached responses they affect. With more than one
+    # process, use a cache shared by the processes so that the updates are visible to all of them.
+    RESPONSE_CACHE = os.getenv('RESPONSE_CACHE', None)  # type: Optional[str]
+    RESPONSE_CACHE_TTL_SEC = 60  # type: int
+    # Maximum number of responses held by InMemoryResponseCache
+    RESPONSE_CACHE_MAX_SIZE = 1000  # type: int
+    # Request headers the cached responses vary by, e.g. ['Authorization']. All headers if None.
+    RESPONSE_CACHE_KEY_HEADERS = None  # type: Optional[List[str]]
+
     # Frontend Application
     FRONTEND_BASE = ''
 
@@ -0,0 +1,126 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from typing import Any, List, Optional  # noqa: F401
+
+from requests.adapters import HTTPAdapter
+
+from amundsen_application import create_app
+from amundsen_application.api.utils.request_utils import (
+    METADATA_SERVICE, SEARCH_SERVICE, build_session, close_sessions, get_session, get_session_pool_stats,
+    request_metadata,
+)
+
+local_app = create_app('amundsen_application.config.TestConfig', 'tests/templates')
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self) -> None:
+        body = b'{}'
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args: str) -> None:
+        pass
+
+
+class SetCookieHandler(KeepAliveHandler):
+    received_cookies = []  # type: List[Optional[str]]
+
+    def send_response(self, *args: Any) -> None:
+        SetCookieHandler.received_cookies.append(self.headers.get('Cookie'))
+        super().send_response(*args)
+        self.send_header('Set-Cookie', 'session_id=user1; Path=/')
+
+
+class RequestUtilsTest(unittest.TestCase):
+    def setUp(self) -> None:
+        close_sessions()
+
+    def tearDown(self) -> None:
+        close_sessions()
+
+    def test_get_session_per_service(self) -> None:
+        """
+        Verify that a session is shared by the requests to a service, and not across services
+        :return:
+        """
+        with local_app.app_context():
+            metadata_session = get_session(METADATA_SERVICE)
+            self.assertIs(get_session(METADATA_SERVICE), metadata_session)
+            self.assertIsNot(get_session(SEARCH_SERVICE), metadata_session)
+
+    def test_build_session(self) -> None:
+        """
+        Verify that the session is built with the configured pool size, retries and client certificate
+        :return:
+        """
+        with local_app.app_context():
+            local_app.config['REQUEST_SESSION_POOL_SIZE'] = 3
+            local_app.config['REQUEST_SESSION_RETRIES'] = 2
+            local_app.config['MTLS_CLIENT_CERT'] = 'test.crt'
+            local_app.config['MTLS_CLIENT_KEY'] = 'test.key'
+            try:
+                session = build_session()
+            finally:
+                local_app.config['REQUEST_SESSION_POOL_SIZE'] = 10
+                local_app.config['REQUEST_SESSION_RETRIES'] = 0
+                local_app.config['MTLS_CLIENT_CERT'] = None
+                local_app.config['MTLS_CLIENT_KEY'] = None
+
+            adapter = session.get_adapter('https://metadata')
+            assert isinstance(adapter, HTTPAdapter)
+            self.assertEqual(adapter.poolmanager.connection_pool_kw['maxsize'], 3)
+            self.assertEqual(adapter.max_retries.total, 2)
+            self.assertEqual(session.cert, ('test.crt', 'test.key'))
+
+    def test_connection_reused(self) -> None:
+        """
+        Verify that consecutive requests to a service reuse the kept alive connection
+        :return:
+        """
+        server = HTTPServer(('127.0.0.1', 0), KeepAliveHandler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            url = 'http://127.0.0.1:{}/popular_tables/'.format(server.server_port)
+            with local_app.app_context():
+                for _ in range(3):
+                    self.assertEqual(request_metadata(url=url).status_code, 200)
+
+            self.assertEqual(get_session_pool_stats()[METADATA_SERVICE], {'requests': 3, 'hits': 2, 'misses': 1})
+
+            response = local_app.test_client().get('/api/session_pool_stats')
+            self.assertEqual(response.json, {METADATA_SERVICE: {'requests': 3, 'hits': 2, 'misses': 1}})
+        finally:
+            close_sessions()
+            server.shutdown()
+            server.server_close()
+
+    def test_cookies_not_shared(self) -> None:
+        """
+        Verify that a cookie set by a response is not sent with the next requests, which may be of other users
+        :return:
+        """
+        server = HTTPServer(('127.0.0.1', 0), SetCookieHandler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            url = 'http://127.0.0.1:{}/popular_tables/'.format(server.server_port)
+            with local_app.app_context():
+                for _ in range(2):
+                    self.assertEqual(request_metadata(url=url).status_code, 200)
+
+            self.assertEqual(SetCookieHandler.received_cookies, [None, None])
+        finally:
+            close_sessions()
+            server.shutdown()
+            server.server_close()
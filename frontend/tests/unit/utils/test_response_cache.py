@@ -0,0 +1,152 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import unittest
+from http import HTTPStatus
+from unittest.mock import patch
+
+import responses
+
+from amundsen_application import create_app
+from amundsen_application.api.metadata.v0 import TABLE_ENDPOINT
+from amundsen_application.api.utils.response_cache import InMemoryResponseCache, invalidate_cached_responses, \
+    request_metadata_cached, table_namespace
+
+local_app = create_app('amundsen_application.config.TestConfig', 'tests/templates')
+
+IN_MEMORY_CACHE_CONFIG = {
+    'RESPONSE_CACHE': 'amundsen_application.api.utils.response_cache.InMemoryResponseCache',
+    'RESPONSE_CACHE_MAX_SIZE': 10,
+}
+
+
+class InMemoryResponseCacheTest(unittest.TestCase):
+    def test_lru_eviction(self) -> None:
+        """
+        Verify that the least recently used value is evicted once the cache is full
+        :return:
+        """
+        with local_app.app_context(), patch.dict(local_app.config, {'RESPONSE_CACHE_MAX_SIZE': 2}):
+            cache = InMemoryResponseCache()
+            cache.set('a', '1')
+            cache.set('b', '2')
+            self.assertEqual(cache.get('a'), '1')
+            cache.set('c', '3')
+
+            self.assertEqual(cache.get('a'), '1')
+            self.assertIsNone(cache.get('b'))
+            self.assertEqual(cache.get('c'), '3')
+
+    def test_ttl(self) -> None:
+        """
+        Verify that a value expires after its ttl
+        :return:
+        """
+        with local_app.app_context():
+            cache = InMemoryResponseCache()
+            with patch('amundsen_application.api.utils.response_cache.time.monotonic', return_value=100):
+                cache.set('a', '1', ttl_sec=10)
+                cache.set('b', '2')
+            with patch('amundsen_application.api.utils.response_cache.time.monotonic', return_value=110):
+                self.assertIsNone(cache.get('a'))
+                self.assertEqual(cache.get('b'), '2')
+
+
+class ResponseCacheTest(unittest.TestCase):
+    def setUp(self) -> None:
+        local_app.extensions.pop('response_cache', None)
+        self.table_key = 'db://cluster.schema/table'
+        self.url = local_app.config['METADATASERVICE_BASE'] + TABLE_ENDPOINT + '/' + self.table_key
+
+    def tearDown(self) -> None:
+        local_app.extensions.pop('response_cache', None)
+
+    @responses.activate
+    def test_cache_disabled(self) -> None:
+        """
+        Verify that every request is sent to the metadata service if the cache is not configured
+        :return:
+        """
+        responses.add(responses.GET, self.url, json={'name': 'table'}, status=HTTPStatus.OK)
+
+        with local_app.app_context():
+            for _ in range(2):
+                request_metadata_cached(url=self.url, namespace=table_namespace(self.table_key))
+
+        self.assertEqual(len(responses.calls), 2)
+
+    @responses.activate
+    def test_cached_response(self) -> None:
+        """
+        Verify that a successful response is served from the cache, until its namespace is invalidated
+        :return:
+        """
+        responses.add(responses.GET, self.url, json={'name': 'table'}, status=HTTPStatus.OK)
+
+        with local_app.app_context(), patch.dict(local_app.config, IN_MEMORY_CACHE_CONFIG):
+            namespace = table_namespace(self.table_key)
+            for _ in range(2):
+                response = request_metadata_cached(url=self.url, namespace=namespace)
+                self.assertEqual(response.status_code, HTTPStatus.OK)
+                self.assertEqual(response.json(), {'name': 'table'})
+            self.assertEqual(len(responses.calls), 1)
+
+            invalidate_cached_responses(namespace)
+            request_metadata_cached(url=self.url, namespace=namespace)
+            self.assertEqual(len(responses.calls), 2)
+
+    @responses.activate
+    def test_failed_response_not_cached(self) -> None:
+        """
+        Verify that an unsuccessful response is not cached
+        :return:
+        """
+        responses.add(responses.GET, self.url, json={}, status=HTTPStatus.INTERNAL_SERVER_ERROR)
+
+        with local_app.app_context(), patch.dict(local_app.config, IN_MEMORY_CACHE_CONFIG):
+            for _ in range(2):
+                response = request_metadata_cached(url=self.url, namespace=table_namespace(self.table_key))
+                self.assertEqual(response.status_code, HTTPStatus.INTERNAL_SERVER_ERROR)
+
+        self.assertEqual(len(responses.calls), 2)
+
+    @responses.activate
+    def test_cache_key_headers(self) -> None:
+        """
+        Verify that responses are cached per value of the configured headers
+        :return:
+        """
+        responses.add(responses.GET, self.url, json={'name': 'table'}, status=HTTPStatus.OK)
+        config = dict(IN_MEMORY_CACHE_CONFIG, RESPONSE_CACHE_KEY_HEADERS=['Authorization'])
+
+        with local_app.app_context(), patch.dict(local_app.config, config):
+            for headers in [{'Authorization': 'user1', 'X-Request-Id': '1'},
+                            {'Authorization': 'user1', 'X-Request-Id': '2'},
+                            {'Authorization': 'user2', 'X-Request-Id': '3'}]:
+                local_app.config['METADATASERVICE_REQUEST_HEADERS'] = headers
+                request_metadata_cached(url=self.url, namespace=table_namespace(self.table_key))
+            local_app.config['METADATASERVICE_REQUEST_HEADERS'] = None
+
+        self.assertEqual(len(responses.calls), 2)
+
+    @responses.activate
+    def test_read_your_writes(self) -> None:
+        """
+        Verify that updating the table description invalidates the cached table metadata
+        :return:
+        """
+        responses.add(responses.GET, self.url, json={}, status=HTTPStatus.OK)
+        responses.add(responses.PUT, self.url + '/description', json={}, status=HTTPStatus.OK)
+
+        with patch.dict(local_app.config, IN_MEMORY_CACHE_CONFIG), \
+                patch('amundsen_application.api.metadata.v0.marshall_table_full', return_value={}), \
+                local_app.test_client() as test:
+            for _ in range(2):
+                test.get('/api/metadata/v0/table', query_string=dict(key=self.table_key))
+            self.assertEqual(len(responses.calls), 1)
+
+            test.put('/api/metadata/v0/put_table_description',
+                     json={'key': self.table_key, 'description': 'test', 'source': 'source'})
+            test.get('/api/metadata/v0/table', query_string=dict(key=self.table_key))
+
+        self.assertEqual([call.request.method for call in responses.calls], ['GET', 'PUT', 'GET'])
@@ -39,6 +39,32 @@ class TableDetailAPI(Resource):
             return {'message': 'table_uri {} does not exist'.format(table_uri)}, HTTPStatus.NOT_FOUND
 
 
+class TablesAPI(Resource):
+    """
+    Tables API to get the details of several tables at once
+    """
+
+    def __init__(self) -> None:
+        self.client = get_proxy_client()
+
+    @swag_from('swagger_doc/table/tables_post.yml')
+    def post(self) -> Iterable[Union[Mapping, int, None]]:
+        """
+        Gets the tables of the table URIs in the request body, e.g. {"table_uris": ["hive://gold.test_schema/test"]}
+
+        :return: The details of the tables by table URI, and the table URIs that do not exist
+        """
+        table_uris = (request.get_json(silent=True) or {}).get('table_uris')
+        if not isinstance(table_uris, list) or not all(isinstance(table_uri, str) for table_uri in table_uris):
+            return {'message': 'table_uris must be a list of table URIs'}, HTTPStatus.BAD_REQUEST
+
+        tables = self.client.get_tables(table_uris=table_uris)
+        schema = TableSchema()
+        return {'tables': {table_uri: schema.dump(table) for table_uri, table in tables.items()},
+                'not_found': [table_uri for table_uri in dict.fromkeys(table_uris) if table_uri not in tables]
+                }, HTTPStatus.OK
+
+
 class TableLineageAPI(Resource):
     def __init__(self) -> None:
         self.client = get_proxy_client()
@@ -29,6 +29,18 @@ PROXY_CLIENTS = {
 IS_STATSD_ON = 'IS_STATSD_ON'
 USER_OTHER_KEYS = 'USER_OTHER_KEYS'
 
+# Proxy cache configuration keys
+PROXY_CACHE = 'PROXY_CACHE'
+PROXY_CACHE_MAX_SIZE = 'PROXY_CACHE_MAX_SIZE'
+PROXY_CACHE_DIRECTORY = 'PROXY_CACHE_DIRECTORY'
+PROXY_CACHE_EXPIRE_SEC = 'PROXY_CACHE_EXPIRE_SEC'
+PROXY_CACHE_REFRESH_SEC = 'PROXY_CACHE_REFRESH_SEC'
+
+PROXY_CACHES = {
+    'MEMORY': 'metadata_service.proxy.cache.MemoryCache',
+    'FILE': 'metadata_service.proxy.cache.FileCache'
+}
+
 
 class Config:
     LOG_FORMAT = '%(asctime)s.%(msecs)03d [%(levelname)s] %(module)s.%(funcName)s:%(lineno)d (%(process)d:' \
@@ -71,6 +83,11 @@ class Config:
 
     # Number of minimum reader count to qualify for popular table
     POPULAR_TABLE_MINIMUM_READER_COUNT = 10  # type: int
+    # Number of popular tables computed and cached at once by the Gremlin proxies, so that the requests for fewer
+    # tables are served from the same result
+    POPULAR_TABLE_PRECOMPUTED_COUNT = 100  # type: int
+    # Whether the Gremlin proxies compute the popular tables in the background when they are created
+    POPULAR_TABLE_WARM_UP = True  # type: bool
 
     # List of regexes which will exclude certain parameters from appearing as Programmatic Descriptions
     PROGRAMMATIC_DESCRIPTIONS_EXCLUDE_FILTERS = []  # type: list
@@ -79,6 +96,30 @@ class Config:
     # or num of retries
     PROXY_CLIENT_KWARGS: Dict = dict()
 
+    # Cache of the proxy results, see metadata_service.proxy.cache. The MEMORY cache is private to each process,
+    # while the FILE cache in PROXY_CACHE_DIRECTORY is shared by the processes of the host. The directory needs to be
+    # owned by the user of the metadata service, with mode 700. The MEMORY cache only holds the popular tables and
+    # the glossary, since the tables, tags, badges and statistics are invalidated by the updates of a single process.
+    # Set the PROXY_CACHE environment variable to NONE to disable the cache.
+    PROXY_CACHE = PROXY_CACHES.get(os.environ.get('PROXY_CACHE', 'MEMORY'))  # type: Optional[str]
+    PROXY_CACHE_MAX_SIZE = 1000  # type: int
+    PROXY_CACHE_DIRECTORY = os.environ.get('PROXY_CACHE_DIRECTORY')  # type: Optional[str]
+    # Number of seconds before the cached results expire by category, None meaning they do not expire. The results
+    # are invalidated by the updates made through the metadata service, but not by the ones of the databuilder.
+    PROXY_CACHE_EXPIRE_SEC = {
+        'popular_tables': 11 * 60 * 60,
+        'table': 60,
+        'tags': 5 * 60,
+        'badges': 5 * 60,
+        'statistics': 60 * 60,
+        'glossary': 11 * 60 * 60,
+    }  # type: Dict[str, Optional[int]]
+    # Number of seconds before the cached results are computed again in the background by category. The outdated
+    # results are returned meanwhile, so the requests don't wait for the expensive queries.
+    PROXY_CACHE_REFRESH_SEC = {
+        'popular_tables': 60 * 60,
+    }  # type: Dict[str, int]
+
     SWAGGER_TEMPLATE_PATH = os.path.join('api', 'swagger_doc', 'template.yml')
     SWAGGER = {
         'openapi': '3.0.2',
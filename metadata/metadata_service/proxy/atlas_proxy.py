@@ -5,7 +5,6 @@ import datetime
 import logging
 import re
 from operator import attrgetter
-from random import randint
 from typing import Any, Dict, Generator, List, Optional, Pattern, Tuple, Union
 
 from amundsen_common.models.dashboard import DashboardSummary
@@ -17,15 +16,15 @@ from amundsen_common.models.table import (Badge, Column,
                                           User, Watermark)
 from amundsen_common.models.user import User as UserEntity
 from apache_atlas.client.base_client import AtlasClient
+from apache_atlas.client.entity import EntityClient
 from apache_atlas.model.glossary import (AtlasGlossary, AtlasGlossaryHeader,
                                          AtlasGlossaryTerm)
-from apache_atlas.model.instance import (AtlasEntityHeader,
+from apache_atlas.model.instance import (AtlasEntitiesWithExtInfo,
+                                         AtlasEntityHeader,
                                          AtlasEntityWithExtInfo,
                                          AtlasRelatedObjectId)
 from apache_atlas.model.relationship import AtlasRelationship
 from apache_atlas.utils import type_coerce
-from beaker.cache import CacheManager
-from beaker.util import parse_cache_config_options
 from flask import current_app as app
 from werkzeug.exceptions import BadRequest
 
@@ -36,12 +35,16 @@ from metadata_service.entity.resource_type import ResourceType
 from metadata_service.entity.tag_detail import TagDetail
 from metadata_service.exception import NotFoundException
 from metadata_service.proxy import BaseProxy
+from metadata_service.proxy.cache import (BADGES_CACHE, GLOSSARY_CACHE,
+                                          POPULAR_TABLES_CACHE, TABLE_CACHE,
+                                          TAGS_CACHE, cached, invalidate,
+                                          invalidate_resource, table_namespace)
 from metadata_service.util import UserResourceRel
 
 LOGGER = logging.getLogger(__name__)
 
-# Expire cache every 11 hours + jitter
-_ATLAS_PROXY_CACHE_EXPIRY_SEC = 11 * 60 * 60 + randint(0, 3600)
+# Maximum number of tables per request of get_tables
+_GET_TABLES_BATCH_SIZE = 100
 
 
 class Status:
@@ -146,9 +149,6 @@ class AtlasProxy(BaseProxy):
     # Qualified Name of the Glossary, that holds the user defined terms.
     # For Amundsen, we are using Glossary Terms as the Tags.
     AMUNDSEN_USER_TAGS = 'amundsen_user_tags'
-    _CACHE = CacheManager(**parse_cache_config_options({'cache.regions': 'atlas_proxy',
-                                                        'cache.atlas_proxy.type': 'memory',
-                                                        'cache.atlas_proxy.expire': _ATLAS_PROXY_CACHE_EXPIRY_SEC}))
 
     def __init__(self, *,
                  host: str,
@@ -460,6 +460,7 @@ class AtlasProxy(BaseProxy):
     def get_users(self) -> List[UserEntity]:
         pass
 
+    @cached(TABLE_CACHE, key_kwarg='table_uri')
     def get_table(self, *, table_uri: str) -> Table:
         """
         Gathers all the information needed for the Table Detail Page.
@@ -468,6 +469,62 @@ class AtlasProxy(BaseProxy):
         or gathered from different entities.
         """
         entity = self._get_table_entity(table_uri=table_uri)
+        return self._serialize_table(entity=entity, table_uri=table_uri)
+
+    def get_tables(self, *, table_uris: List[str]) -> Dict[str, Table]:
+        """
+        Gets the table entities with one request per table type, for up to _GET_TABLES_BATCH_SIZE tables each.
+        :param table_uris: Table URIs
+        :return: Tables by table URI, without the table URIs that do not exist
+        """
+        table_uris_by_type: Dict[str, Dict[str, str]] = {}
+        for table_uri in dict.fromkeys(table_uris):
+            table_info = self._extract_info_from_uri(table_uri=table_uri)
+            if not table_info:
+                continue
+            table_qn = make_table_qualified_name(table_info.get('name', ''),
+                                                 table_info.get('cluster'),
+                                                 table_info.get('db')
+                                                 )
+            table_uris_by_type.setdefault(table_info['entity'], {})[table_qn] = table_uri
+
+        entities_by_uri = {}
+        for type_name, table_uris_by_qn in table_uris_by_type.items():
+            table_qns = list(table_uris_by_qn)
+            for i in range(0, len(table_qns), _GET_TABLES_BATCH_SIZE):
+                entities = self._get_table_entities(type_name=type_name,
+                                                    table_qns=table_qns[i:i + _GET_TABLES_BATCH_SIZE])
+                for table_entity in entities.entities or list():
+                    entity_table_uri = table_uris_by_qn.get(table_entity[self.ATTRS_KEY].get(self.QN_KEY))
+                    if entity_table_uri is not None:
+                        entities_by_uri[entity_table_uri] = AtlasEntityWithExtInfo({
+                            'entity': table_entity,
+                            'referredEntities': entities.referredEntities or dict()
+                        })
+
+        return {table_uri: self._serialize_table(entity=entities_by_uri[table_uri], table_uri=table_uri)
+                for table_uri in dict.fromkeys(table_uris) if table_uri in entities_by_uri}
+
+    def _get_table_entities(self, *, type_name: str, table_qns: List[str]) -> AtlasEntitiesWithExtInfo:
+        """
+        Fetches the table entities of the qualified names that exist, with a single request
+        :param type_name: Type of the table entities, e.g. hive_table
+        :param table_qns: Qualified names of the tables
+        :return: The table entities, along with their referred entities
+        """
+        # EntityClient.get_entities_by_attribute of apache_atlas 0.0.11 fails to build the query parameters of
+        # this endpoint, hence the direct call
+        query_params = {f'attr_{i}:{self.QN_KEY}': table_qn for i, table_qn in enumerate(table_qns)}
+        return self.client.call_api(EntityClient.GET_ENTITIES_BY_UNIQUE_ATTRIBUTE.format_path_with_params(type_name),
+                                    AtlasEntitiesWithExtInfo, query_params)
+
+    def _serialize_table(self, *, entity: AtlasEntityWithExtInfo, table_uri: str) -> Table:
+        """
+        Serializes the table entity, and the entities it refers to, using the Table model.
+        :param entity: AtlasEntityWithExtInfo object of the table
+        :param table_uri:
+        :return: A Table object
+        """
         table_details = entity.entity
 
         try:
@@ -639,6 +696,8 @@ class AtlasProxy(BaseProxy):
                 LOGGER.exception('Error while removing table data owner. {}'
                                  .format(str(ex)))
 
+        invalidate(table_namespace(table_uri))
+
     def add_owner(self, *, table_uri: str, owner: str) -> None:
         """
         Query on Atlas User entity to find if the entity exist for the
@@ -685,6 +744,8 @@ class AtlasProxy(BaseProxy):
             raise BadRequest(f'User {owner} is already added as a data owner for '
                              f'table {table_uri}.')
 
+        invalidate(table_namespace(table_uri))
+
     def get_table_description(self, *,
                               table_uri: str) -> Union[str, None]:
         """
@@ -708,8 +769,9 @@ class AtlasProxy(BaseProxy):
         self.client.entity.partial_update_entity_by_guid(
             entity_guid=table.entity.get("guid"), attr_value=description, attr_name='description'
         )
+        invalidate(table_namespace(table_uri))
 
-    @_CACHE.cache('_get_user_defined_glossary_guid')
+    @cached(GLOSSARY_CACHE)
     def _get_user_defined_glossary_guid(self) -> str:
         """
         This function look for a user defined glossary i.e., self.ATLAS_USER_DEFINED_TERMS
@@ -730,7 +792,7 @@ class AtlasProxy(BaseProxy):
         glossary = self.client.glossary.create_glossary(glossary_def)
         return glossary.guid
 
-    @_CACHE.cache('_get_create_glossary_term')
+    @cached(GLOSSARY_CACHE)
     def _get_create_glossary_term(self, term_name: str) -> Union[AtlasGlossaryTerm, AtlasEntityHeader]:
         """
         Since Atlas does not provide any API to find a term directly by a qualified name,
@@ -775,6 +837,7 @@ class AtlasProxy(BaseProxy):
         related_entity = AtlasRelatedObjectId({self.GUID_KEY: entity.entity[self.GUID_KEY],
                                                "typeName": resource_type.name})
         self.client.glossary.assign_term_to_entities(term.guid, [related_entity])
+        invalidate_resource(TAGS_CACHE, id=id, resource_type=resource_type)
 
     def add_badge(self, *, id: str, badge_name: str, category: str = '',
                   resource_type: ResourceType) -> None:
@@ -800,7 +863,9 @@ class AtlasProxy(BaseProxy):
         for item in assigned_entities or list():
             if item.get(self.GUID_KEY) == entity.entity[self.GUID_KEY]:
                 related_entity = AtlasRelatedObjectId(item)
-                return self.client.glossary.disassociate_term_from_entities(term.guid, [related_entity])
+                self.client.glossary.disassociate_term_from_entities(term.guid, [related_entity])
+                invalidate_resource(TAGS_CACHE, id=id, resource_type=resource_type)
+                return
 
     def delete_badge(self, *, id: str, badge_name: str, category: str,
                      resource_type: ResourceType) -> None:
@@ -825,6 +890,7 @@ class AtlasProxy(BaseProxy):
         self.client.entity.partial_update_entity_by_guid(
             entity_guid=col_guid, attr_value=description, attr_name='description'
         )
+        invalidate(table_namespace(table_uri))
 
     def get_column_description(self, *,
                                table_uri: str,
@@ -868,6 +934,7 @@ class AtlasProxy(BaseProxy):
 
         return popular_tables
 
+    @cached(POPULAR_TABLES_CACHE)
     def get_popular_tables(self, *,
                            num_entries: int,
                            user_id: Optional[str] = None) -> List[PopularTable]:
@@ -899,6 +966,7 @@ class AtlasProxy(BaseProxy):
         # Not implemented
         pass
 
+    @cached(TAGS_CACHE)
     def get_tags(self) -> List:
         """
         Fetch all the glossary terms from atlas, along with their assigned entities as this
@@ -924,6 +992,7 @@ class AtlasProxy(BaseProxy):
             )
         return tags
 
+    @cached(BADGES_CACHE)
     def get_badges(self) -> List:
         badges = list()
 
@@ -14,6 +14,7 @@ from metadata_service.entity.dashboard_detail import \
     DashboardDetail as DashboardDetailEntity
 from metadata_service.entity.description import Description
 from metadata_service.entity.resource_type import ResourceType
+from metadata_service.exception import NotFoundException
 from metadata_service.util import UserResourceRel
 
 
@@ -47,6 +48,22 @@ class BaseProxy(metaclass=ABCMeta):
     def get_table(self, *, table_uri: str) -> Table:
         pass
 
+    def get_tables(self, *, table_uris: List[str]) -> Dict[str, Table]:
+        """
+        Gets the tables of the table URIs. Proxies override it to fetch the tables with a bounded number of
+        queries, instead of one get_table call per table URI.
+
+        :param table_uris: Table URIs
+        :return: Tables by table URI, without the table URIs that do not exist
+        """
+        tables = {}
+        for table_uri in table_uris:
+            try:
+                tables[table_uri] = self.get_table(table_uri=table_uri)
+            except NotFoundException:
+                pass
+        return tables
+
     @abstractmethod
     def delete_owner(self, *, table_uri: str, owner: str) -> None:
         pass
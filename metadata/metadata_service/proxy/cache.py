@@ -0,0 +1,380 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import functools
+import hashlib
+import logging
+import os
+import pickle
+import stat
+import tempfile
+import threading
+import time
+import uuid
+from abc import ABCMeta, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import (Any, Callable, Optional, Set, Tuple, TypeVar,  # noqa: F401
+                    cast)
+
+from flask import current_app, has_app_context
+from werkzeug.utils import import_string
+
+from metadata_service import config
+from metadata_service.entity.resource_type import ResourceType
+from metadata_service.proxy.statsd_utilities import _get_statsd_client
+
+LOGGER = logging.getLogger(__name__)
+
+# Categories of cached proxy results, whose expiry is configured by PROXY_CACHE_EXPIRE_SEC
+POPULAR_TABLES_CACHE = 'popular_tables'
+TABLE_CACHE = 'table'
+TAGS_CACHE = 'tags'
+BADGES_CACHE = 'badges'
+STATISTICS_CACHE = 'statistics'
+GLOSSARY_CACHE = 'glossary'
+# Categories invalidated by the updates made through the metadata service. They are only cached by a shared cache,
+# otherwise an update handled by one process would leave the outdated results cached by the others.
+_INVALIDATED_CATEGORIES = {TABLE_CACHE, TAGS_CACHE, BADGES_CACHE, STATISTICS_CACHE}
+
+_KEY_PREFIX = 'amundsen_metadata'
+_EXTENSION_NAME = 'proxy_cache'
+_extension_lock = threading.Lock()
+
+# keys of the values being refreshed in the background by this process
+_refreshing = set()  # type: Set[str]
+_refresh_lock = threading.Lock()
+_refresh_executor = None  # type: Optional[ThreadPoolExecutor]
+
+F = TypeVar('F', bound=Callable)
+
+
+class BaseCache(metaclass=ABCMeta):
+    """
+    Stores the results of proxy methods. Implementations are instantiated once per application, within the application
+    context, and called from concurrent requests, so they need to be thread-safe.
+    """
+
+    # Whether the cache is shared by all the processes serving the metadata service, so that invalidating a value in
+    # one process invalidates it for the others
+    SHARED = False
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Returns the value stored under the key, or None if it's missing or expired
+        :param key:
+        :return:
+        """
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value: Any, expire_sec: Optional[int] = None) -> None:
+        """
+        Stores the value under the key
+        :param key:
+        :param value: A picklable value
+        :param expire_sec: Number of seconds before the value expires, or None if it does not expire. The cache may
+        still evict the value earlier.
+        :return:
+        """
+        pass
+
+
+class MemoryCache(BaseCache):
+    """
+    A least recently used cache in the memory of the process, holding up to PROXY_CACHE_MAX_SIZE values
+    """
+
+    def __init__(self) -> None:
+        self._max_size = current_app.config[config.PROXY_CACHE_MAX_SIZE]
+        self._entries = OrderedDict()  # type: OrderedDict[str, Tuple[Optional[float], Any]]
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, expire_sec: Optional[int] = None) -> None:
+        expires_at = time.monotonic() + expire_sec if expire_sec is not None else None
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+
+class FileCache(BaseCache):
+    """
+    A cache shared by the processes of the host, e.g. the gunicorn workers, which stores each value in a file of
+    PROXY_CACHE_DIRECTORY. It holds up to PROXY_CACHE_MAX_SIZE values, evicting the least recently used ones.
+    The values are pickled, so the directory must be owned by the user of the metadata service, with mode 0o700.
+    """
+
+    SHARED = True
+
+    def __init__(self) -> None:
+        self._directory = current_app.config[config.PROXY_CACHE_DIRECTORY]
+        self._max_size = current_app.config[config.PROXY_CACHE_MAX_SIZE]
+        if not self._directory:
+            raise ValueError('PROXY_CACHE_DIRECTORY needs to be configured for the file cache')
+
+        os.makedirs(self._directory, mode=0o700, exist_ok=True)
+        # the mode of makedirs is not applied to an existing directory, nor beyond the umask
+        directory_stat = os.stat(self._directory)
+        if directory_stat.st_uid != os.getuid():
+            raise ValueError('The proxy cache directory {} is not owned by the current user'.format(self._directory))
+        if stat.S_IMODE(directory_stat.st_mode) != 0o700:
+            raise ValueError('The proxy cache directory {} has mode {:o} instead of 700'
+                             .format(self._directory, stat.S_IMODE(directory_stat.st_mode)))
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self._directory, hashlib.sha256(key.encode('utf-8')).hexdigest())
+
+    def get(self, key: str) -> Optional[Any]:
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                expires_at, value = pickle.load(f)
+            if expires_at is not None and expires_at <= time.time():
+                os.remove(path)
+                return None
+
+            # the modification time orders the values by last use, for the eviction
+            os.utime(path)
+            return value
+        except (OSError, EOFError, pickle.UnpicklingError):
+            # missing, or removed by another process in the meantime
+            return None
+
+    def set(self, key: str, value: Any, expire_sec: Optional[int] = None) -> None:
+        expires_at = time.time() + expire_sec if expire_sec is not None else None
+        # write then rename, so that other processes never read a partial value
+        fd, temp_path = tempfile.mkstemp(dir=self._directory, prefix='.')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump((expires_at, value), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, self._path(key))
+        except Exception:
+            os.remove(temp_path)
+            raise
+
+        self._evict()
+
+    def _evict(self) -> None:
+        entries = []
+        for entry in os.scandir(self._directory):
+            if entry.name.startswith('.'):
+                continue
+            try:
+                entries.append((entry.stat().st_mtime, entry.path))
+            except OSError:
+                pass
+
+        if len(entries) <= self._max_size:
+            return
+
+        entries.sort()
+        for _, path in entries[:len(entries) - self._max_size]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def get_cache() -> Optional[BaseCache]:
+    """
+    Returns the cache of the application, or None if there is no application context or PROXY_CACHE is not configured
+    """
+    if not has_app_context():
+        return None
+
+    class_path = current_app.config.get(config.PROXY_CACHE)
+    if not class_path:
+        return None
+
+    with _extension_lock:
+        cache = current_app.extensions.get(_EXTENSION_NAME)
+        if cache is None:
+            LOGGER.info('Instantiate proxy cache {}'.format(class_path))
+            cache = import_string(class_path)()
+            current_app.extensions[_EXTENSION_NAME] = cache
+        return cache
+
+
+def _digest(*parts: Any) -> str:
+    return hashlib.sha256(repr(parts).encode('utf-8')).hexdigest()
+
+
+def _version_key(namespace: str) -> str:
+    return '{0}:version:{1}'.format(_KEY_PREFIX, _digest(namespace))
+
+
+def _get_version(cache: BaseCache, namespace: str) -> str:
+    """
+    Returns the current version of the namespace, which is part of the keys of its values. A new version is set when
+    the namespace is invalidated, or when the version has been evicted, so outdated values are never returned.
+    """
+    key = _version_key(namespace)
+    version = cache.get(key)
+    if version is None:
+        version = uuid.uuid4().hex
+        cache.set(key, version)
+    return version
+
+
+def table_namespace(table_uri: str) -> str:
+    return '{0}:{1}'.format(TABLE_CACHE, table_uri)
+
+
+def _compute(f: Callable, args: Any, kwargs: Any, cache: BaseCache, key: str, category: str) -> Any:
+    value = f(*args, **kwargs)
+    # the value is wrapped in a tuple, so that None results are cached as well
+    cache.set(key, (value, time.time()), current_app.config[config.PROXY_CACHE_EXPIRE_SEC].get(category))
+    return value
+
+
+def _refresh(app: Any, f: Callable, args: Any, kwargs: Any, cache: BaseCache, key: str, category: str) -> None:
+    try:
+        with app.app_context():
+            _compute(f, args, kwargs, cache, key, category)
+    except Exception:
+        # the outdated value is served until the next attempt
+        LOGGER.exception('Failed to refresh the cached {}'.format(category))
+    finally:
+        with _refresh_lock:
+            _refreshing.discard(key)
+
+
+def _get_refresh_executor() -> ThreadPoolExecutor:
+    global _refresh_executor
+
+    with _refresh_lock:
+        if _refresh_executor is None:
+            _refresh_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='proxy_cache_refresh')
+        return _refresh_executor
+
+
+def _refresh_in_background(f: Callable, args: Any, kwargs: Any, cache: BaseCache, key: str, category: str) -> None:
+    """
+    Computes the value again in a background thread, unless this process is already doing so
+    """
+    with _refresh_lock:
+        if key in _refreshing:
+            return
+        _refreshing.add(key)
+
+    _get_refresh_executor().submit(_refresh, current_app._get_current_object(), f, args, kwargs, cache, key,
+                                   category)
+
+
+def _get_key(cache: BaseCache, f: Callable, category: str, key_kwarg: Optional[str], args: Any, kwargs: Any) -> str:
+    namespace = category if key_kwarg is None else '{0}:{1}'.format(category, kwargs[key_kwarg])
+    return '{0}:value:{1}:{2}'.format(_KEY_PREFIX, _get_version(cache, namespace),
+                                      _digest(f.__module__, f.__qualname__, args[1:], sorted(kwargs.items())))
+
+
+def cached(category: str, *, key_kwarg: Optional[str] = None) -> Callable[[F], F]:
+    """
+    A proxy method decorator that caches the results by arguments, for PROXY_CACHE_EXPIRE_SEC[category] seconds or
+    until they are invalidated. The proxy is a singleton, so self is not part of the cache key.
+    Results older than PROXY_CACHE_REFRESH_SEC[category] seconds are still returned, but computed again in the
+    background, so that the requests don't wait for expensive queries once the results are cached.
+    Emits the statsd counters metadata_service.proxy.cache.<category>.hit, .miss and .refresh if config.IS_STATSD_ON.
+    The categories invalidated by updates, e.g. TABLE_CACHE, are not cached unless the cache is SHARED.
+
+    :param category: e.g. TAGS_CACHE
+    :param key_kwarg: Name of the keyword argument that scopes the results, e.g. table_uri. The results are invalidated
+    per value of the argument, instead of for the whole category.
+    :return:
+    """
+    def decorator(f: F) -> F:
+        @functools.wraps(f)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            cache = get_cache()
+            if cache is None or (category in _INVALIDATED_CATEGORIES and not cache.SHARED):
+                return f(*args, **kwargs)
+
+            key = _get_key(cache, f, category, key_kwarg, args, kwargs)
+            statsd_client = _get_statsd_client(prefix=__name__)
+
+            entry = cache.get(key)
+            if entry is not None:
+                value, computed_at = entry
+                if statsd_client:
+                    statsd_client.incr('{}.hit'.format(category))
+
+                refresh_sec = current_app.config.get(config.PROXY_CACHE_REFRESH_SEC, {}).get(category)
+                if refresh_sec is not None and computed_at + refresh_sec <= time.time():
+                    if statsd_client:
+                        statsd_client.incr('{}.refresh'.format(category))
+                    _refresh_in_background(f, args, kwargs, cache, key, category)
+                return value
+
+            if statsd_client:
+                statsd_client.incr('{}.miss'.format(category))
+            return _compute(f, args, kwargs, cache, key, category)
+
+        return cast(F, wrapper)
+
+    return decorator
+
+
+def _warm_up(app: Any, f: Callable, args: Any, kwargs: Any) -> None:
+    try:
+        with app.app_context():
+            f(*args, **kwargs)
+    except Exception:
+        LOGGER.exception('Failed to warm up the cached {}'.format(f.__qualname__))
+
+
+def warm_up(f: Callable, *args: Any, **kwargs: Any) -> None:
+    """
+    Calls a @cached proxy method in the background, e.g. when the proxy is created, so that the first request finds
+    its result in the cache
+    :param f: The @cached method, bound to the proxy
+    :return:
+    """
+    if get_cache() is None:
+        return
+
+    _get_refresh_executor().submit(_warm_up, current_app._get_current_object(), f, args, kwargs)
+
+
+def invalidate(*namespaces: str) -> None:
+    """
+    Invalidates the cached results of the namespaces, after they have been updated
+    :param namespaces: Categories, e.g. TAGS_CACHE, or namespaces of a key_kwarg value, e.g. table_namespace(table_uri)
+    :return:
+    """
+    cache = get_cache()
+    if cache is None:
+        return
+
+    for namespace in namespaces:
+        cache.set(_version_key(namespace), uuid.uuid4().hex)
+
+
+def invalidate_resource(*namespaces: str, id: str, resource_type: ResourceType) -> None:
+    """
+    Invalidates the cached results of the namespaces, and the cached table of the table or column resource
+    :param namespaces: Categories affected by the update, e.g. TAGS_CACHE
+    :param id: Table URI, or column key as table_uri/column_name
+    :param resource_type:
+    :return:
+    """
+    if resource_type == ResourceType.Table:
+        namespaces += (table_namespace(id),)
+    elif resource_type == ResourceType.Column:
+        namespaces += (table_namespace(id.rsplit('/', 1)[0]),)
+    invalidate(*namespaces)
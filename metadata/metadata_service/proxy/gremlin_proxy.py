@@ -31,6 +31,7 @@ from amundsen_gremlin.neptune_bulk_loader.gremlin_model_converter import \
 from amundsen_gremlin.script_translator import (
     ScriptTranslator, ScriptTranslatorTargetJanusgraph)
 from amundsen_gremlin.test_and_development_shard import get_shard
+from flask import current_app, has_app_context
 from gremlin_python.driver.client import Client
 from gremlin_python.driver.driver_remote_connection import \
     DriverRemoteConnection
@@ -39,8 +40,8 @@ from gremlin_python.process.anonymous_traversal import traversal
 from gremlin_python.process.graph_traversal import (GraphTraversal,
                                                     GraphTraversalSource, V,
                                                     __, bothV, coalesce,
-                                                    constant, has, inE, inV,
-                                                    outE, outV, select, unfold,
+                                                    constant, has, inE, outE,
+                                                    outV, select, unfold,
                                                     valueMap, values)
 from gremlin_python.process.traversal import Cardinality
 from gremlin_python.process.traversal import Column as MapColumn
@@ -58,6 +59,7 @@ from metadata_service.entity.description import Description
 from metadata_service.entity.resource_type import ResourceType
 from metadata_service.entity.tag_detail import TagDetail
 from metadata_service.exception import NotFoundException
+from metadata_service.proxy.cache import POPULAR_TABLES_CACHE, cached, warm_up
 from metadata_service.proxy.statsd_utilities import timer_with_counter
 from metadata_service.util import UserResourceRel
 
@@ -69,6 +71,9 @@ from .shared import checkNotNone, retrying
 __all__ = ['AbstractGremlinProxy', 'GenericGremlinProxy']
 
 LOGGER = logging.getLogger(__name__)
+
+# Maximum number of table keys per traversal of get_tables
+_GET_TABLES_BATCH_SIZE = 100
 PUBLISH_TAG_TIME_FORMAT: str = "%Y-%m-%d %H:%M"
 AMUNDSEN_TIMESTAMP_KEY: str = 'amundsen_updated_timestamp'
 
@@ -871,6 +876,9 @@ class AbstractGremlinProxy(BaseProxy):
 
         self._g: GraphTraversalSource = traversal().withRemote(self.remote_connection)
 
+        if has_app_context() and current_app.config.get('POPULAR_TABLE_WARM_UP'):
+            warm_up(self._get_global_popular_tables_uris, current_app.config['POPULAR_TABLE_PRECOMPUTED_COUNT'])
+
     def drop(self) -> None:
         LOGGER.warning('DROPPING ALL NODES')
         with self.query_executor() as executor:
@@ -1045,6 +1053,37 @@ class AbstractGremlinProxy(BaseProxy):
         cols = self._get_table_columns(table_uri=table_uri)
         readers = self._get_table_readers(table_uri=table_uri)
 
+        return self._make_table(result=result, cols=cols, readers=readers)
+
+    @timer_with_counter
+    @overrides
+    def get_tables(self, *, table_uris: List[str]) -> Dict[str, Table]:
+        """
+        Gets the tables with the traversals of get_table, each run on up to _GET_TABLES_BATCH_SIZE table URIs at once.
+        :param table_uris: Table URIs
+        :return: Tables by table URI, without the table URIs that do not exist
+        """
+        tables = {}
+        unique_table_uris = list(dict.fromkeys(table_uris))
+        for i in range(0, len(unique_table_uris), _GET_TABLES_BATCH_SIZE):
+            batch = unique_table_uris[i:i + _GET_TABLES_BATCH_SIZE]
+
+            results_by_key = self._get_tables_themselves(table_key=within(*batch))
+            if not results_by_key:
+                continue
+
+            found_table_uris = [table_uri for table_uri in batch if table_uri in results_by_key]
+            cols_by_key = self._get_columns_by_table(table_key=within(*found_table_uris))
+            readers_by_key = self._get_readers_by_table(table_key=within(*found_table_uris))
+
+            for table_uri in found_table_uris:
+                tables[table_uri] = self._make_table(result=results_by_key[table_uri],
+                                                     cols=cols_by_key.get(table_uri, []),
+                                                     readers=readers_by_key.get(table_uri, []))
+
+        return tables
+
+    def _make_table(self, *, result: Mapping[str, Any], cols: List[Column], readers: List[Reader]) -> Table:
         users_by_type: Dict[str, List[User]] = {}
         users_by_type['owner'] = _safe_get_list(result, f'all_owners', transform=self._convert_to_user) or []
 
@@ -1077,8 +1116,15 @@ class AbstractGremlinProxy(BaseProxy):
 
         return table
 
-    def _get_table_itself(self, *, table_uri: str) -> Mapping[str, Any]:
-        g = _V(g=self.g, label=VertexTypes.Table, key=table_uri).as_('table')
+    def _get_table_itself(self, *, table_uri: str) -> Optional[Mapping[str, Any]]:
+        return self._get_tables_themselves(table_key=table_uri).get(table_uri)
+
+    def _get_tables_themselves(self, *, table_key: Union[str, P]) -> Dict[str, Mapping[str, Any]]:
+        """
+        :param table_key: A table key, or a predicate on the table keys like within('foo','bar')
+        :return: The properties and neighbours of the tables by table key
+        """
+        g = _V(g=self.g, label=VertexTypes.Table, key=table_key, key_property_name=self.key_property_name).as_('table')
         g = g.coalesce(inE(EdgeTypes.Table.value.label).outV().
                        hasLabel(VertexTypes.Schema.value.label).fold()).as_('schema')
         g = g.coalesce(unfold().inE(EdgeTypes.Schema.value.label).outV().
@@ -1134,10 +1180,18 @@ class AbstractGremlinProxy(BaseProxy):
             by()
 
         results = self.query_executor()(query=g, get=FromResultSet.toList)
-        return _safe_get(results)
+        return {_safe_get(result, 'table', self.key_property_name): result for result in results}
 
     def _get_table_columns(self, *, table_uri: str) -> List[Column]:
-        g = _V(g=self.g, label=VertexTypes.Table.value.label, key=table_uri). \
+        return self._get_columns_by_table(table_key=table_uri).get(table_uri, [])
+
+    def _get_columns_by_table(self, *, table_key: Union[str, P]) -> Dict[str, List[Column]]:
+        """
+        :param table_key: A table key, or a predicate on the table keys like within('foo','bar')
+        :return: The columns of the tables by table key, for the tables with columns
+        """
+        g = _V(g=self.g, label=VertexTypes.Table.value.label, key=table_key,
+               key_property_name=self.key_property_name).as_('table'). \
             outE(EdgeTypes.Column.value.label). \
             inV().hasLabel(VertexTypes.Column.value.label).as_('column')
         g = g.coalesce(
@@ -1145,13 +1199,14 @@ class AbstractGremlinProxy(BaseProxy):
         ).as_('description')
         g = g.coalesce(select('column').outE(EdgeTypes.Stat.value.label).inV().
                        hasLabel(VertexTypes.Stat.value.label).fold()).as_('stats')
-        g = g.select('column', 'description', 'stats'). \
+        g = g.select('table', 'column', 'description', 'stats'). \
+            by(values(self.key_property_name)). \
             by(valueMap()). \
             by(unfold().valueMap().fold()). \
             by(unfold().valueMap().fold())
         results = self.query_executor()(query=g, get=FromResultSet.toList)
 
-        cols = []
+        cols_by_key: Dict[str, List[Column]] = {}
         for result in results:
             col = Column(name=_safe_get(result, 'column', 'name'),
                          key=_safe_get(result, 'column', self.key_property_name),
@@ -1159,29 +1214,37 @@ class AbstractGremlinProxy(BaseProxy):
                          col_type=_safe_get(result, 'column', 'col_type'),
                          sort_order=_safe_get(result, 'column', 'sort_order', transform=int),
                          stats=_safe_get_list(result, 'stats', transform=self._convert_to_statistics) or [])
-            cols.append(col)
-        cols = sorted(cols, key=attrgetter('sort_order'))
-        return cols
+            cols_by_key.setdefault(result['table'], []).append(col)
+        return {key: sorted(cols, key=attrgetter('sort_order')) for key, cols in cols_by_key.items()}
 
     def _get_table_readers(self, *, table_uri: str) -> List[Reader]:
-        g = _edges_to(g=self.g, vertex1_label=VertexTypes.Table, vertex1_key=table_uri,
-                      vertex2_label=VertexTypes.User, vertex2_key=None,
-                      edge_label=EdgeTypes.Read, date=gte(date.today() - timedelta(days=5)))
-        g = g.order().by(coalesce(__.values('read_count'), constant(0)), Order.decr).limit(5)
-        g = g.project('user', 'read', 'table')
-        g = g.by(outV().project('id', 'email').by(values('user_id')).by(values('email')))
-        g = g.by(coalesce(values('read_count'), constant(0)))
-        g = g.by(inV().values('name'))
+        return self._get_readers_by_table(table_key=table_uri).get(table_uri, [])
+
+    def _get_readers_by_table(self, *, table_key: Union[str, P]) -> Dict[str, List[Reader]]:
+        """
+        :param table_key: A table key, or a predicate on the table keys like within('foo','bar')
+        :return: The top 5 readers of the last 5 days of the tables by table key
+        """
+        reads = __.inE(EdgeTypes.Read.value.label).has('date', gte(date.today() - timedelta(days=5))). \
+            where(outV().hasLabel(VertexTypes.User.value.label))
+        reads = reads.order().by(coalesce(__.values('read_count'), constant(0)), Order.decr).limit(5)
+        reads = reads.project('user', 'read')
+        reads = reads.by(outV().project('id', 'email').by(values('user_id')).by(values('email')))
+        reads = reads.by(coalesce(values('read_count'), constant(0)))
+
+        g = _V(g=self.g, label=VertexTypes.Table, key=table_key, key_property_name=self.key_property_name)
+        g = g.project('table', 'reads').by(values(self.key_property_name)).by(reads.fold())
         results = self.query_executor()(query=g, get=FromResultSet.toList)
 
-        readers = []
+        readers_by_key = {}
         for result in results:
             # no need for _safe_get in here because the query
-            readers.append(Reader(
-                user=User(user_id=result['user']['id'], email=result['user']['email']),
-                read_count=int(result['read'])))
+            readers_by_key[result['table']] = [
+                Reader(user=User(user_id=read['user']['id'], email=read['user']['email']),
+                       read_count=int(read['read']))
+                for read in result['reads']]
 
-        return readers
+        return readers_by_key
 
     @timer_with_counter
     @overrides
@@ -1391,10 +1454,11 @@ class AbstractGremlinProxy(BaseProxy):
         it will utilize cached method _get_popular_tables_uris.
 
         :param num_entries:
+        :param user_id: Personalizes the popular tables for the user, if provided
         :return: Iterable of PopularTable
         """
 
-        table_uris = self._get_popular_tables_uris(num_entries)
+        table_uris = self._get_popular_tables_uris(num_entries, user_id)
         if not table_uris:
             return []
 
@@ -1424,18 +1488,56 @@ class AbstractGremlinProxy(BaseProxy):
             ))
         return popular_tables
 
-    def _get_popular_tables_uris(self, num_entries: int) -> List[str]:
+    def _get_popular_tables_uris(self, num_entries: int, user_id: Optional[str] = None) -> List[str]:
+        """
+        Retrieve popular table uris. The cached methods compute at least POPULAR_TABLE_PRECOMPUTED_COUNT uris, so
+        that the requests for fewer tables are served from the same result.
+        :return: Iterable of table uri
+        """
+        num_precomputed = current_app.config.get('POPULAR_TABLE_PRECOMPUTED_COUNT', 0) if has_app_context() else 0
+        if user_id is None:
+            table_uris = self._get_global_popular_tables_uris(max(num_entries, num_precomputed))
+        else:
+            table_uris = self._get_personal_popular_tables_uris(max(num_entries, num_precomputed), user_id)
+        return table_uris[:num_entries]
+
+    @cached(POPULAR_TABLES_CACHE)
+    def _get_global_popular_tables_uris(self, num_entries: int) -> List[str]:
         """
         Retrieve popular table uris. Will provide tables with top x popularity score.
-        Popularity score = number of distinct readers * log(total number of reads)
+        Popularity score = total number of reads
 
-        For score computation, it uses logarithm on total number of reads so that score won't be affected by small
-        number of users reading a lot of times.
+        The result of this method will be cached based on the key (num_entries), and will be refreshed in the
+        background based on PROXY_CACHE_REFRESH_SEC, as it requires a full scan of the reads.
         :return: Iterable of table uri
         """
-
+        LOGGER.info('Querying popular tables URIs')
         g = _V(g=self.g, label=VertexTypes.User, key=None)
-        g = g.outE(EdgeTypes.Read.value.label).as_('r')
+        return self._get_most_read_tables_uris(g, num_entries)
+
+    @cached(POPULAR_TABLES_CACHE)
+    def _get_personal_popular_tables_uris(self, num_entries: int, user_id: str) -> List[str]:
+        """
+        Retrieve personalized popular table uris. Will provide tables with top popularity score among the reads of
+        the peers of user_id, i.e. of the users who have read a table that user_id has read.
+        The popularity score is defined in the same way as `_get_global_popular_tables_uris`
+
+        The result of this method will be cached based on the key (num_entries, user_id), and will be refreshed in the
+        background based on PROXY_CACHE_REFRESH_SEC.
+        :return: Iterable of table uri
+        """
+        LOGGER.info('Querying personal popular tables URIs')
+        g = _V(g=self.g, label=VertexTypes.User, key=user_id)
+        g = g.outE(EdgeTypes.Read.value.label).inV().hasLabel(VertexTypes.Table.value.label)
+        g = g.inE(EdgeTypes.Read.value.label).outV().hasLabel(VertexTypes.User.value.label).dedup()
+        return self._get_most_read_tables_uris(g, num_entries)
+
+    def _get_most_read_tables_uris(self, users: GraphTraversal, num_entries: int) -> List[str]:
+        """
+        :param users: Traversal of the users whose reads are counted
+        :return: Iterable of table uri, by descending total number of reads
+        """
+        g = users.outE(EdgeTypes.Read.value.label).as_('r')
         g = g.inV().hasLabel(VertexTypes.Table.value.label).values(self.key_property_name).as_('t')
         g = g.group().by(select('t')).by(coalesce(select('r').values('read_count'), constant(0)).sum())
         # the group then unfold is a little weird, it ends up being a list of singleton maps, but we get no more than
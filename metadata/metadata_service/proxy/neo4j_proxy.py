@@ -4,9 +4,9 @@
 import logging
 import textwrap
 import time
-from random import randint
-from typing import (Any, Dict, Iterable, List, Optional, Tuple,  # noqa: F401
-                    Union, no_type_check)
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import (Any, Callable, Dict, Iterable, List,  # noqa: F401
+                    Optional, Tuple, Union, no_type_check)
 
 import neo4j
 from amundsen_common.models.dashboard import DashboardSummary
@@ -18,8 +18,6 @@ from amundsen_common.models.table import (Application, Badge, Column,
                                           Watermark)
 from amundsen_common.models.user import User as UserEntity
 from amundsen_common.models.user import UserSchema
-from beaker.cache import CacheManager
-from beaker.util import parse_cache_config_options
 from flask import current_app, has_app_context
 from neo4j import BoltStatementResult, Driver, GraphDatabase  # noqa: F401
 
@@ -33,13 +31,18 @@ from metadata_service.entity.resource_type import ResourceType
 from metadata_service.entity.tag_detail import TagDetail
 from metadata_service.exception import NotFoundException
 from metadata_service.proxy.base_proxy import BaseProxy
+from metadata_service.proxy.cache import (BADGES_CACHE, POPULAR_TABLES_CACHE,
+                                          STATISTICS_CACHE, TABLE_CACHE,
+                                          TAGS_CACHE, cached, invalidate,
+                                          invalidate_resource, table_namespace)
 from metadata_service.proxy.statsd_utilities import timer_with_counter
 from metadata_service.util import UserResourceRel
 
-_CACHE = CacheManager(**parse_cache_config_options({'cache.type': 'memory'}))
+# Maximum number of table keys per query of get_tables
+_GET_TABLES_BATCH_SIZE = 100
 
-# Expire cache every 11 hours + jitter
-_GET_POPULAR_TABLE_CACHE_EXPIRY_SEC = 11 * 60 * 60 + randint(0, 3600)
+# Default maximum number of queries run concurrently by the get_table requests
+_DEFAULT_NUM_QUERY_WORKERS = 10
 
 
 CREATED_EPOCH_MS = 'publisher_created_epoch_ms'
@@ -64,6 +67,7 @@ class Neo4jProxy(BaseProxy):
                  max_connection_lifetime_sec: int = 100,
                  encrypted: bool = False,
                  validate_ssl: bool = False,
+                 client_kwargs: Dict = dict(),
                  **kwargs: dict) -> None:
         """
         There's currently no request timeout from client side where server
@@ -74,6 +78,8 @@ class Neo4jProxy(BaseProxy):
         :param max_connection_lifetime_sec: max life time the connection can have when it comes to reuse. In other
         words, connection life time longer than this value won't be reused and closed on garbage collection. This
         value needs to be smaller than surrounding network environment's timeout.
+        :param client_kwargs: PROXY_CLIENT_KWARGS, where num_query_workers is the maximum number of sub-queries of
+        get_table run concurrently, on their own sessions, across all requests.
         """
         endpoint = f'{host}:{port}'
         LOGGER.info('NEO4J endpoint: {}'.format(endpoint))
@@ -84,6 +90,9 @@ class Neo4jProxy(BaseProxy):
                                             auth=(user, password),
                                             encrypted=encrypted,
                                             trust=trust)  # type: Driver
+        self._query_executor = ThreadPoolExecutor(
+            max_workers=client_kwargs.get('num_query_workers', _DEFAULT_NUM_QUERY_WORKERS),
+            thread_name_prefix='neo4j_proxy_query')
 
     def is_healthy(self) -> None:
         # throws if cluster unhealthy or can't connect.  An alternative would be to use one of
@@ -94,18 +103,77 @@ class Neo4jProxy(BaseProxy):
                                      statement='CALL dbms.cluster.overview()', param_dict={})
 
     @timer_with_counter
+    @cached(TABLE_CACHE, key_kwarg='table_uri')
     def get_table(self, *, table_uri: str) -> Table:
         """
+        Runs the column, usage and table level queries concurrently.
         :param table_uri: Table URI
         :return:  A Table object
         """
 
-        cols, last_neo4j_record = self._exec_col_query(table_uri)
+        col_future = self._submit_query(self._exec_col_query, table_uri)
+        usage_future = self._submit_query(self._exec_usage_query, table_uri)
+        table_future = self._submit_query(self._exec_table_query, table_uri)
 
-        readers = self._exec_usage_query(table_uri)
+        try:
+            cols, last_neo4j_record = col_future.result()
+
+            readers = usage_future.result()
+
+            table_fields = table_future.result()
+        except Exception:
+            usage_future.cancel()
+            table_future.cancel()
+            raise
 
-        wmk_results, table_writer, timestamp_value, owners, tags, source, badges, prog_descs = \
-            self._exec_table_query(table_uri)
+        return self._make_table(last_neo4j_record, cols, readers, table_fields)
+
+    def _submit_query(self, fn: Callable, *args: Any) -> Future:
+        """
+        Submits the query function to the query executor, within the application context of the caller, if any, so
+        that its statsd metrics are still emitted.
+        """
+        if not has_app_context():
+            return self._query_executor.submit(fn, *args)
+
+        app = current_app._get_current_object()
+
+        def run_in_app_context() -> Any:
+            with app.app_context():
+                return fn(*args)
+
+        return self._query_executor.submit(run_in_app_context)
+
+    @timer_with_counter
+    def get_tables(self, *, table_uris: List[str]) -> Dict[str, Table]:
+        """
+        Gets the tables with the queries of get_table, each run on up to _GET_TABLES_BATCH_SIZE table URIs at once.
+        :param table_uris: Table URIs
+        :return: Tables by table URI, without the table URIs that do not exist
+        """
+        tables = {}
+        unique_table_uris = list(dict.fromkeys(table_uris))
+        for i in range(0, len(unique_table_uris), _GET_TABLES_BATCH_SIZE):
+            batch = unique_table_uris[i:i + _GET_TABLES_BATCH_SIZE]
+
+            cols_by_key = self._exec_col_query_by_keys(batch)
+            if not cols_by_key:
+                continue
+
+            found_table_uris = [table_uri for table_uri in batch if table_uri in cols_by_key]
+            readers_by_key = self._exec_usage_query_by_keys(found_table_uris)
+            table_fields_by_key = self._exec_table_query_by_keys(found_table_uris)
+
+            for table_uri in found_table_uris:
+                cols, last_neo4j_record = cols_by_key[table_uri]
+                tables[table_uri] = self._make_table(last_neo4j_record, cols, readers_by_key.get(table_uri, []),
+                                                     table_fields_by_key[table_uri])
+
+        return tables
+
+    def _make_table(self, last_neo4j_record: Any, cols: List[Column], readers: List[Reader],
+                    table_fields: Tuple) -> Table:
+        wmk_results, table_writer, timestamp_value, owners, tags, source, badges, prog_descs = table_fields
 
         table = Table(database=last_neo4j_record['db']['name'],
                       cluster=last_neo4j_record['clstr']['name'],
@@ -144,6 +212,40 @@ class Neo4jProxy(BaseProxy):
 
         tbl_col_neo4j_records = self._execute_cypher_query(
             statement=column_level_query, param_dict={'tbl_key': table_uri})
+        cols, last_neo4j_record = self._make_columns(tbl_col_neo4j_records)
+
+        if not cols:
+            raise NotFoundException('Table URI( {table_uri} ) does not exist'.format(table_uri=table_uri))
+
+        return cols, last_neo4j_record
+
+    @timer_with_counter
+    def _exec_col_query_by_keys(self, table_uris: List[str]) -> Dict[str, Tuple]:
+        # Return Value: (Columns, Last Processed Record) by table key, for the tables that exist
+
+        column_level_query = textwrap.dedent("""
+        MATCH (db:Database)-[:CLUSTER]->(clstr:Cluster)-[:SCHEMA]->(schema:Schema)
+        -[:TABLE]->(tbl:Table)-[:COLUMN]->(col:Column)
+        WHERE tbl.key IN $tbl_keys
+        OPTIONAL MATCH (tbl)-[:DESCRIPTION]->(tbl_dscrpt:Description)
+        OPTIONAL MATCH (col:Column)-[:DESCRIPTION]->(col_dscrpt:Description)
+        OPTIONAL MATCH (col:Column)-[:STAT]->(stat:Stat)
+        OPTIONAL MATCH (col:Column)-[:HAS_BADGE]->(badge:Badge)
+        RETURN db, clstr, schema, tbl, tbl_dscrpt, col, col_dscrpt, collect(distinct stat) as col_stats,
+        collect(distinct badge) as col_badges
+        ORDER BY tbl.key, col.sort_order;""")
+
+        tbl_col_neo4j_records = self._execute_cypher_query(
+            statement=column_level_query, param_dict={'tbl_keys': table_uris})
+
+        records_by_key = {}  # type: Dict[str, List]
+        for tbl_col_neo4j_record in tbl_col_neo4j_records:
+            records_by_key.setdefault(tbl_col_neo4j_record['tbl']['key'], []).append(tbl_col_neo4j_record)
+
+        return {key: self._make_columns(records) for key, records in records_by_key.items()}
+
+    def _make_columns(self, tbl_col_neo4j_records: Iterable) -> Tuple:
+        # Return Value: (Columns, Last Processed Record)
         cols = []
         last_neo4j_record = None
         for tbl_col_neo4j_record in tbl_col_neo4j_records:
@@ -170,9 +272,6 @@ class Neo4jProxy(BaseProxy):
 
             cols.append(col)
 
-        if not cols:
-            raise NotFoundException('Table URI( {table_uri} ) does not exist'.format(table_uri=table_uri))
-
         return sorted(cols, key=lambda item: item.sort_order), last_neo4j_record
 
     @timer_with_counter
@@ -187,6 +286,27 @@ class Neo4jProxy(BaseProxy):
 
         usage_neo4j_records = self._execute_cypher_query(statement=usage_query,
                                                          param_dict={'tbl_key': table_uri})
+        return self._make_readers(usage_neo4j_records)
+
+    @timer_with_counter
+    def _exec_usage_query_by_keys(self, table_uris: List[str]) -> Dict[str, List[Reader]]:
+        # Return Value: List[Reader] by table key, for the tables that have readers
+
+        usage_query = textwrap.dedent("""\
+        MATCH (user:User)-[read:READ]->(table:Table)
+        WHERE table.key IN $tbl_keys
+        WITH table, user, read
+        ORDER BY read.read_count DESC
+        WITH table, collect({email: user.email, read_count: read.read_count})[..5] as readers
+        RETURN table.key as tbl_key, readers;
+        """)
+
+        usage_neo4j_records = self._execute_cypher_query(statement=usage_query,
+                                                         param_dict={'tbl_keys': table_uris})
+        return {usage_neo4j_record['tbl_key']: self._make_readers(usage_neo4j_record['readers'])
+                for usage_neo4j_record in usage_neo4j_records}
+
+    def _make_readers(self, usage_neo4j_records: Iterable) -> List[Reader]:
         readers = []  # type: List[Reader]
         for usage_neo4j_record in usage_neo4j_records:
             reader = Reader(user=User(email=usage_neo4j_record['email']),
@@ -228,8 +348,40 @@ class Neo4jProxy(BaseProxy):
                                                    param_dict={'tbl_key': table_uri,
                                                                'tag_normal_type': 'default'})
 
-        table_records = table_records.single()
+        return self._make_table_fields(table_records.single())
+
+    @timer_with_counter
+    def _exec_table_query_by_keys(self, table_uris: List[str]) -> Dict[str, Tuple]:
+        # Return Value: The fields of _exec_table_query by table key
+
+        table_level_query = textwrap.dedent("""\
+        MATCH (tbl:Table)
+        WHERE tbl.key IN $tbl_keys
+        OPTIONAL MATCH (wmk:Watermark)-[:BELONG_TO_TABLE]->(tbl)
+        OPTIONAL MATCH (application:Application)-[:GENERATES]->(tbl)
+        OPTIONAL MATCH (tbl)-[:LAST_UPDATED_AT]->(t:Timestamp)
+        OPTIONAL MATCH (owner:User)<-[:OWNER]-(tbl)
+        OPTIONAL MATCH (tbl)-[:TAGGED_BY]->(tag:Tag{tag_type: $tag_normal_type})
+        OPTIONAL MATCH (tbl)-[:HAS_BADGE]->(badge:Badge)
+        OPTIONAL MATCH (tbl)-[:SOURCE]->(src:Source)
+        OPTIONAL MATCH (tbl)-[:DESCRIPTION]->(prog_descriptions:Programmatic_Description)
+        RETURN tbl.key as tbl_key,
+        collect(distinct wmk) as wmk_records,
+        application,
+        t.last_updated_timestamp as last_updated_timestamp,
+        collect(distinct owner) as owner_records,
+        collect(distinct tag) as tag_records,
+        collect(distinct badge) as badge_records,
+        src,
+        collect(distinct prog_descriptions) as prog_descriptions
+        """)
+
+        table_records = self._execute_cypher_query(statement=table_level_query,
+                                                   param_dict={'tbl_keys': table_uris,
+                                                               'tag_normal_type': 'default'})
+        return {table_record['tbl_key']: self._make_table_fields(table_record) for table_record in table_records}
 
+    def _make_table_fields(self, table_records: Any) -> Tuple:
         wmk_results = []
         table_writer = None
 
@@ -440,6 +592,7 @@ class Neo4jProxy(BaseProxy):
         self._put_resource_description(resource_type=ResourceType.Table,
                                        uri=table_uri,
                                        description=description)
+        invalidate(table_namespace(table_uri), STATISTICS_CACHE)
 
     @timer_with_counter
     def get_column_description(self, *,
@@ -527,6 +680,8 @@ class Neo4jProxy(BaseProxy):
             if LOGGER.isEnabledFor(logging.DEBUG):
                 LOGGER.debug('Update process elapsed for {} seconds'.format(time.time() - start))
 
+        invalidate(table_namespace(table_uri), STATISTICS_CACHE)
+
     @timer_with_counter
     def add_owner(self, *,
                   table_uri: str,
@@ -569,6 +724,8 @@ class Neo4jProxy(BaseProxy):
             # propagate the exception back to api
             raise e
 
+        invalidate(table_namespace(table_uri), STATISTICS_CACHE)
+
     @timer_with_counter
     def delete_owner(self, *,
                      table_uri: str,
@@ -597,6 +754,8 @@ class Neo4jProxy(BaseProxy):
         finally:
             tx.commit()
 
+        invalidate(table_namespace(table_uri), STATISTICS_CACHE)
+
     @timer_with_counter
     def add_badge(self, *,
                   id: str,
@@ -649,6 +808,8 @@ class Neo4jProxy(BaseProxy):
                 tx.rollback()
             raise e
 
+        invalidate_resource(BADGES_CACHE, id=id, resource_type=resource_type)
+
     @timer_with_counter
     def delete_badge(self, id: str,
                      badge_name: str,
@@ -677,7 +838,10 @@ class Neo4jProxy(BaseProxy):
                 tx.rollback()
             raise e
 
+        invalidate_resource(BADGES_CACHE, id=id, resource_type=resource_type)
+
     @timer_with_counter
+    @cached(BADGES_CACHE)
     def get_badges(self) -> List:
         LOGGER.info('Get all badges')
         query = textwrap.dedent("""
@@ -752,6 +916,8 @@ class Neo4jProxy(BaseProxy):
             # propagate the exception back to api
             raise e
 
+        invalidate_resource(TAGS_CACHE, id=id, resource_type=resource_type)
+
     @timer_with_counter
     def delete_tag(self, *,
                    id: str,
@@ -789,7 +955,10 @@ class Neo4jProxy(BaseProxy):
                 tx.rollback()
             raise e
 
+        invalidate_resource(TAGS_CACHE, id=id, resource_type=resource_type)
+
     @timer_with_counter
+    @cached(TAGS_CACHE)
     def get_tags(self) -> List:
         """
         Get all existing tags from neo4j
@@ -834,6 +1003,7 @@ class Neo4jProxy(BaseProxy):
             return None
 
     @timer_with_counter
+    @cached(STATISTICS_CACHE)
     def get_statistics(self) -> Dict[str, Any]:
         """
         API method to fetch statistics metrics for neo4j
@@ -873,13 +1043,13 @@ class Neo4jProxy(BaseProxy):
             return neo4j_statistics
         return {}
 
-    @_CACHE.cache('_get_global_popular_tables_uris', expire=_GET_POPULAR_TABLE_CACHE_EXPIRY_SEC)
+    @cached(POPULAR_TABLES_CACHE)
     def _get_global_popular_tables_uris(self, num_entries: int) -> List[str]:
         """
         Retrieve popular table uris. Will provide tables with top x popularity score.
         Popularity score = number of distinct readers * log(total number of reads)
         The result of this method will be cached based on the key (num_entries), and the cache will be expired based on
-        _GET_POPULAR_TABLE_CACHE_EXPIRY_SEC
+        PROXY_CACHE_EXPIRE_SEC
 
         For score computation, it uses logarithm on total number of reads so that score won't be affected by small
         number of users reading a lot of times.
@@ -901,7 +1071,7 @@ class Neo4jProxy(BaseProxy):
         return [record['table_key'] for record in records]
 
     @timer_with_counter
-    @_CACHE.cache('_get_personal_popular_tables_uris', _GET_POPULAR_TABLE_CACHE_EXPIRY_SEC)
+    @cached(POPULAR_TABLES_CACHE)
     def _get_personal_popular_tables_uris(self, num_entries: int,
                                           user_id: str) -> List[str]:
         """
@@ -910,7 +1080,7 @@ class Neo4jProxy(BaseProxy):
         The popularity score is defined in the same way as `_get_global_popular_tables_uris`
 
         The result of this method will be cached based on the key (num_entries, user_id),
-        and the cache will be expired based on _GET_POPULAR_TABLE_CACHE_EXPIRY_SEC
+        and the cache will be expired based on PROXY_CACHE_EXPIRE_SEC
 
         :return: Iterable of table uri
         """
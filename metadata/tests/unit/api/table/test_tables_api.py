@@ -0,0 +1,33 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+from http import HTTPStatus
+
+from amundsen_common.models.table import Table
+
+from tests.unit.api.table.table_test_case import TableTestCase
+
+TABLE_URI = 'hive://gold.hogwarts/wizards'
+MISSING_TABLE_URI = 'hive://gold.hogwarts/muggles'
+
+
+class TestTablesAPI(TableTestCase):
+    def test_should_get_tables(self) -> None:
+        table = Table(database='hive', cluster='gold', schema='hogwarts', name='wizards', key=TABLE_URI,
+                      columns=[])
+        self.mock_proxy.get_tables.return_value = {TABLE_URI: table}
+
+        response = self.app.test_client().post('/tables/', json={'table_uris': [TABLE_URI, MISSING_TABLE_URI]})
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(list(response.json['tables'].keys()), [TABLE_URI])
+        self.assertEqual(response.json['tables'][TABLE_URI]['name'], 'wizards')
+        self.assertEqual(response.json['not_found'], [MISSING_TABLE_URI])
+        self.mock_proxy.get_tables.assert_called_with(table_uris=[TABLE_URI, MISSING_TABLE_URI])
+
+    def test_should_fail_without_table_uris(self) -> None:
+        for body in [{}, {'table_uris': TABLE_URI}, {'table_uris': [1]}]:
+            response = self.app.test_client().post('/tables/', json=body)
+
+            self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+        self.mock_proxy.get_tables.assert_not_called()
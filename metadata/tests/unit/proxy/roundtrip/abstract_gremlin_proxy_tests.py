@@ -46,6 +46,8 @@ class AbstractGremlinProxyTest(abstract_proxy_test_class(), unittest.TestCase):
         self.app_context = self.app.app_context()
         self.app_context.push()
         self.app.config['PROXY_HOST']
+        # the popular tables are computed by the tests, after adding the reads
+        self.app.config['POPULAR_TABLE_WARM_UP'] = False
         self.gremlin_proxy = self._create_gremlin_proxy(self.app.config)
         self.key_property_name = self.gremlin_proxy.key_property_name
         self.get_proxy().drop()
@@ -192,6 +192,30 @@ class TestAtlasProxy(unittest.TestCase, Data):
             self.proxy.client.entity.get_entity_by_attribute = MagicMock(return_value=unique_attr_response)
             self.proxy.get_table(table_uri=cast(str, self.table_uri))
 
+    def test_get_tables(self) -> None:
+        entity = copy.deepcopy(self.entity1)
+        cast(dict, entity['attributes'])['qualifiedName'] = f'{self.db}.{self.name}@{self.cluster}'
+        mocked_entity = self._mock_get_table_entity(entity)
+        mocked_entity.referredEntities = {self.test_column['guid']: self.test_column}
+        self._create_mocked_report_entities_collection()
+        self.proxy._get_owners = MagicMock(return_value=[User(email='owner@example.com')])  # type: ignore
+
+        entities = MagicMock()
+        entities.entities = [entity]
+        entities.referredEntities = mocked_entity.referredEntities
+        self.proxy.client.call_api = MagicMock(return_value=entities)
+
+        missing_table_uri = f'{self.entity_type}://{self.cluster}.{self.db}/missing'
+        tables = self.proxy.get_tables(table_uris=[self.table_uri, missing_table_uri, 'invalid'])
+
+        self.assertEqual(list(tables.keys()), [self.table_uri])
+        self.assertEqual(str(tables[self.table_uri]), str(self.proxy.get_table(table_uri=self.table_uri)))
+
+        self.proxy.client.call_api.assert_called_once()
+        self.assertEqual(self.proxy.client.call_api.call_args[0][2],
+                         {'attr_0:qualifiedName': f'{self.db}.{self.name}@{self.cluster}',
+                          'attr_1:qualifiedName': f'{self.db}.missing@{self.cluster}'})
+
     def test_get_popular_tables(self) -> None:
         ent1 = self.to_class(self.entity1)
         ent2 = self.to_class(self.entity2)
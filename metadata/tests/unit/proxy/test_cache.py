@@ -0,0 +1,211 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+import tempfile
+import unittest
+from typing import Any, List  # noqa: F401
+from unittest.mock import MagicMock, patch
+
+from metadata_service import create_app
+from metadata_service.entity.resource_type import ResourceType
+from metadata_service.proxy.cache import (POPULAR_TABLES_CACHE, TABLE_CACHE,
+                                          TAGS_CACHE, FileCache, MemoryCache,
+                                          _get_refresh_executor, cached,
+                                          get_cache, invalidate,
+                                          invalidate_resource, warm_up)
+
+
+class CachedProxy:
+    def __init__(self) -> None:
+        self.calls = []  # type: List[Any]
+
+    @cached(TAGS_CACHE)
+    def get_tags(self) -> List[str]:
+        self.calls.append('tags')
+        return ['tag']
+
+    @cached(POPULAR_TABLES_CACHE)
+    def get_popular_tables(self, num_entries: int) -> List[str]:
+        self.calls.append('popular_tables')
+        return ['table{}'.format(len(self.calls))] * num_entries
+
+    @cached(TABLE_CACHE, key_kwarg='table_uri')
+    def get_table(self, *, table_uri: str) -> None:
+        self.calls.append(table_uri)
+        return None
+
+
+class TestMemoryCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.app = create_app(config_module_class='metadata_service.config.LocalConfig')
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+
+    def tearDown(self) -> None:
+        self.app_context.pop()
+
+    def test_lru_eviction(self) -> None:
+        self.app.config['PROXY_CACHE_MAX_SIZE'] = 2
+        cache = MemoryCache()
+        cache.set('a', 1)
+        cache.set('b', 2)
+        self.assertEqual(cache.get('a'), 1)
+        cache.set('c', 3)
+
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('c'), 3)
+
+    def test_expiry(self) -> None:
+        cache = MemoryCache()
+        with patch('metadata_service.proxy.cache.time.monotonic', return_value=100):
+            cache.set('a', 1, expire_sec=10)
+            cache.set('b', 2)
+        with patch('metadata_service.proxy.cache.time.monotonic', return_value=110):
+            self.assertIsNone(cache.get('a'))
+            self.assertEqual(cache.get('b'), 2)
+
+
+class TestFileCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.app = create_app(config_module_class='metadata_service.config.LocalConfig')
+        self.app.config['PROXY_CACHE_DIRECTORY'] = os.path.join(self.directory.name, 'cache')
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+
+    def tearDown(self) -> None:
+        self.app_context.pop()
+        self.directory.cleanup()
+
+    def test_shared_across_instances(self) -> None:
+        FileCache().set('a', {'key': ['value']})
+
+        self.assertEqual(FileCache().get('a'), {'key': ['value']})
+        self.assertIsNone(FileCache().get('b'))
+
+    def test_expiry(self) -> None:
+        cache = FileCache()
+        with patch('metadata_service.proxy.cache.time.time', return_value=100):
+            cache.set('a', 1, expire_sec=10)
+            cache.set('b', 2)
+        with patch('metadata_service.proxy.cache.time.time', return_value=110):
+            self.assertIsNone(cache.get('a'))
+            self.assertEqual(cache.get('b'), 2)
+        self.assertEqual(len(os.listdir(self.app.config['PROXY_CACHE_DIRECTORY'])), 1)
+
+    def test_lru_eviction(self) -> None:
+        self.app.config['PROXY_CACHE_MAX_SIZE'] = 2
+        cache = FileCache()
+        cache.set('a', 'a')
+        cache.set('b', 'b')
+        # a is used after b
+        os.utime(cache._path('b'), (1, 1))
+        os.utime(cache._path('a'), (2, 2))
+        cache.set('c', 'c')
+
+        self.assertEqual(cache.get('a'), 'a')
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('c'), 'c')
+
+    def test_directory_required(self) -> None:
+        self.app.config['PROXY_CACHE_DIRECTORY'] = None
+        with self.assertRaises(ValueError):
+            FileCache()
+
+    def test_directory_permissions(self) -> None:
+        FileCache()
+        os.chmod(self.app.config['PROXY_CACHE_DIRECTORY'], 0o755)
+        with self.assertRaises(ValueError):
+            FileCache()
+
+    def test_directory_owner(self) -> None:
+        with patch('metadata_service.proxy.cache.os.getuid', return_value=os.getuid() + 1):
+            with self.assertRaises(ValueError):
+                FileCache()
+
+
+class TestCached(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.app = create_app(config_module_class='metadata_service.config.LocalConfig')
+        self.app.config['PROXY_CACHE'] = 'metadata_service.proxy.cache.FileCache'
+        self.app.config['PROXY_CACHE_DIRECTORY'] = os.path.join(self.directory.name, 'cache')
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        self.proxy = CachedProxy()
+
+    def tearDown(self) -> None:
+        self.app_context.pop()
+        self.directory.cleanup()
+
+    def test_cached_until_invalidated(self) -> None:
+        for _ in range(2):
+            self.assertEqual(self.proxy.get_tags(), ['tag'])
+        self.assertEqual(self.proxy.calls, ['tags'])
+
+        invalidate(TAGS_CACHE)
+        self.proxy.get_tags()
+        self.assertEqual(self.proxy.calls, ['tags', 'tags'])
+
+    def test_invalidate_resource(self) -> None:
+        for table_uri in ['db://cluster.schema/table1', 'db://cluster.schema/table2'] * 2:
+            self.assertIsNone(self.proxy.get_table(table_uri=table_uri))
+        self.assertEqual(self.proxy.calls, ['db://cluster.schema/table1', 'db://cluster.schema/table2'])
+
+        invalidate_resource(id='db://cluster.schema/table1/column', resource_type=ResourceType.Column)
+        self.proxy.get_table(table_uri='db://cluster.schema/table1')
+        self.proxy.get_table(table_uri='db://cluster.schema/table2')
+        self.assertEqual(self.proxy.calls, ['db://cluster.schema/table1', 'db://cluster.schema/table2',
+                                            'db://cluster.schema/table1'])
+
+    def test_cache_disabled(self) -> None:
+        self.app.config['PROXY_CACHE'] = None
+        self.assertIsNone(get_cache())
+        for _ in range(2):
+            self.proxy.get_tags()
+        self.assertEqual(self.proxy.calls, ['tags', 'tags'])
+
+    def test_memory_cache_not_invalidated_categories_only(self) -> None:
+        self.app.config['PROXY_CACHE'] = 'metadata_service.proxy.cache.MemoryCache'
+        self.assertIsInstance(get_cache(), MemoryCache)
+        for _ in range(2):
+            self.proxy.get_tags()
+            self.proxy.get_table(table_uri='db://cluster.schema/table1')
+            self.proxy.get_popular_tables(1)
+
+        self.assertEqual(self.proxy.calls, ['tags', 'db://cluster.schema/table1', 'popular_tables',
+                                            'tags', 'db://cluster.schema/table1'])
+
+    def test_hit_ratio_metrics(self) -> None:
+        statsd_client = MagicMock()
+        with patch('metadata_service.proxy.cache._get_statsd_client', return_value=statsd_client):
+            for _ in range(3):
+                self.proxy.get_tags()
+
+        self.assertEqual([call[0][0] for call in statsd_client.incr.call_args_list],
+                         ['tags.miss', 'tags.hit', 'tags.hit'])
+
+    def test_refresh_in_background(self) -> None:
+        self.app.config['PROXY_CACHE_REFRESH_SEC'] = {POPULAR_TABLES_CACHE: 10}
+        with patch('metadata_service.proxy.cache.time.time', return_value=100):
+            self.assertEqual(self.proxy.get_popular_tables(1), ['table1'])
+        with patch('metadata_service.proxy.cache.time.time', return_value=109):
+            self.assertEqual(self.proxy.get_popular_tables(1), ['table1'])
+        self.assertEqual(self.proxy.calls, ['popular_tables'])
+
+        # the outdated result is returned while the new one is computed
+        with patch('metadata_service.proxy.cache.time.time', return_value=110):
+            self.assertEqual(self.proxy.get_popular_tables(1), ['table1'])
+            _get_refresh_executor().submit(lambda: None).result()
+            self.assertEqual(self.proxy.get_popular_tables(1), ['table2'])
+        self.assertEqual(self.proxy.calls, ['popular_tables', 'popular_tables'])
+
+    def test_warm_up(self) -> None:
+        warm_up(self.proxy.get_popular_tables, 2)
+        _get_refresh_executor().submit(lambda: None).result()
+        self.assertEqual(self.proxy.calls, ['popular_tables'])
+
+        self.assertEqual(self.proxy.get_popular_tables(2), ['table1', 'table1'])
+        self.assertEqual(self.proxy.calls, ['popular_tables'])
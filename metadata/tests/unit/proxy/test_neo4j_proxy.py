@@ -2,9 +2,12 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import copy
+import os
+import tempfile
 import textwrap
+import threading
 import unittest
-from typing import Any, Dict  # noqa: F401
+from typing import Any, Dict, List  # noqa: F401
 from unittest.mock import MagicMock, patch
 
 from amundsen_common.models.dashboard import DashboardSummary
@@ -14,6 +17,7 @@ from amundsen_common.models.table import (Application, Badge, Column,
                                           ProgrammaticDescription, Source,
                                           Stat, Table, Tag, User, Watermark)
 from amundsen_common.models.user import User as UserModel
+from flask import current_app as flask_current_app
 from neo4j import GraphDatabase
 
 from metadata_service import create_app
@@ -140,9 +144,25 @@ class TestNeo4jProxy(unittest.TestCase):
     def tearDown(self) -> None:
         pass
 
+    @staticmethod
+    def _get_table_queries(col_usage_return_value: Any, usage_return_value: Any,
+                           table_level_return_value: Any) -> Any:
+        """
+        Side effect of _execute_cypher_query for the queries of get_table, which run concurrently in any order
+        """
+        def execute_cypher_query(*, statement: str, param_dict: Dict[str, Any]) -> Any:
+            if '[:COLUMN]' in statement:
+                return col_usage_return_value
+            if '[read:READ]' in statement:
+                return usage_return_value
+            return table_level_return_value
+
+        return execute_cypher_query
+
     def test_get_table(self) -> None:
         with patch.object(GraphDatabase, 'driver'), patch.object(Neo4jProxy, '_execute_cypher_query') as mock_execute:
-            mock_execute.side_effect = [self.col_usage_return_value, [], self.table_level_return_value]
+            mock_execute.side_effect = self._get_table_queries(self.col_usage_return_value, [],
+                                                               self.table_level_return_value)
 
             neo4j_proxy = Neo4jProxy(host='DOES_NOT_MATTER', port=0000)
             table = neo4j_proxy.get_table(table_uri='dummy_uri')
@@ -194,7 +214,8 @@ class TestNeo4jProxy(unittest.TestCase):
             col['tbl']['is_view'] = True
 
         with patch.object(GraphDatabase, 'driver'), patch.object(Neo4jProxy, '_execute_cypher_query') as mock_execute:
-            mock_execute.side_effect = [col_usage_return_value, [], self.table_level_return_value]
+            mock_execute.side_effect = self._get_table_queries(col_usage_return_value, [],
+                                                               self.table_level_return_value)
 
             neo4j_proxy = Neo4jProxy(host='DOES_NOT_MATTER', port=0000)
             table = neo4j_proxy.get_table(table_uri='dummy_uri')
@@ -240,6 +261,76 @@ class TestNeo4jProxy(unittest.TestCase):
 
             self.assertEqual(str(expected), str(table))
 
+    def test_get_table_concurrent_queries(self) -> None:
+        """
+        Test that the queries of get_table run on the query executor, within the application context
+        :return:
+        """
+        query_threads = []  # type: List[str]
+        execute_cypher_query = self._get_table_queries(self.col_usage_return_value, [],
+                                                       self.table_level_return_value)
+
+        def record_thread(*, statement: str, param_dict: Dict[str, Any]) -> Any:
+            query_threads.append(threading.current_thread().name)
+            self.assertIs(flask_current_app._get_current_object(), self.app)
+            return execute_cypher_query(statement=statement, param_dict=param_dict)
+
+        with patch.object(GraphDatabase, 'driver'), patch.object(Neo4jProxy, '_execute_cypher_query') as mock_execute:
+            mock_execute.side_effect = record_thread
+
+            neo4j_proxy = Neo4jProxy(host='DOES_NOT_MATTER', port=0000, client_kwargs={'num_query_workers': 3})
+            neo4j_proxy.get_table(table_uri='dummy_uri')
+
+            self.assertEqual(len(query_threads), 3)
+            self.assertTrue(all(name.startswith('neo4j_proxy_query') for name in query_threads))
+
+    def test_get_table_not_found(self) -> None:
+        with patch.object(GraphDatabase, 'driver'), patch.object(Neo4jProxy, '_execute_cypher_query') as mock_execute:
+            mock_execute.side_effect = self._get_table_queries([], [], self.table_level_return_value)
+
+            neo4j_proxy = Neo4jProxy(host='DOES_NOT_MATTER', port=0000)
+            with self.assertRaises(NotFoundException):
+                neo4j_proxy.get_table(table_uri='dummy_uri')
+
+    def test_get_tables(self) -> None:
+        """
+        Test that get_tables fetches the tables with one query per table level, and returns the same tables as
+        get_table
+        :return:
+        """
+        col_usage_return_value = copy.deepcopy(self.col_usage_return_value)
+        for col in col_usage_return_value:
+            col['tbl']['key'] = 'dummy_uri'
+        usage_return_value = [{'tbl_key': 'dummy_uri',
+                               'readers': [{'email': 'reader@example.com', 'read_count': 10}]}]
+        table_level_return_value = [dict(self.table_level_return_value.single.return_value, tbl_key='dummy_uri')]
+
+        with patch.object(GraphDatabase, 'driver'), patch.object(Neo4jProxy, '_execute_cypher_query') as mock_execute:
+            mock_execute.side_effect = self._get_table_queries(
+                col_usage_return_value, [{'email': 'reader@example.com', 'read_count': 10}],
+                self.table_level_return_value)
+
+            neo4j_proxy = Neo4jProxy(host='DOES_NOT_MATTER', port=0000)
+            table = neo4j_proxy.get_table(table_uri='dummy_uri')
+
+            mock_execute.side_effect = [col_usage_return_value, usage_return_value, table_level_return_value]
+            tables = neo4j_proxy.get_tables(table_uris=['dummy_uri', 'missing_uri', 'dummy_uri'])
+
+            self.assertEqual(list(tables.keys()), ['dummy_uri'])
+            self.assertEqual(str(tables['dummy_uri']), str(table))
+
+            self.assertEqual(mock_execute.call_count, 6)
+            batch_params = [call[1]['param_dict']['tbl_keys'] for call in mock_execute.call_args_list[3:]]
+            self.assertEqual(batch_params, [['dummy_uri', 'missing_uri'], ['dummy_uri'], ['dummy_uri']])
+
+    def test_get_tables_not_found(self) -> None:
+        with patch.object(GraphDatabase, 'driver'), patch.object(Neo4jProxy, '_execute_cypher_query') as mock_execute:
+            mock_execute.return_value = []
+
+            neo4j_proxy = Neo4jProxy(host='DOES_NOT_MATTER', port=0000)
+            self.assertEqual(neo4j_proxy.get_tables(table_uris=['missing_uri']), {})
+            self.assertEqual(mock_execute.call_count, 1)
+
     def test_get_table_with_valid_description(self) -> None:
         """
         Test description is returned for table
@@ -512,6 +603,24 @@ class TestNeo4jProxy(unittest.TestCase):
 
             self.assertEqual(actual.__repr__(), expected.__repr__())
 
+    def test_get_tags_cached_until_add_tag(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.app.config['PROXY_CACHE'] = 'metadata_service.proxy.cache.FileCache'
+        self.app.config['PROXY_CACHE_DIRECTORY'] = os.path.join(directory.name, 'cache')
+
+        with patch.object(GraphDatabase, 'driver'), patch.object(Neo4jProxy, '_execute_cypher_query') as mock_execute:
+            mock_execute.return_value = [{'tag_name': {'key': 'tag1'}, 'tag_count': 2}]
+
+            neo4j_proxy = Neo4jProxy(host='DOES_NOT_MATTER', port=0000)
+            for _ in range(2):
+                self.assertEqual(neo4j_proxy.get_tags(), [TagDetail(tag_name='tag1', tag_count=2)])
+            self.assertEqual(mock_execute.call_count, 1)
+
+            neo4j_proxy.add_tag(id='dummy_uri', tag='tag1')
+            neo4j_proxy.get_tags()
+            self.assertEqual(mock_execute.call_count, 2)
+
     def test_get_neo4j_latest_updated_ts(self) -> None:
         with patch.object(GraphDatabase, 'driver'), patch.object(Neo4jProxy, '_execute_cypher_query') as mock_execute:
             mock_execute.return_value.single.return_value = {